@@ -0,0 +1,406 @@
+# backend/api.py - FRAMEWORK-NEUTRAL REQUEST HANDLERS
+# Shared by the Flask app (app.py) and the ASGI app (asgi.py) so both
+# serve identical contracts. Each handler returns (body, status_code).
+from datetime import datetime
+import hmac
+import logging
+import time
+from services import config
+from services.analyzer import analyze_product
+from services.batch import run_batch
+from services.budget import LatencyBudget, cost_model
+from services.compare import METRICS, compare_products
+from services.cache import result_cache, verdict_cache, payload_fingerprint
+from services.coalesce import CoalesceTimeout, analysis_flights
+from services.incremental import aggregate_store, analyze_incremental
+from services.metrics import StageTimer
+from services.model_store import list_versions
+from services.models import model_registry
+
+logger = logging.getLogger(__name__)
+
+
+def health_payload():
+    """Health check body"""
+    return {
+        "status": "ok", 
+        "message": "Consia backend running ✅",
+        "version": "2.0",
+        "timestamp": datetime.now().isoformat(),
+        "features": ["sentiment", "fake_detection", "value_score", "true_rating", "pros_cons"],
+        "models": model_registry.status(),
+        "cache": result_cache.stats(),
+        "verdict_cache": verdict_cache.stats(),
+        "coalescing": analysis_flights.stats(),
+        "incremental": aggregate_store.stats(),
+        "latency_budget": {
+            "default_ms": config.LATENCY_BUDGET_MS,
+            "stage_costs_us": cost_model.stats()
+        }
+    }
+
+
+def analysis_response(analysis, product_title, price, review_count, start_time):
+    """Enhanced response format shared by the analysis endpoints"""
+    return {
+        "success": True,
+        "recommendation": analysis.get("recommendation", "Analysis Failed"),
+        "confidence": analysis.get("confidence", "Medium"),
+        "summary": analysis.get("analysis_summary", ""),
+        
+        # Product info
+        "product": {
+            "title": analysis.get("title", product_title),
+            "price": analysis.get("price", price),
+            "review_count": analysis.get("review_count", review_count)
+        },
+        
+        # Analysis metrics
+        "metrics": {
+            "sentiment": {
+                "positive": analysis.get("sentiment", {}).get("positive_percent", 0),
+                "negative": analysis.get("sentiment", {}).get("negative_percent", 0),
+                "neutral": analysis.get("sentiment", {}).get("neutral_percent", 0)
+            },
+            "fake_reviews_percent": analysis.get("fake_review_percent", 0),
+            "value_score": analysis.get("value_score", 0),
+            "true_rating": analysis.get("true_rating", 0)
+        },
+        
+        # Insights
+        "insights": {
+            "pros": analysis.get("pros", []),
+            "cons": analysis.get("cons", [])
+        },
+        
+        # Sample size and confidence intervals behind the metrics
+        "sampling": analysis.get("sampling", {}),
+        
+        # True when the latency budget cut sampling, degraded or skipped a stage
+        "partial": analysis.get("budget", {}).get("partial", False),
+        
+        # Metadata
+        "timestamp": datetime.now().isoformat(),
+        "processing_time_ms": (time.perf_counter() - start_time) * 1000,
+        "version": "2.0"
+    }
+
+
+def handle_analyze(data):
+    """Main analysis handler.
+    
+    Send ``"timings": true`` in the payload to get a per-stage latency
+    breakdown (``timings_ms``) in the response, and ``"budget_ms"`` to
+    bound the analysis latency (default CONSIA_LATENCY_BUDGET_MS).
+    Concurrent identical requests share one analysis (``coalesced`` in
+    the response says how many it served).
+    """
+    start_time = time.perf_counter()
+    timer = StageTimer()
+    
+    try:
+        if not data or not isinstance(data, dict):
+            logger.warning("No data provided in request")
+            return {
+                "success": False,
+                "error": "No data provided",
+                "timestamp": datetime.now().isoformat()
+            }, 400
+        
+        # Extract data with defaults
+        product_title = data.get("title", "Unknown Product")
+        price = data.get("price", 0)
+        reviews = data.get("reviews", [])
+        
+        try:
+            budget = LatencyBudget.from_request(data.get("budget_ms"), start_time)
+        except (TypeError, ValueError) as e:
+            return {
+                "success": False,
+                "error": f"Invalid budget_ms: {e}",
+                "timestamp": datetime.now().isoformat()
+            }, 400
+        
+        logger.info(f"🔍 Analyzing: {product_title[:60]}...")
+        logger.info(f"💰 Price: ₹{price}")
+        logger.info(f"📝 Reviews: {len(reviews)}")
+        
+        if not reviews:
+            logger.warning("No reviews provided for analysis")
+        
+        # Analyze the product (identical payloads are served from the cache)
+        with timer.stage("cache_lookup"):
+            # Keyed by model versions too: a reloaded model never serves old results
+            # (None until loaded; a result whose models loaded meanwhile is not cached)
+            model_versions = model_registry.versions()
+            cache_key = payload_fingerprint(product_title, price, reviews, model_versions)
+            analysis = result_cache.get(cache_key)
+        cache_hit = analysis is not None
+        shared, coalesced_requests = False, 1
+        if not cache_hit:
+            def run_analysis():
+                result = analyze_product(product_title, price, reviews, timer=timer, budget=budget)
+                # Cut-down results are not reused for requests that may have more time,
+                # nor results a model swap may have mixed. A budgeted result that was not
+                # cut is the full analysis: it is cached without this request's budget block.
+                if not budget.partial and model_registry.versions() == model_versions:
+                    result_cache.set(cache_key, {key: value for key, value in result.items() if key != "budget"})
+                return result
+            
+            if config.COALESCE_TIMEOUT > 0:
+                # Identical requests (same budget too) in flight share one analysis
+                wait_start = time.perf_counter()
+                try:
+                    analysis, shared, coalesced_requests = analysis_flights.do(
+                        (cache_key, budget.budget_ms), run_analysis, config.COALESCE_TIMEOUT)
+                except CoalesceTimeout as e:
+                    logger.warning(f"⏳ {e}")
+                    return {
+                        "success": False,
+                        "error": str(e),
+                        "timestamp": datetime.now().isoformat()
+                    }, 504
+                if shared:
+                    timer.record("coalesce_wait", time.perf_counter() - wait_start)
+            else:
+                analysis = run_analysis()
+        
+        response = analysis_response(analysis, product_title, price, len(reviews), start_time)
+        if "budget" in analysis:
+            response["budget"] = analysis["budget"]
+        response["cache"] = {
+            "hit": cache_hit,
+            "hits": result_cache.hits,
+            "misses": result_cache.misses
+        }
+        response["coalesced"] = {
+            "shared": shared,
+            "requests": coalesced_requests
+        }
+        if data.get("timings"):
+            response["timings_ms"] = timer.as_ms()
+        
+        if response["partial"]:
+            logger.info(f"⏱️ Partial analysis within {budget.budget_ms:.0f} ms budget: {analysis['budget']['stages']}")
+        logger.info(f"✅ Analysis complete: {analysis.get('recommendation', 'Unknown')}")
+        logger.info(f"📊 Results - Sentiment: {analysis.get('sentiment', {}).get('positive_percent', 0)}% positive, "
+                   f"Fake: {analysis.get('fake_review_percent', 0)}%, "
+                   f"Rating: {analysis.get('true_rating', 0)}⭐")
+        
+        return response, 200
+        
+    except Exception as e:
+        logger.error(f"❌ Analysis error: {str(e)}", exc_info=True)
+        
+        return {
+            "success": False,
+            "error": "Internal server error",
+            "message": str(e),
+            "recommendation": "Analysis Failed",
+            "timestamp": datetime.now().isoformat()
+        }, 500
+
+
+def handle_analyze_incremental(data):
+    """Incremental analysis handler keyed by ``product_id``.
+    
+    Send ``added_reviews`` / ``removed_reviews`` to update the product's
+    stored aggregates; only those reviews are analyzed. Send ``reviews``
+    (the full list) to rebuild the product from scratch.
+    """
+    start_time = time.perf_counter()
+    
+    try:
+        if not data or not isinstance(data, dict) or not data.get("product_id"):
+            return {
+                "success": False,
+                "error": "product_id is required",
+                "timestamp": datetime.now().isoformat()
+            }, 400
+        
+        product_id = str(data["product_id"])
+        product_title = data.get("title", "Unknown Product")
+        price = data.get("price", 0)
+        
+        analysis, info = analyze_incremental(
+            product_id, product_title, price,
+            added=data.get("added_reviews") or [],
+            removed=data.get("removed_reviews") or [],
+            reviews=data.get("reviews")
+        )
+        
+        logger.info(f"🔁 Incremental update for {product_id}: +{info['analyzed_reviews']} analyzed, "
+                   f"-{info['removed_reviews']} removed, {info['review_count']} total")
+        
+        response = analysis_response(analysis, product_title, price, info["review_count"], start_time)
+        response["incremental"] = info
+        return response, 200
+        
+    except Exception as e:
+        logger.error(f"❌ Incremental analysis error: {str(e)}", exc_info=True)
+        
+        return {
+            "success": False,
+            "error": "Internal server error",
+            "message": str(e),
+            "recommendation": "Analysis Failed",
+            "timestamp": datetime.now().isoformat()
+        }, 500
+
+
+def handle_compare(data):
+    """Rank candidate products in one pass.
+    
+    Payload: ``products`` (list of {id, title, price, reviews}), ``metric``
+    (one of METRICS, default value_score), ``top_k`` (default 5),
+    ``include_matrix`` for every candidate's metrics and ``timings``.
+    """
+    start_time = time.perf_counter()
+    timer = StageTimer()
+    
+    def bad_request(error):
+        return {
+            "success": False,
+            "error": error,
+            "timestamp": datetime.now().isoformat()
+        }, 400
+    
+    try:
+        if not data or not isinstance(data, dict) or not isinstance(data.get("products"), list):
+            return bad_request("Expected {\"products\": [...]}")
+        
+        products = data["products"]
+        if not products:
+            return bad_request("No products to compare")
+        if len(products) > config.MAX_COMPARE_SIZE:
+            return {
+                "success": False,
+                "error": f"Too many products (max {config.MAX_COMPARE_SIZE})",
+                "timestamp": datetime.now().isoformat()
+            }, 413
+        
+        metric = data.get("metric", "value_score")
+        if metric not in METRICS:
+            return bad_request(f"Unknown metric {metric!r} (expected one of: {', '.join(METRICS)})")
+        top_k = data.get("top_k", 5)
+        if not isinstance(top_k, int) or isinstance(top_k, bool) or top_k < 1:
+            return bad_request("top_k must be a positive integer")
+        for index, product in enumerate(products):
+            if not isinstance(product, dict) or not isinstance(product.get("reviews", []), list):
+                return bad_request(f"Product {index} must be an object with a reviews list")
+            try:
+                float(product.get("price") or 0)
+            except (TypeError, ValueError):
+                return bad_request(f"Product {index} has a non-numeric price")
+        
+        logger.info(f"⚖️ Comparing {len(products)} products by {metric} (top {top_k})")
+        comparison = compare_products(products, metric, top_k, timer, bool(data.get("include_matrix")))
+        
+        response = {
+            "success": True,
+            "count": len(products),
+            "top_k": top_k,
+            **comparison,
+            "timestamp": datetime.now().isoformat(),
+            "processing_time_ms": (time.perf_counter() - start_time) * 1000,
+            "version": "2.0"
+        }
+        if data.get("timings"):
+            response["timings_ms"] = timer.as_ms()
+        return response, 200
+        
+    except Exception as e:
+        logger.error(f"❌ Comparison error: {str(e)}", exc_info=True)
+        
+        return {
+            "success": False,
+            "error": "Internal server error",
+            "message": str(e),
+            "timestamp": datetime.now().isoformat()
+        }, 500
+
+
+def handle_model_reload(data, token=None):
+    """Swap in a new model version without a restart (admin only).
+    
+    Payload (optional): ``model`` (default: every model) and ``version``
+    (a model store version, activated for every worker; default: what a
+    fresh process would load). The new model is warmed with a smoke batch
+    first; if it fails, the old one keeps serving.
+    """
+    if not config.ADMIN_TOKEN:
+        return {
+            "success": False,
+            "error": "Admin endpoints are disabled (set CONSIA_ADMIN_TOKEN)",
+            "timestamp": datetime.now().isoformat()
+        }, 403
+    if not hmac.compare_digest((token or "").encode("utf-8"), config.ADMIN_TOKEN.encode("utf-8")):
+        return {
+            "success": False,
+            "error": "Invalid admin token",
+            "timestamp": datetime.now().isoformat()
+        }, 401
+    
+    data = data if isinstance(data, dict) else {}
+    name = data.get("model")
+    version = data.get("version")
+    if name is not None and name not in model_registry.specs:
+        return {
+            "success": False,
+            "error": f"Unknown model {name!r} (expected one of: {', '.join(model_registry.specs)})",
+            "timestamp": datetime.now().isoformat()
+        }, 400
+    if version is not None and (name is None or not isinstance(version, str)):
+        return {
+            "success": False,
+            "error": "version needs a single model and must be a string",
+            "timestamp": datetime.now().isoformat()
+        }, 400
+    
+    names = [name] if name is not None else list(model_registry.specs)
+    logger.info(f"🔄 Reloading models: {', '.join(names)}" + (f" (version {version})" if version else ""))
+    results = {model: model_registry.reload(model, version) for model in names}
+    success = all(result["success"] for result in results.values())
+    return {
+        "success": success,
+        "models": results,
+        "available_versions": {model: list_versions(model) for model in names},
+        "timestamp": datetime.now().isoformat()
+    }, 200 if success else 500
+
+
+def handle_batch(data):
+    """Batch analysis handler for multiple products at once"""
+    try:
+        if not data or not isinstance(data, list):
+            return {
+                "success": False,
+                "error": "Expected list of products",
+                "timestamp": datetime.now().isoformat()
+            }, 400
+        
+        if len(data) > config.MAX_BATCH_SIZE:
+            return {
+                "success": False,
+                "error": f"Batch too large (max {config.MAX_BATCH_SIZE} products)",
+                "timestamp": datetime.now().isoformat()
+            }, 413
+        
+        # Products run concurrently on the worker pool; one bad item never fails the batch
+        results = run_batch(data)
+        
+        return {
+            "success": True,
+            "count": len(results),
+            "failed": sum(1 for result in results if not result["success"]),
+            "results": results,
+            "timestamp": datetime.now().isoformat()
+        }, 200
+        
+    except Exception as e:
+        logger.error(f"Batch analysis error: {str(e)}")
+        return {
+            "success": False,
+            "error": str(e),
+            "timestamp": datetime.now().isoformat()
+        }, 500
@@ -1,9 +1,16 @@
 # backend/app.py - ENHANCED VERSION
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, stream_with_context
 from flask_cors import CORS
 from datetime import datetime
+import json
 import logging
-from services.analyzer import analyze_product
+import time
+from api import (health_payload, handle_analyze, handle_analyze_incremental, handle_batch, handle_compare,
+                 handle_model_reload)
+from services import codec, config
+from services.batch import stream_batch, parse_ndjson_products
+from services.models import model_registry
+from services import metrics
 
 app = Flask(__name__)
 CORS(app)  # allow extension requests
@@ -12,155 +19,149 @@ CORS(app)  # allow extension requests
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Models load lazily on first request unless warm-up is requested
+if config.WARM_MODELS:
+    model_registry.warm_up()
+# Follow model versions activated in the model store (this process only)
+model_registry.start_watcher()
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    metrics.observe_request(endpoint, response.status_code,
+                            time.perf_counter() - g.get("request_start", time.perf_counter()))
+    return response
+
+
+def json_response(body, status=200):
+    """JSON response (orjson when available) with the serialization time recorded as its own stage"""
+    start = time.perf_counter()
+    response = Response(codec.dumps(body), mimetype="application/json")
+    metrics.STAGE_SECONDS.observe(time.perf_counter() - start, stage="serialization")
+    return response, status
+
+
+def request_payload():
+    """Decoded request body: JSON, MessagePack or compact reviews, optionally gzip/zstd compressed.
+
+    The body is decompressed as it is read; None if it is empty or not valid JSON.
+    """
+    return codec.decode_stream(request.stream, request.content_type, request.headers.get("Content-Encoding"))
+
+
+@app.errorhandler(codec.PayloadError)
+def payload_error(e):
+    return json_response({
+        "success": False,
+        "error": str(e),
+        "timestamp": datetime.now().isoformat()
+    }, e.status)
+
+
 @app.route("/health", methods=["GET"])
 def health():
     """Health check endpoint"""
-    return jsonify({
-        "status": "ok", 
-        "message": "Consia backend running ✅",
-        "version": "2.0",
-        "timestamp": datetime.now().isoformat(),
-        "features": ["sentiment", "fake_detection", "value_score", "true_rating", "pros_cons"]
-    })
+    return json_response(health_payload())
+
+
+@app.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    """Prometheus metrics (per process)"""
+    return Response(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
 
 
 @app.route("/analyze", methods=["POST"])
 def analyze():
     """Main analysis endpoint"""
-    start_time = datetime.now()
-    
-    try:
-        data = request.get_json()
-        
-        if not data:
-            logger.warning("No data provided in request")
-            return jsonify({
-                "success": False,
-                "error": "No data provided",
-                "timestamp": datetime.now().isoformat()
-            }), 400
-        
-        # Extract data with defaults
-        product_title = data.get("title", "Unknown Product")
-        price = data.get("price", 0)
-        reviews = data.get("reviews", [])
-        
-        logger.info(f"🔍 Analyzing: {product_title[:60]}...")
-        logger.info(f"💰 Price: ₹{price}")
-        logger.info(f"📝 Reviews: {len(reviews)}")
-        
-        if not reviews:
-            logger.warning("No reviews provided for analysis")
-        
-        # Analyze the product
-        analysis = analyze_product(product_title, price, reviews)
-        
-        # Enhanced response format
-        response = {
-            "success": True,
-            "recommendation": analysis.get("recommendation", "Analysis Failed"),
-            "confidence": analysis.get("confidence", "Medium"),
-            "summary": analysis.get("analysis_summary", ""),
-            
-            # Product info
-            "product": {
-                "title": analysis.get("title", product_title),
-                "price": analysis.get("price", price),
-                "review_count": analysis.get("review_count", len(reviews))
-            },
-            
-            # Analysis metrics
-            "metrics": {
-                "sentiment": {
-                    "positive": analysis.get("sentiment", {}).get("positive_percent", 0),
-                    "negative": analysis.get("sentiment", {}).get("negative_percent", 0),
-                    "neutral": analysis.get("sentiment", {}).get("neutral_percent", 0)
-                },
-                "fake_reviews_percent": analysis.get("fake_review_percent", 0),
-                "value_score": analysis.get("value_score", 0),
-                "true_rating": analysis.get("true_rating", 0)
-            },
-            
-            # Insights
-            "insights": {
-                "pros": analysis.get("pros", []),
-                "cons": analysis.get("cons", [])
-            },
-            
-            # Metadata
-            "timestamp": datetime.now().isoformat(),
-            "processing_time_ms": (datetime.now() - start_time).total_seconds() * 1000,
-            "version": "2.0"
-        }
-        
-        logger.info(f"✅ Analysis complete: {analysis.get('recommendation', 'Unknown')}")
-        logger.info(f"📊 Results - Sentiment: {analysis.get('sentiment', {}).get('positive_percent', 0)}% positive, "
-                   f"Fake: {analysis.get('fake_review_percent', 0)}%, "
-                   f"Rating: {analysis.get('true_rating', 0)}⭐")
-        
-        return jsonify(response)
-        
-    except Exception as e:
-        logger.error(f"❌ Analysis error: {str(e)}", exc_info=True)
-        
-        return jsonify({
-            "success": False,
-            "error": "Internal server error",
-            "message": str(e),
-            "recommendation": "Analysis Failed",
-            "timestamp": datetime.now().isoformat()
-        }), 500
+    return json_response(*handle_analyze(request_payload()))
+
+
+@app.route("/analyze/incremental", methods=["POST"])
+def analyze_incremental():
+    """Incremental analysis: only new/removed reviews for a known product ID"""
+    return json_response(*handle_analyze_incremental(request_payload()))
+
+
+@app.route("/compare", methods=["POST"])
+def compare():
+    """Rank candidate products (find better alternatives) in one request"""
+    return json_response(*handle_compare(request_payload()))
+
+
+@app.route("/admin/models/reload", methods=["POST"])
+def reload_models():
+    """Hot-swap models (X-Admin-Token header required)"""
+    return json_response(*handle_model_reload(request_payload(), request.headers.get("X-Admin-Token")))
 
 
 @app.route("/batch-analyze", methods=["POST"])
 def batch_analyze():
     """Optional: Endpoint for analyzing multiple products at once"""
-    try:
-        data = request.get_json()
-        
-        if not data or not isinstance(data, list):
-            return jsonify({
-                "success": False,
-                "error": "Expected list of products",
-                "timestamp": datetime.now().isoformat()
-            }), 400
-        
-        results = []
-        for product_data in data:
-            title = product_data.get("title", "")
-            price = product_data.get("price", 0)
-            reviews = product_data.get("reviews", [])
-            
-            analysis = analyze_product(title, price, reviews)
-            results.append({
-                "title": title,
-                "recommendation": analysis.get("recommendation", "Unknown"),
-                "true_rating": analysis.get("true_rating", 0),
-                "value_score": analysis.get("value_score", 0)
-            })
+    return json_response(*handle_batch(request_payload()))
+
+
+@app.route("/batch-analyze/stream", methods=["POST"])
+def batch_analyze_stream():
+    """Streaming batch analysis: NDJSON products in, one NDJSON result line out per product.
+    
+    Results are written as soon as each product finishes (completion order,
+    with the input ``index``), followed by a final summary line. The body
+    may be gzip/zstd compressed; if it turns out too large or corrupt
+    mid-stream, the products read so far are finished and the summary
+    line carries the ``error``.
+    """
+    # Bodies that are rejected outright get a plain error response, before streaming starts
+    if request.content_length and request.content_length > config.MAX_REQUEST_BYTES:
+        raise codec.PayloadError(413, f"Request too large (max {config.MAX_REQUEST_BYTES} bytes)")
+    reader = codec.LineReader(request.stream, request.headers.get("Content-Encoding"))
+    input_errors = []
+    
+    def lines():
+        try:
+            yield from reader
+        except codec.PayloadError as e:
+            input_errors.append(e)
+    
+    def generate():
+        count = 0
+        failed = 0
         
-        return jsonify({
-            "success": True,
-            "count": len(results),
-            "results": results,
-            "timestamp": datetime.now().isoformat()
-        })
+        for index, result in stream_batch(parse_ndjson_products(lines())):
+            count += 1
+            if not result["success"]:
+                failed += 1
+            yield json.dumps({"index": index, **result}, ensure_ascii=False) + "\n"
         
-    except Exception as e:
-        logger.error(f"Batch analysis error: {str(e)}")
-        return jsonify({
-            "success": False,
-            "error": str(e),
+        summary = {
+            "done": True,
+            "count": count,
+            "failed": failed,
             "timestamp": datetime.now().isoformat()
-        }), 500
+        }
+        if input_errors:
+            summary["error"] = str(input_errors[0])
+            summary["status"] = input_errors[0].status
+        yield json.dumps(summary) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
 
 
 if __name__ == "__main__":
     logger.info("🚀 Starting Consia Backend Server v2.0...")
     logger.info("📡 Endpoints:")
     logger.info("  GET  /health        - Health check")
+    logger.info("  GET  /metrics       - Prometheus metrics")
     logger.info("  POST /analyze       - Analyze single product")
+    logger.info("  POST /analyze/incremental - Update a product with new/removed reviews")
+    logger.info("  POST /compare       - Rank candidate products by a metric")
     logger.info("  POST /batch-analyze - Analyze multiple products")
+    logger.info("  POST /admin/models/reload - Hot-swap models (admin)")
+    logger.info("  POST /batch-analyze/stream - Stream NDJSON batch analysis")
     logger.info("🌐 Server running on http://127.0.0.1:5000")
     
     app.run(host="127.0.0.1", port=5000, debug=True)
\ No newline at end of file
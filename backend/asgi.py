@@ -0,0 +1,175 @@
+# backend/asgi.py - ASYNC (ASGI) SERVING MODE
+# Same /health, /metrics, /analyze, /batch-analyze and /admin contracts as
+# app.py, served by an event loop. CPU-bound analysis runs on a thread executor; when more
+# than ASGI_MAX_IN_FLIGHT requests are running or queued, new ones get a
+# fast 503 with Retry-After instead of piling up.
+#
+# Run with: python backend/serve.py  (or any ASGI server: asgi:app)
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from api import (health_payload, handle_analyze, handle_analyze_incremental, handle_batch, handle_compare,
+                 handle_model_reload)
+from services import codec, config, metrics
+from services.codec import BodyDecoder, PayloadError
+from services.models import model_registry
+
+logger = logging.getLogger(__name__)
+
+CORS_HEADERS = [
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-headers", b"Content-Type, Content-Encoding"),
+    (b"access-control-allow-methods", b"GET, POST, OPTIONS"),
+]
+
+
+class ConsiaASGI:
+    """Minimal ASGI application with bounded concurrency and backpressure"""
+
+    def __init__(self, max_in_flight=None, executor_threads=None):
+        self.max_in_flight = max_in_flight or config.ASGI_MAX_IN_FLIGHT
+        self.executor = ThreadPoolExecutor(
+            max_workers=executor_threads or config.ASGI_EXECUTOR_THREADS,
+            thread_name_prefix="consia-analyze"
+        )
+        self.in_flight = 0
+        self.rejected = 0
+        self.routes = {
+            ("POST", "/analyze"): handle_analyze,
+            ("POST", "/analyze/incremental"): handle_analyze_incremental,
+            ("POST", "/compare"): handle_compare,
+            ("POST", "/batch-analyze"): handle_batch,
+            ("POST", "/admin/models/reload"): handle_model_reload,
+        }
+        self.admin_paths = {"/admin/models/reload"}
+        self.known_paths = {path for _, path in self.routes} | {"/health", "/metrics"}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                if config.WARM_MODELS:
+                    await asyncio.get_running_loop().run_in_executor(self.executor, model_registry.warm_up)
+                model_registry.start_watcher()
+                logger.info("🚀 Consia ASGI worker ready")
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope, receive, send):
+        start = time.perf_counter()
+        path = scope["path"].rstrip("/") or "/"
+        status_holder = []
+
+        async def send_and_record(message):
+            if message["type"] == "http.response.start":
+                status_holder.append(message["status"])
+            await send(message)
+
+        try:
+            await self._dispatch(scope, path, receive, send_and_record)
+        finally:
+            endpoint = path if path in self.known_paths else "unmatched"
+            metrics.observe_request(endpoint, status_holder[0] if status_holder else 500,
+                                    time.perf_counter() - start)
+
+    async def _dispatch(self, scope, path, receive, send):
+        method = scope["method"]
+
+        if method == "OPTIONS":
+            await self._respond(send, 204, None)
+            return
+
+        if (method, path) == ("GET", "/health"):
+            body = health_payload()
+            body["in_flight"] = self.in_flight
+            body["rejected"] = self.rejected
+            await self._respond(send, 200, body)
+            return
+
+        if (method, path) == ("GET", "/metrics"):
+            payload = metrics.registry.render().encode("utf-8")
+            await send({"type": "http.response.start", "status": 200, "headers": [
+                (b"content-type", metrics.CONTENT_TYPE.encode()),
+                (b"content-length", str(len(payload)).encode()),
+            ]})
+            await send({"type": "http.response.body", "body": payload})
+            return
+
+        handler = self.routes.get((method, path))
+        if handler is None:
+            await self._respond(send, 404, {
+                "success": False,
+                "error": "Not found",
+                "timestamp": datetime.now().isoformat()
+            })
+            return
+
+        # Backpressure: fail fast instead of queueing without bound
+        if self.in_flight >= self.max_in_flight:
+            self.rejected += 1
+            await self._respond(send, 503, {
+                "success": False,
+                "error": "Server busy, retry later",
+                "timestamp": datetime.now().isoformat()
+            }, extra_headers=[(b"retry-after", str(config.ASGI_RETRY_AFTER).encode())])
+            return
+
+        self.in_flight += 1
+        try:
+            try:
+                data = await self._read_payload(scope, receive)
+            except PayloadError as e:
+                await self._respond(send, e.status, {
+                    "success": False,
+                    "error": str(e),
+                    "timestamp": datetime.now().isoformat()
+                })
+                return
+
+            if path in self.admin_paths:
+                token = dict(scope.get("headers") or []).get(b"x-admin-token", b"").decode("latin-1")
+                handler = functools.partial(handler, token=token)
+
+            loop = asyncio.get_running_loop()
+            body, status = await loop.run_in_executor(self.executor, handler, data)
+            await self._respond(send, status, body)
+        finally:
+            self.in_flight -= 1
+
+    async def _read_payload(self, scope, receive):
+        """Decode the request body as it arrives (see services/codec.py); raises PayloadError"""
+        headers = dict(scope.get("headers") or [])
+        decoder = BodyDecoder(headers.get(b"content-type", b"").decode("latin-1"),
+                              headers.get(b"content-encoding", b"").decode("latin-1") or None)
+        while True:
+            message = await receive()
+            decoder.feed(message.get("body", b""))
+            if not message.get("more_body", False):
+                return decoder.finish()
+
+    async def _respond(self, send, status, body, extra_headers=()):
+        start = time.perf_counter()
+        payload = b"" if body is None else codec.dumps(body)
+        metrics.STAGE_SECONDS.observe(time.perf_counter() - start, stage="serialization")
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+        ] + CORS_HEADERS + list(extra_headers)
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": payload})
+
+
+logging.basicConfig(level=logging.INFO)
+app = ConsiaASGI()
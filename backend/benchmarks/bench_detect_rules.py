@@ -0,0 +1,51 @@
+# backend/benchmarks/bench_detect_rules.py - RULE DETECTOR SCALING
+# Times FakeDetectorML's rule-based detector on reviews from 10 to 10,000
+# words, both spammy (heavy repetition) and with no repeated words (the
+# worst case for a per-word count). Time per word should stay flat.
+#
+#   python backend/benchmarks/bench_detect_rules.py
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.corpus import ReviewDoc
+from services.fake_review import fake_detector
+
+SPAM_WORDS = ["amazing", "product", "love", "best", "must", "buy", "great", "quality",
+              "perfect", "awesome", "five", "stars", "excellent", "value", "!!!"]
+
+
+def spammy_review(n_words, rng):
+    return " ".join(rng.choice(SPAM_WORDS) + str(rng.randint(0, n_words // 4)) for _ in range(n_words))
+
+
+def unique_review(n_words):
+    return " ".join(f"word{i}" for i in range(n_words))
+
+
+def time_rules(text, repeat=5):
+    """Best-of-N time of one uncached rule evaluation"""
+    best = float("inf")
+    for _ in range(repeat):
+        doc = ReviewDoc(text)
+        start = time.perf_counter()
+        fake_detector._detect_rules_doc(doc)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'words':>8} {'spammy (ms)':>12} {'unique (ms)':>12} {'us / word':>10}")
+    for n_words in [10, 100, 1000, 5000, 10000]:
+        spammy = time_rules(spammy_review(n_words, rng))
+        unique = time_rules(unique_review(n_words))
+        per_word = max(spammy, unique) * 1e6 / n_words
+        print(f"{n_words:>8} {spammy * 1000:>12.3f} {unique * 1000:>12.3f} {per_word:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# backend/benchmarks/payload_codecs.py - REQUEST/RESPONSE CODEC COSTS
+# Wire size, decode time and peak decode memory of an /analyze payload in
+# every supported body format (JSON, compact reviews, MessagePack if
+# installed) and encoding (identity, gzip, zstd if installed), plus the
+# response serialization time with the json and orjson codecs.
+#
+#   python backend/benchmarks/payload_codecs.py
+#   python backend/benchmarks/payload_codecs.py --reviews 2000 --output codecs.json
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_reviews
+from services import codec, config
+from services.analyzer import analyze_product
+from services.codec import CHUNK_SIZE, COMPACT_REVIEWS_TYPE, BodyDecoder, encode_compact_reviews
+
+
+def body_formats(payload):
+    formats = {
+        "json": ("application/json", json.dumps(payload, ensure_ascii=False).encode("utf-8")),
+        "compact": (COMPACT_REVIEWS_TYPE, encode_compact_reviews(payload)),
+    }
+    try:
+        import msgpack
+        formats["msgpack"] = ("application/msgpack", msgpack.packb(payload))
+    except ImportError:
+        pass
+    return formats
+
+
+def encodings():
+    found = {"identity": lambda raw: raw, "gzip": lambda raw: gzip.compress(raw, 6)}
+    try:
+        import zstandard
+        found["zstd"] = zstandard.ZstdCompressor(level=3).compress
+    except ImportError:
+        pass
+    return found
+
+
+def decode(content_type, encoding, body):
+    decoder = BodyDecoder(content_type, None if encoding == "identity" else encoding)
+    for start in range(0, len(body), CHUNK_SIZE):
+        decoder.feed(body[start:start + CHUNK_SIZE])
+    return decoder.finish()
+
+
+def measure(content_type, encoding, body, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        decode(content_type, encoding, body)
+    seconds = (time.perf_counter() - start) / repeat
+    tracemalloc.start()
+    decode(content_type, encoding, body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure request/response codec costs")
+    parser.add_argument("--reviews", type=int, default=2000, help="reviews in the payload")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results JSON here")
+    args = parser.parse_args()
+
+    payload = {"title": "Benchmark Phone 128GB", "price": 14999, "reviews": make_reviews(args.reviews, seed=args.seed)}
+
+    print(f"📦 /analyze payload with {args.reviews} reviews")
+    print(f"{'body':<9} {'encoding':<9} {'wire KB':>9} {'decode ms':>10} {'peak KB':>9}")
+    requests = []
+    for name, (content_type, raw) in body_formats(payload).items():
+        for encoding, compress in encodings().items():
+            body = compress(raw)
+            seconds, peak = measure(content_type, encoding, body, args.repeat)
+            requests.append({"body": name, "encoding": encoding, "wire_bytes": len(body),
+                             "decode_ms": round(seconds * 1000, 3), "peak_bytes": peak})
+            print(f"{name:<9} {encoding:<9} {len(body) / 1024:>9.1f} {seconds * 1000:>10.2f} {peak / 1024:>9.0f}")
+
+    analysis = analyze_product(payload["title"], payload["price"], payload["reviews"])
+    print(f"\n📤 Response serialization ({len(codec.dumps(analysis)) / 1024:.1f} KB)")
+    responses = {}
+    for name in ("json", "auto"):
+        config.JSON_CODEC = name
+        label = "orjson" if codec.use_orjson() else "json"
+        start = time.perf_counter()
+        for _ in range(args.repeat * 10):
+            codec.dumps(analysis)
+        responses[label] = round((time.perf_counter() - start) / (args.repeat * 10) * 1e6, 1)
+        print(f"{label:<9} {responses[label]:>9.1f} µs")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"reviews": args.reviews, "requests": requests, "responses_us": responses}, f, indent=2)
+        print(f"\n💾 Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
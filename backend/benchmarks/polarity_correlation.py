@@ -0,0 +1,102 @@
+# backend/benchmarks/polarity_correlation.py - POLARITY ENGINE AGREEMENT
+# Scores a test corpus with the lexicon engine and with TextBlob, and
+# reports how closely they agree (Pearson r, sentiment label agreement at
+# the +/-0.1 thresholds, mean absolute difference) and how fast each is.
+#
+#   python backend/benchmarks/polarity_correlation.py
+#   python backend/benchmarks/polarity_correlation.py --file reviews.txt --output polarity.json
+#
+# Without --file the corpus is seeded synthetic reviews plus their sentences;
+# --file takes one review per line. The synthetic corpus only exercises the
+# generator's templates: agreement on it says little about real reviews, so
+# judge the opt-in lexicon engine on a held-out file of real ones.
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from benchmarks.synthetic import make_reviews
+from services.corpus import ReviewDoc
+from services.polarity import LexiconPolarity, TextBlobPolarity
+
+
+def label(polarity):
+    # Same thresholds as SentimentML.classify_polarity (services/sentiment.py)
+    return "positive" if polarity > 0.1 else "negative" if polarity < -0.1 else "neutral"
+
+
+def timed_scores(engine, texts):
+    start = time.perf_counter()
+    scores = engine.score_batch(texts)
+    return np.array(scores, dtype=np.float64), time.perf_counter() - start
+
+
+def agreement(lexicon, textblob):
+    if len(lexicon) > 1 and lexicon.std() > 0 and textblob.std() > 0:
+        pearson = float(np.corrcoef(lexicon, textblob)[0, 1])
+    else:
+        pearson = float("nan")
+    return {
+        "pearson_r": round(pearson, 4),
+        "label_agreement": round(float(np.mean([label(a) == label(b) for a, b in zip(lexicon, textblob)])), 4),
+        "exact_matches": round(float(np.mean(np.abs(lexicon - textblob) < 1e-9)), 4),
+        "mean_abs_diff": round(float(np.mean(np.abs(lexicon - textblob))), 4),
+    }
+
+
+def compare_engines(name, texts, lexicon_engine, textblob_engine):
+    lexicon, lexicon_time = timed_scores(lexicon_engine, texts)
+    textblob, textblob_time = timed_scores(textblob_engine, texts)
+    result = {
+        "texts": len(texts),
+        **agreement(lexicon, textblob),
+        "lexicon_ms": round(lexicon_time * 1000, 2),
+        "textblob_ms": round(textblob_time * 1000, 2),
+        "speedup": round(textblob_time / max(lexicon_time, 1e-9), 1),
+    }
+    print(f"{name:<10} {result['texts']:>7} {result['pearson_r']:>9.4f} {result['label_agreement']:>9.2%} "
+          f"{result['mean_abs_diff']:>9.4f} {result['lexicon_ms']:>11.1f} {result['textblob_ms']:>11.1f} "
+          f"{result['speedup']:>7.1f}x")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the lexicon polarity engine with TextBlob")
+    parser.add_argument("--reviews", type=int, default=2000, help="synthetic reviews to score")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--file", help="score these reviews instead (one per line)")
+    parser.add_argument("--output", help="write results JSON here")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            reviews = [line.strip() for line in f if line.strip()]
+    else:
+        reviews = make_reviews(args.reviews, seed=args.seed)
+    sentences = [sentence.text for review in reviews for sentence in ReviewDoc(review).sentences]
+
+    lexicon_engine = LexiconPolarity()
+    textblob_engine = TextBlobPolarity()
+    textblob_engine.score("warm up")  # keep TextBlob's lazy lexicon load out of the timings
+
+    print("📊 Lexicon vs TextBlob polarity")
+    print(f"{'corpus':<10} {'texts':>7} {'pearson':>9} {'labels':>9} {'mean |d|':>9} "
+          f"{'lexicon ms':>11} {'textblob ms':>11} {'speedup':>8}")
+    results = {
+        "reviews": compare_engines("reviews", reviews, lexicon_engine, textblob_engine),
+        "sentences": compare_engines("sentences", sentences, lexicon_engine, textblob_engine),
+    }
+
+    if args.output:
+        report = {"lexicon": lexicon_engine.path, "lexicon_version": lexicon_engine.version, "results": results}
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
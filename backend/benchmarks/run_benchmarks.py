@@ -0,0 +1,238 @@
+# backend/benchmarks/run_benchmarks.py - ANALYSIS PIPELINE BENCHMARKS
+# Measures each analysis stage and the HTTP endpoints on seeded synthetic
+# corpora, and saves the numbers as JSON for comparison between runs.
+#
+#   python backend/benchmarks/run_benchmarks.py --output bench.json
+#   python backend/benchmarks/run_benchmarks.py --baseline bench.json --output new.json
+#
+# Verdict and result caches are cleared before every timed call, so the
+# numbers describe cold (uncached) analysis.
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_product, make_reviews
+from services.analyzer import analyze_product, extract_key_phrases
+from services import config
+from services.cache import result_cache, verdict_cache
+from services.compact import load_compact
+from services.corpus import ReviewCorpus
+from services.fake_review import fake_review_score
+from services.models import model_registry
+from services.scorer import LinearScorer
+from services.sentiment import get_sentiment_report
+
+SCENARIOS = {
+    "mixed": None,
+    "genuine": {"short_genuine": 0.6, "long_genuine": 0.4},
+    "spammy": {"short_spammy": 0.6, "long_spammy": 0.4},
+}
+
+
+def _pros_and_cons(reviews):
+    # Pros and cons share one corpus, as in analyze_product
+    corpus = ReviewCorpus(reviews)
+    extract_key_phrases(corpus, "positive")
+    extract_key_phrases(corpus, "negative")
+
+
+STAGES = {
+    "get_sentiment_report": get_sentiment_report,
+    "fake_review_score": fake_review_score,
+    "extract_key_phrases": _pros_and_cons,
+    "analyze_product": lambda reviews: analyze_product("Benchmark", 1299, reviews),
+}
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def clear_caches():
+    verdict_cache.clear()
+    result_cache.clear()
+
+
+def measure(fn, repeat, items):
+    """Latency percentiles (ms), throughput (items/s) and peak traced memory (MB)"""
+    latencies = []
+    for _ in range(repeat):
+        clear_caches()
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    # Separate traced run: tracemalloc slows execution, so it is not timed
+    clear_caches()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    mean_ms = sum(latencies) / len(latencies)
+    return {
+        "repeat": repeat,
+        "items": items,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(mean_ms, 3),
+        "throughput_per_s": round(items / (mean_ms / 1000), 1) if mean_ms else 0.0,
+        "peak_memory_mb": round(peak / (1024 * 1024), 3)
+    }
+
+
+def bench_stages(sizes, scenarios, repeat, seed):
+    results = {}
+    for scenario in scenarios:
+        for size in sizes:
+            reviews = make_reviews(size, seed=seed, mix=SCENARIOS[scenario])
+            # Fewer repeats for the very large corpora
+            runs = max(3, repeat if size < 1000 else repeat // 2)
+            for stage, fn in STAGES.items():
+                key = f"stage/{stage}/{scenario}/{size}"
+                results[key] = measure(lambda: fn(reviews), runs, size)
+                print(f"  {key:<55} p50 {results[key]['p50_ms']:>10.2f} ms")
+    return results
+
+
+def bench_endpoints(sizes, repeat, seed, batch_products):
+    from app import app
+    client = app.test_client()
+    results = {}
+
+    for size in sizes:
+        payload = make_product(size, seed=seed)
+        key = f"endpoint/analyze/{size}"
+        results[key] = measure(lambda: client.post("/analyze", json=payload), max(3, repeat), size)
+        print(f"  {key:<55} p50 {results[key]['p50_ms']:>10.2f} ms")
+
+    batch = [make_product(100, seed=seed + i) for i in range(batch_products)]
+    key = f"endpoint/batch-analyze/{batch_products}x100"
+    results[key] = measure(lambda: client.post("/batch-analyze", json=batch), max(3, repeat // 2),
+                           batch_products)
+    print(f"  {key:<55} p50 {results[key]['p50_ms']:>10.2f} ms")
+    return results
+
+
+def _scorer_paths():
+    """predict_proba(texts) for every available sentiment inference path"""
+    paths = {}
+    if os.path.exists(config.SENTIMENT_MODEL_PATH) and os.path.exists(config.SENTIMENT_VECTORIZER_PATH):
+        import joblib
+        vectorizer = joblib.load(config.SENTIMENT_VECTORIZER_PATH)
+        model = joblib.load(config.SENTIMENT_MODEL_PATH)
+        paths["sklearn"] = lambda texts: model.predict_proba(vectorizer.transform(texts))
+        scorer = LinearScorer.from_sklearn(vectorizer, model)
+        if scorer is not None:
+            paths["fast_scorer"] = scorer.predict_proba
+    compact_dir = os.path.join(config.COMPACT_MODEL_DIR, "sentiment")
+    if os.path.exists(os.path.join(compact_dir, "meta.json")):
+        compact_vectorizer, compact_model = load_compact(compact_dir)
+        paths["compact"] = lambda texts: compact_model.predict_proba(compact_vectorizer.transform(texts))
+        scorer = LinearScorer.from_compact(compact_vectorizer, compact_model)
+        if scorer is not None:
+            paths["fast_scorer_compact"] = scorer.predict_proba
+    return paths
+
+
+def bench_scorers(sizes, repeat, seed):
+    """Sentiment inference throughput per path, and agreement with scikit-learn"""
+    paths = _scorer_paths()
+    results = {}
+    for size in sizes:
+        texts = make_reviews(size, seed=seed)
+        reference = paths["sklearn"](texts) if "sklearn" in paths else None
+        for name, predict_proba in paths.items():
+            key = f"scorer/{name}/{size}"
+            results[key] = measure(lambda: predict_proba(texts), max(3, repeat), size)
+            if reference is not None:
+                results[key]["max_abs_diff"] = float(abs(predict_proba(texts) - reference).max())
+            print(f"  {key:<55} p50 {results[key]['p50_ms']:>10.2f} ms "
+                  f"({results[key]['throughput_per_s']:.0f} reviews/s)")
+    return results
+
+
+def compare(results, baseline_path):
+    """Print p50 latency change against a previous run"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    print(f"\n📊 Compared with {baseline_path} (p50 latency):")
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        before = baseline[key]["p50_ms"]
+        after = result["p50_ms"]
+        change = (after - before) / before * 100 if before else 0.0
+        marker = "🟢" if change < -5 else "🔴" if change > 5 else "⚪"
+        print(f"  {marker} {key:<55} {before:>10.2f} -> {after:>10.2f} ms ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Consia analysis pipeline")
+    parser.add_argument("--sizes", default="10,100,1000,10000",
+                        help="comma-separated reviews per product")
+    parser.add_argument("--scenarios", default="mixed,genuine,spammy",
+                        help=f"comma-separated corpus mixes ({', '.join(SCENARIOS)})")
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per measurement")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-products", type=int, default=20)
+    parser.add_argument("--skip-endpoints", action="store_true")
+    parser.add_argument("--skip-scorers", action="store_true")
+    parser.add_argument("--quick", action="store_true", help="small sizes only (smoke run)")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    args = parser.parse_args()
+
+    sizes = [10, 100] if args.quick else [int(size) for size in args.sizes.split(",")]
+    scenarios = [scenario.strip() for scenario in args.scenarios.split(",")]
+
+    print("🚀 Consia benchmark")
+    model_registry.warm_up()  # keep model load time out of the measurements
+
+    results = bench_stages(sizes, scenarios, args.repeat, args.seed)
+    if not args.skip_scorers:
+        results.update(bench_scorers(sizes, args.repeat, args.seed))
+    if not args.skip_endpoints:
+        results.update(bench_endpoints(sizes, args.repeat, args.seed, args.batch_products))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+            "sizes": sizes,
+            "scenarios": scenarios,
+            "models": {name: status.get("version") for name, status in model_registry.status().items()}
+        },
+        "results": results
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results saved to {args.output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# backend/benchmarks/synthetic.py - SEEDED SYNTHETIC REVIEW CORPORA
+# Deterministic review generator for benchmarks: the same seed always
+# yields the same products, so runs can be compared against a baseline.
+import random
+
+POSITIVE_SNIPPETS = [
+    "Great product, very happy with the purchase",
+    "Excellent quality and worth the money",
+    "The battery life is good and it charges fast",
+    "Comfortable to use for long hours, would recommend",
+    "Nice build quality, looks better than in the pictures",
+    "Delivery was quick and the packaging was perfect",
+    "Good value for money at this price point",
+    "Works exactly as described, satisfied customer",
+]
+
+NEGATIVE_SNIPPETS = [
+    "Poor quality, stopped working after a week",
+    "Terrible customer service, they never replied",
+    "The size is smaller than expected and feels cheap",
+    "Disappointed with the performance, returning it",
+    "Received a defective unit with a broken cable",
+    "Waste of money, don't buy this",
+    "Battery drains quickly and the screen has issues",
+    "Not good for heavy use, the motor overheats",
+]
+
+NEUTRAL_SNIPPETS = [
+    "It arrived on Tuesday in a brown box",
+    "The color is blue as shown in the listing",
+    "I use it mostly on weekends",
+    "Took about five days to deliver",
+    "The manual is in English and Hindi",
+]
+
+SPAM_SNIPPETS = [
+    "Best product ever!!!", "Must buy!!", "Amazing amazing amazing!!!",
+    "Love it love it love it!", "Perfect perfect!!", "Highly recommend!!!",
+    "Awesome!!! 5 stars!!!", "Excellent!! Superb!!",
+]
+
+PROFILES = ("short_genuine", "long_genuine", "short_spammy", "long_spammy")
+
+
+def _genuine_review(rng, sentences):
+    pool = rng.choice([POSITIVE_SNIPPETS, POSITIVE_SNIPPETS, NEGATIVE_SNIPPETS])
+    parts = [rng.choice(pool) for _ in range(sentences)]
+    if rng.random() < 0.3:
+        parts.insert(rng.randrange(len(parts) + 1), rng.choice(NEUTRAL_SNIPPETS))
+    return ". ".join(parts) + "."
+
+
+def _spammy_review(rng, sentences):
+    return " ".join(rng.choice(SPAM_SNIPPETS) for _ in range(sentences))
+
+
+def make_review(rng, profile):
+    """One review for a profile: short/long x genuine/spammy"""
+    if profile == "short_genuine":
+        return _genuine_review(rng, rng.randint(1, 2))
+    if profile == "long_genuine":
+        return _genuine_review(rng, rng.randint(8, 25))
+    if profile == "short_spammy":
+        return _spammy_review(rng, rng.randint(1, 2))
+    if profile == "long_spammy":
+        return _spammy_review(rng, rng.randint(10, 40))
+    raise ValueError(f"Unknown profile: {profile}")
+
+
+def make_reviews(n_reviews, seed=0, mix=None):
+    """``n_reviews`` reviews drawn from a profile mix (default: mostly genuine)"""
+    rng = random.Random(seed)
+    mix = mix or {"short_genuine": 0.45, "long_genuine": 0.3, "short_spammy": 0.15, "long_spammy": 0.1}
+    profiles = list(mix)
+    weights = [mix[profile] for profile in profiles]
+    return [make_review(rng, rng.choices(profiles, weights)[0]) for _ in range(n_reviews)]
+
+
+def make_product(n_reviews, seed=0, mix=None):
+    """A product payload as the extension sends it to /analyze"""
+    rng = random.Random(seed)
+    return {
+        "title": f"Synthetic Product {seed}",
+        "price": rng.choice([499, 1299, 5999, 24999]),
+        "reviews": make_reviews(n_reviews, seed=seed, mix=mix)
+    }
@@ -0,0 +1,47 @@
+# backend/bulk_analyze.py - OFFLINE BULK ANALYSIS CLI
+# Analyzes catalog dumps without the HTTP layer (see services/bulk.py).
+#
+#   python backend/bulk_analyze.py reviews.csv --output results.jsonl --workers 8
+#   python backend/bulk_analyze.py products.jsonl --output results.parquet --resume
+#
+# Input rows are either whole products ({"product_id", "title", "price",
+# "reviews": [...]}) or single reviews ({"product_id", "title", "price",
+# "review"}) grouped by product.
+import argparse
+import sys
+from services import config
+from services.bulk import INPUT_FORMATS, OUTPUT_FORMATS, run_bulk
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze JSONL/CSV product dumps offline")
+    parser.add_argument("input", help="JSONL or CSV file")
+    parser.add_argument("--output", required=True, help="results file (.jsonl, .csv) or directory (.parquet)")
+    parser.add_argument("--input-format", choices=INPUT_FORMATS, help="default: from the file extension")
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS, help="default: from the output extension")
+    parser.add_argument("--workers", type=int, default=config.BATCH_WORKERS,
+                        help="analysis processes (default: CONSIA_BATCH_WORKERS)")
+    parser.add_argument("--chunk-size", type=int, default=16, help="products sent to a worker at a time")
+    parser.add_argument("--id-field", default="product_id", help="product id column of review rows")
+    parser.add_argument("--review-field", default="review", help="review text column of review rows")
+    parser.add_argument("--unsorted", action="store_true",
+                        help="group review rows of the whole file in memory (rows not contiguous per product)")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <output>.checkpoint.json)")
+    parser.add_argument("--checkpoint-every", type=int, default=1000, help="products between checkpoints")
+    parser.add_argument("--resume", action="store_true", help="continue from the checkpoint")
+    parser.add_argument("--progress-interval", type=float, default=5.0, help="seconds between progress lines")
+    args = parser.parse_args()
+
+    try:
+        run_bulk(args.input, args.output, args.input_format, args.output_format, args.workers,
+                 args.chunk_size, args.checkpoint, args.checkpoint_every, args.resume,
+                 args.id_field, args.review_field, args.unsorted, args.progress_interval)
+    except KeyboardInterrupt:
+        sys.exit(130)
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
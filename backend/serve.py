@@ -0,0 +1,42 @@
+# backend/serve.py - PRODUCTION LAUNCHER
+# Serves the ASGI app (asgi.py) with uvicorn and multiple worker processes.
+#
+#   python backend/serve.py --workers 4 --port 5000
+import argparse
+import logging
+import os
+from services import config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Consia backend (ASGI)")
+    parser.add_argument("--host", default=os.environ.get("CONSIA_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("CONSIA_PORT", 5000)))
+    parser.add_argument("--workers", type=int, default=config.SERVER_WORKERS,
+                        help="worker processes (default: CONSIA_SERVER_WORKERS)")
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        logger.error("❌ uvicorn is not installed: pip install uvicorn")
+        raise SystemExit(1)
+
+    logger.info(f"🚀 Starting Consia Backend Server v2.0 (ASGI, {args.workers} workers)...")
+    logger.info(f"🌐 Server running on http://{args.host}:{args.port}")
+
+    uvicorn.run(
+        "asgi:app",
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level="info"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,25 @@
 # backend/services/analyzer.py - ENHANCED VERSION
+import numpy as np
 from services.sentiment import get_sentiment_report
-from services.fake_review import fake_review_score
+from services.fake_review import fake_review_report
 from services.value_score import value_for_money_score
-from textblob import TextBlob
-import re
+from services import config
+from services.corpus import ReviewCorpus, score_polarities
+from services.sampling import sample_corpus, sample_reviews
+from services.dedup import dedupe_corpus
+from services.keywords import POSITIVE_MATCHER, NEGATIVE_MATCHER
+from services.metrics import REVIEWS_PROCESSED, StageTimer
+from services.budget import LatencyBudget
 
-def extract_key_phrases(reviews, sentiment_type="positive"):
+def extract_key_phrases(reviews, sentiment_type="positive", matcher=None):
     """Extract key phrases from reviews for Pros/Cons"""
     key_phrases = []
     
-    # Keywords for pros and cons
-    positive_keywords = ['good', 'great', 'excellent', 'awesome', 'best', 'love', 
-                         'perfect', 'amazing', 'worth', 'recommend', 'satisfied',
-                         'happy', 'value', 'quality', 'comfortable', 'nice']
+    # Bounded work: huge review sets are mined on a sample
+    corpus = sample_corpus(reviews)
     
-    negative_keywords = ['bad', 'poor', 'worst', 'waste', 'issue', 'problem',
-                         'disappointed', 'terrible', 'avoid', "don't buy", 'not good',
-                         'broken', 'defective', 'faulty', 'return', 'complaint']
-    
-    target_keywords = positive_keywords if sentiment_type == "positive" else negative_keywords
-    
-    for review in reviews:
-        # Clean the review
-        review = review[:500]  # Limit length for processing
-        
-        # Get sentences
-        sentences = re.split(r'[.!?]+', review)
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if 20 < len(sentence) < 150:  # Reasonable sentence length
-                # Check for keywords
-                if any(keyword in sentence.lower() for keyword in target_keywords):
-                    # Use TextBlob to check sentiment
-                    blob = TextBlob(sentence)
-                    sentiment = blob.sentiment.polarity
-                    
-                    # Validate sentiment matches type
-                    if (sentiment_type == "positive" and sentiment > 0.1) or \
-                       (sentiment_type == "negative" and sentiment < -0.1):
-                        
-                        # Make the phrase presentable
-                        phrase = sentence.capitalize()
-                        if not phrase.endswith('.'):
-                            phrase += '.'
-                        
-                        key_phrases.append(phrase)
+    for doc in corpus:
+        key_phrases.extend(review_key_phrases(doc, sentiment_type, matcher))
     
     # Remove duplicates while preserving order
     seen = set()
@@ -57,6 +31,38 @@ def extract_key_phrases(reviews, sentiment_type="positive"):
     
     return unique_phrases[:3]  # Return top 3
 
+def review_key_phrases(doc, sentiment_type="positive", matcher=None):
+    """Candidate Pros/Cons phrases from a single review (a ReviewDoc), in order"""
+    phrases = []
+    
+    # Keywords for pros and cons (compiled once in services.keywords)
+    if matcher is None:
+        matcher = POSITIVE_MATCHER if sentiment_type == "positive" else NEGATIVE_MATCHER
+    
+    # Sentences come pre-split (first 500 chars) and cached on the corpus
+    candidates = [
+        sentence for sentence in doc.sentences
+        if 20 < len(sentence.text) < 150  # Reasonable sentence length
+        and matcher.search(sentence.lower)  # Check for keywords
+    ]
+    
+    # Polarity is scored in one batch and shared by pros and cons
+    for sentence in score_polarities(candidates):
+        sentiment = sentence.polarity
+        
+        # Validate sentiment matches type
+        if (sentiment_type == "positive" and sentiment > 0.1) or \
+           (sentiment_type == "negative" and sentiment < -0.1):
+            
+            # Make the phrase presentable
+            phrase = sentence.text.capitalize()
+            if not phrase.endswith('.'):
+                phrase += '.'
+            
+            phrases.append(phrase)
+    
+    return phrases
+
 def calculate_true_rating(sentiment_score, fake_percent, review_count):
     """Calculate a true rating (1-5 stars) based on sentiment, fake reviews, and data quality"""
     
@@ -78,42 +84,156 @@ def calculate_true_rating(sentiment_score, fake_percent, review_count):
     # Round to 1 decimal place
     return round(true_rating, 1)
 
-def analyze_product(title, price, reviews):
+def calculate_true_ratings(sentiment_scores, fake_percents, review_counts):
+    """calculate_true_rating over arrays of candidates at once (unrounded)"""
+    base_rating = 1 + (np.asarray(sentiment_scores, dtype=np.float64) / 100) * 4
+    fake_penalty = (np.asarray(fake_percents, dtype=np.float64) / 100) * 1.5
+    review_bonus = np.minimum(0.5, np.asarray(review_counts, dtype=np.float64) / 100)
+    return np.clip(base_rating - fake_penalty + review_bonus, 1.0, 5.0)
+
+def analyze_product(title, price, reviews, timer=None, budget=None):
+    """Full analysis of one product.
+    
+    Each stage is timed with ``timer`` (a StageTimer; a private one is used
+    if omitted) and recorded in the stage latency histograms.
+    
+    ``budget`` (a LatencyBudget) bounds the latency: the sample is sized to
+    fit, stages run in priority order and take cheaper paths or are skipped
+    as time runs out. The result then carries a ``budget`` block whose
+    ``partial`` flag says whether anything was cut. Without fake detection
+    the scores and recommendation are withheld (see build_analysis).
+    """
+    timer = timer or StageTimer()
+    budget = budget or LatencyBudget()
+    
     if not reviews:
-        return {
-            "title": title,
-            "recommendation": "Not Enough Data ❓",
-            "reason": "No reviews found for analysis",
-            "sentiment": {},
-            "fake_review_percent": 0,
-            "value_score": 0,
-            "true_rating": 0,
-            "pros": [],
-            "cons": []
-        }
+        return empty_analysis(title)
 
-    # Get basic analysis
-    sentiment = get_sentiment_report(reviews)
-    fake_percent = fake_review_score(reviews)
-    value_score = value_for_money_score(price, sentiment["positive_percent"], fake_percent)
-    
-    # NEW: Calculate true rating
-    true_rating = calculate_true_rating(
-        sentiment["positive_percent"], 
-        fake_percent,
-        len(reviews)
-    )
+    REVIEWS_PROCESSED.inc(len(reviews))
+    
+    # Parse every review once; all stages below read from the same corpus,
+    # sampled down to the work budget (and latency budget) for large review sets
+    with timer.stage("preprocess"):
+        sample_size, strategy = budget.plan_sample(len(reviews))
+        if strategy == "random":
+            # Budget-forced uniform sample: only the sampled reviews are parsed
+            corpus = sample_reviews(reviews, sample_size)
+        else:
+            corpus = sample_corpus(ReviewCorpus(reviews), sample_size, strategy)
+    
+    # Score each (near-)duplicate cluster once, weighted by its copies
+    with timer.stage("dedup"), budget.track("dedup", "full", len(corpus)):
+        corpus = dedupe_corpus(corpus)
+    n = len(corpus)
+    
+    # Get basic analysis, most important stage first
+    path = budget.choose("sentiment", n)
+    with timer.stage("sentiment"), budget.track("sentiment", path, n):
+        sentiment = get_sentiment_report(corpus, use_ml=path == "ml_model")
+    
+    # Skipped fake detection leaves the fake share unknown (None), never 0%
+    fake_report = None
+    path = budget.choose("fake_detection", n)
+    if path:
+        with timer.stage("fake_detection"), budget.track("fake_detection", path, n):
+            fake_report = fake_review_report(corpus, use_ml=path == "ml_model")
     
     # NEW: Extract pros and cons
-    pros = extract_key_phrases(reviews, "positive")
-    cons = extract_key_phrases(reviews, "negative")
+    pros, cons = [], []
+    path = budget.choose("pros_cons", n)
+    if path:
+        with timer.stage("pros_cons"), budget.track("pros_cons", path, n):
+            pros = extract_key_phrases(corpus, "positive")
+            cons = extract_key_phrases(corpus, "negative")
     
-    # IMPROVED DECISION LOGIC (More realistic thresholds)
-    # Original was too strict: sentiment >= 70 and fake <= 15 and value >= 60
+    sampling = {
+        "strategy": (strategy or config.SAMPLE_STRATEGY) if corpus.is_sample else "none",
+        "budget": config.SAMPLE_BUDGET if sample_size is None else sample_size,
+        "population": corpus.population,
+        "analyzed": corpus.size,
+        "unique": len(corpus),
+        "confidence_intervals": {
+            "positive_percent": sentiment["confidence_intervals"]["positive"],
+            "negative_percent": sentiment["confidence_intervals"]["negative"],
+            "neutral_percent": sentiment["confidence_intervals"]["neutral"],
+            "fake_review_percent": fake_report["confidence_interval"] if fake_report else None
+        }
+    }
+    if corpus.duplicates is not None:
+        sampling["duplicates"] = corpus.duplicates
+    
+    with timer.stage("scoring"):
+        analysis = build_analysis(title, price, sentiment, fake_report["fake_percent"] if fake_report else None,
+                                  pros, cons, len(reviews), sampling)
+    
+    if budget.limited:
+        analysis["budget"] = budget.report()
+    return analysis
+
+def empty_analysis(title):
+    """Result for a product without any reviews"""
+    return {
+        "title": title,
+        "recommendation": "Not Enough Data ❓",
+        "reason": "No reviews found for analysis",
+        "sentiment": {},
+        "fake_review_percent": 0,
+        "value_score": 0,
+        "true_rating": 0,
+        "pros": [],
+        "cons": []
+    }
+
+# Given instead of a recommendation when fake detection was skipped
+INCOMPLETE_RECOMMENDATION = "⏱️ Incomplete Analysis"
+
+def build_analysis(title, price, sentiment, fake_percent, pros, cons, review_count, sampling=None):
+    """Value score, true rating and recommendation from the stage results.
     
+    ``fake_percent=None`` (fake detection did not run) withholds every
+    score that depends on it rather than assuming no fake reviews.
+    """
     positive_score = sentiment["positive_percent"]
     neutral_score = sentiment["neutral_percent"]
     
+    if fake_percent is None:
+        value_score = true_rating = None
+        recommendation, confidence = INCOMPLETE_RECOMMENDATION, "Low"
+        summary = "Fake reviews were not checked within the latency budget, so no recommendation is given."
+    else:
+        value_score = value_for_money_score(price, positive_score, fake_percent)
+        
+        # NEW: Calculate true rating
+        true_rating = calculate_true_rating(positive_score, fake_percent, review_count)
+        
+        recommendation, confidence = decide_recommendation(
+            positive_score, neutral_score, fake_percent, value_score, review_count
+        )
+        summary = generate_summary(recommendation, positive_score, fake_percent, true_rating)
+    
+    analysis = {
+        "title": title,
+        "price": price,
+        "recommendation": recommendation,
+        "confidence": confidence,  # NEW
+        "sentiment": sentiment,
+        "fake_review_percent": fake_percent,
+        "value_score": value_score,
+        "true_rating": true_rating,  # NEW
+        "pros": pros,  # NEW
+        "cons": cons,  # NEW
+        "review_count": review_count,  # NEW
+        "analysis_summary": summary  # NEW
+    }
+    if sampling is not None:
+        analysis["sampling"] = sampling
+    return analysis
+
+def decide_recommendation(positive_score, neutral_score, fake_percent, value_score, review_count):
+    """Recommendation and confidence from the headline metrics"""
+    # IMPROVED DECISION LOGIC (More realistic thresholds)
+    # Original was too strict: sentiment >= 70 and fake <= 15 and value >= 60
+    
     # Decision matrix
     if positive_score >= 60 and fake_percent <= 25 and value_score >= 40:
         recommendation = "✅ Worth Buying"
@@ -132,24 +252,38 @@ def analyze_product(title, price, reviews):
     if fake_percent > 40:
         recommendation = "❌ High Fake Reviews Detected"
         confidence = "High"
-    elif len(reviews) < 5:
+    elif review_count < 5:
         recommendation = "⚠️ Limited Reviews Available"
         confidence = "Low"
     
-    return {
-        "title": title,
-        "price": price,
-        "recommendation": recommendation,
-        "confidence": confidence,  # NEW
-        "sentiment": sentiment,
-        "fake_review_percent": fake_percent,
-        "value_score": value_score,
-        "true_rating": true_rating,  # NEW
-        "pros": pros,  # NEW
-        "cons": cons,  # NEW
-        "review_count": len(reviews),  # NEW
-        "analysis_summary": generate_summary(recommendation, positive_score, fake_percent, true_rating)  # NEW
-    }
+    return recommendation, confidence
+
+# decide_recommendation as (recommendation, confidence) codes for the vectorized path
+RECOMMENDATIONS = (
+    ("✅ Worth Buying", "High"),
+    ("✅ Worth Buying", "Moderate"),
+    ("⚠️ Consider Alternatives", "Low"),
+    ("❌ Not Recommended", "Low"),
+    ("❌ High Fake Reviews Detected", "High"),
+    ("⚠️ Limited Reviews Available", "Low"),
+)
+
+def decide_recommendations(positive_scores, neutral_scores, fake_percents, value_scores, review_counts):
+    """decide_recommendation over arrays of candidates: indices into RECOMMENDATIONS"""
+    positive = np.asarray(positive_scores)
+    neutral = np.asarray(neutral_scores)
+    fake = np.asarray(fake_percents)
+    value = np.asarray(value_scores)
+    reviews = np.asarray(review_counts)
+    
+    # Same decision matrix and special cases, first match wins
+    return np.select([
+        fake > 40,
+        reviews < 5,
+        (positive >= 60) & (fake <= 25) & (value >= 40),
+        (positive >= 50) & (fake <= 30) & (value >= 35),
+        (positive >= 40) & (neutral >= 30) & (fake <= 35),
+    ], [4, 5, 0, 1, 2], default=3)
 
 def generate_summary(recommendation, positive_score, fake_percent, true_rating):
     """Generate a human-readable summary"""
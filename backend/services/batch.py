@@ -0,0 +1,272 @@
+# backend/services/batch.py - PARALLEL BATCH ANALYSIS
+import json
+import multiprocessing
+import threading
+import time
+from multiprocessing.connection import wait
+
+from services import config
+from services.analyzer import analyze_product
+from services.budget import LatencyBudget
+from services.models import model_registry
+from services.polarity import get_engine
+
+# Workers are never forked straight from the (threaded) server process: the
+# fork server is a clean single-threaded process with this module preloaded
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Seconds a new worker may take to start and load its models; its first
+# product's BATCH_ITEM_TIMEOUT only starts once it is ready
+WORKER_START_TIMEOUT = 120.0
+READY = "ready"
+
+_context = None
+_idle_workers = []  # live workers waiting for the next batch
+_workers_lock = threading.Lock()
+
+def analyze_batch_item(product_data):
+    """Analyze one product into the compact /batch-analyze result shape"""
+    if not isinstance(product_data, dict):
+        raise ValueError("Expected product object")
+    
+    title = product_data.get("title", "")
+    price = product_data.get("price", 0)
+    reviews = product_data.get("reviews", [])
+    # Per-product latency budget ("budget_ms", default CONSIA_LATENCY_BUDGET_MS)
+    budget = LatencyBudget.from_request(product_data.get("budget_ms"))
+    
+    analysis = analyze_product(title, price, reviews, budget=budget)
+    result = {
+        "title": title,
+        "success": True,
+        "recommendation": analysis.get("recommendation", "Unknown"),
+        "true_rating": analysis.get("true_rating", 0),
+        "value_score": analysis.get("value_score", 0)
+    }
+    if budget.limited:
+        result["partial"] = budget.partial
+    return result
+
+
+def failed_item(product_data, error):
+    """Result entry for a product that could not be analyzed"""
+    title = product_data.get("title", "") if isinstance(product_data, dict) else ""
+    return {
+        "title": title,
+        "success": False,
+        "recommendation": "Analysis Failed",
+        "error": error
+    }
+
+
+def _worker_loop(conn):
+    """Worker process: load the models, then analyze the products sent over ``conn`` until None arrives"""
+    model_registry.warm_up()
+    get_engine()
+    conn.send(READY)
+    while True:
+        try:
+            product_data = conn.recv()
+        except EOFError:
+            return
+        if product_data is None:
+            return
+        try:
+            result = analyze_batch_item(product_data)
+        except Exception as e:
+            print(f"❌ Batch item error: {e}")
+            result = failed_item(product_data, str(e))
+        conn.send(result)
+
+
+class _Worker:
+    """One worker process, analyzing one product at a time over a pipe"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.deadline = None
+
+    def submit(self, product_data):
+        self.conn.send(product_data)
+        self.deadline = time.monotonic() + (config.BATCH_ITEM_TIMEOUT if self.ready else WORKER_START_TIMEOUT)
+
+    def mark_ready(self):
+        """Started and models loaded: the product sent to it is timed from now"""
+        self.ready = True
+        self.deadline = time.monotonic() + config.BATCH_ITEM_TIMEOUT
+
+    def close(self):
+        """Let the worker exit after its current product"""
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.conn.close()
+
+    def kill(self):
+        """Stop the worker whatever it is doing (a hung or crashed product)"""
+        self.process.terminate()
+        self.process.join(1)
+        self.conn.close()
+
+
+def _get_context():
+    global _context
+    with _workers_lock:
+        if _context is None:
+            context = multiprocessing.get_context(START_METHOD)
+            if START_METHOD == "forkserver":
+                # Imported once in the fork server instead of in every worker
+                preload = ["services.batch"]
+                if config.POLARITY_ENGINE == "textblob":
+                    preload.append("textblob")
+                context.set_forkserver_preload(preload)
+            _context = context
+        return _context
+
+
+def _checkout_worker():
+    """An idle worker, or a new one"""
+    with _workers_lock:
+        while _idle_workers:
+            worker = _idle_workers.pop()
+            if worker.process.is_alive():
+                return worker
+            worker.kill()
+    return _Worker(_get_context())
+
+
+def _checkin_worker(worker):
+    """Keep a worker for later batches (up to BATCH_WORKERS of them)"""
+    with _workers_lock:
+        if len(_idle_workers) < config.BATCH_WORKERS:
+            _idle_workers.append(worker)
+            return
+    worker.close()
+
+
+def _run_inline(product_data):
+    try:
+        return analyze_batch_item(product_data)
+    except Exception as e:
+        print(f"❌ Batch item error: {e}")
+        return failed_item(product_data, str(e))
+
+
+def _analyze_on_workers(products):
+    """Yield ``(index, result)`` in completion order, each product on a worker process.
+    
+    At most BATCH_WORKERS products run at once and input is pulled only
+    when a worker is free. A product still running BATCH_ITEM_TIMEOUT
+    after its worker was ready for it is reported as timed out and its
+    worker is terminated (a fresh one takes its place), so one hung
+    product costs one timeout and never holds a worker. Items of
+    ``products`` that are exceptions are reported as failed entries.
+    """
+    products = enumerate(products)
+    busy = {}  # connection -> (worker, index, product_data)
+    exhausted = False
+    try:
+        while busy or not exhausted:
+            # Hand input to free workers
+            while not exhausted and len(busy) < max(1, config.BATCH_WORKERS):
+                try:
+                    index, product_data = next(products)
+                except StopIteration:
+                    exhausted = True
+                    break
+                if isinstance(product_data, Exception):
+                    yield index, failed_item({}, str(product_data))
+                    continue
+                worker = _checkout_worker()
+                try:
+                    worker.submit(product_data)
+                except OSError:
+                    worker.kill()
+                    yield index, failed_item(product_data, "Worker crashed")
+                    continue
+                busy[worker.conn] = (worker, index, product_data)
+            
+            if not busy:
+                continue
+            
+            next_deadline = min(worker.deadline for worker, _, _ in busy.values())
+            for conn in wait(list(busy), timeout=max(0, next_deadline - time.monotonic())):
+                worker, index, product_data = busy[conn]
+                try:
+                    result = conn.recv()
+                except (EOFError, OSError):
+                    del busy[conn]
+                    worker.kill()
+                    yield index, failed_item(product_data, "Worker crashed")
+                    continue
+                if result == READY:
+                    worker.mark_ready()
+                    continue
+                del busy[conn]
+                _checkin_worker(worker)
+                yield index, result
+            
+            # Give up on anything past its deadline
+            now = time.monotonic()
+            for conn, (worker, index, product_data) in list(busy.items()):
+                if worker.deadline <= now:
+                    del busy[conn]
+                    worker.kill()
+                    yield index, failed_item(product_data, "Timed out" if worker.ready else "Worker failed to start")
+    finally:
+        # Consumer gone (e.g. a closed stream): stop what is still running
+        for worker, _, _ in busy.values():
+            worker.kill()
+
+
+def run_batch(products):
+    """Analyze products concurrently; results come back in input order.
+    
+    Each product succeeds or fails on its own: an exception, a crashed
+    worker or a product that exceeds BATCH_ITEM_TIMEOUT only marks that
+    entry as failed. With BATCH_WORKERS workers a batch takes at most
+    ceil(n / workers) timeouts.
+    """
+    if config.BATCH_WORKERS <= 1:
+        return [_run_inline(product_data) for product_data in products]
+    
+    results = [None] * len(products)
+    for index, result in _analyze_on_workers(products):
+        results[index] = result
+    return results
+
+
+def parse_ndjson_products(lines):
+    """Yield one product (or a parse error) per non-blank NDJSON line"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON line: {e}")
+
+
+def stream_batch(products):
+    """Analyze a (possibly unbounded) product iterator, yielding as products finish.
+    
+    Yields ``(index, result)`` pairs in completion order. Only one product
+    per worker is in flight at a time and input is pulled lazily, so
+    memory stays flat however long the stream is. Items of ``products``
+    that are exceptions are reported as failed entries.
+    """
+    if config.BATCH_WORKERS > 1:
+        yield from _analyze_on_workers(products)
+        return
+    
+    for index, product_data in enumerate(products):
+        if isinstance(product_data, Exception):
+            yield index, failed_item({}, str(product_data))
+        else:
+            yield index, _run_inline(product_data)
@@ -0,0 +1,194 @@
+# backend/services/budget.py - PER-REQUEST LATENCY BUDGETS
+# A request can carry a latency budget (budget_ms, or CONSIA_LATENCY_BUDGET_MS).
+# analyze_product then sizes its sample so the whole pipeline is expected to
+# fit, and runs the stages in priority order (sentiment, fake detection,
+# pros/cons): each stage takes its preferred path if the time left allows,
+# a cheaper one if not, and the optional stages are skipped once nothing
+# fits. Expected costs are per-review seconds learned from every analysis
+# (budgeted or not), so the plan follows the machine and models in use.
+import math
+import threading
+import time
+from contextlib import contextmanager
+from services import config
+
+# Paths per stage, preferred first
+STAGE_PATHS = {
+    "sentiment": ("ml_model", "fallback"),
+    "fake_detection": ("ml_model", "rules"),
+    "pros_cons": ("full",),
+}
+# Without these there is no analysis; they always run (on the cheapest path if need be)
+REQUIRED_STAGES = frozenset(("sentiment",))
+
+# Starting per-review costs in seconds (replaced by measurements as requests come in)
+DEFAULT_COSTS = {
+    ("dedup", "full"): 20e-6,
+    ("sentiment", "ml_model"): 40e-6,
+    ("sentiment", "fallback"): 80e-6,
+    ("fake_detection", "ml_model"): 120e-6,
+    ("fake_detection", "rules"): 70e-6,
+    ("pros_cons", "full"): 100e-6,
+}
+
+# Plan for this share of the time left; the rest absorbs estimation error
+HEADROOM = 0.8
+# Seconds per input review to tokenize it for stratified sampling
+STRATIFY_COST = 10e-6
+# Budgets above this (an hour) constrain nothing and are treated as no budget
+MAX_BUDGET_MS = 3600 * 1000
+
+
+class CostModel:
+    """Exponentially weighted per-review cost of each (stage, path)"""
+
+    def __init__(self, defaults, alpha=0.2):
+        self.alpha = alpha
+        self._costs = dict(defaults)
+        self._lock = threading.Lock()
+
+    def per_review(self, stage, path):
+        return self._costs.get((stage, path), 0.0)
+
+    def estimate(self, stage, path, n):
+        return self.per_review(stage, path) * n
+
+    def observe(self, stage, path, n, seconds):
+        if n <= 0:
+            return
+        with self._lock:
+            previous = self._costs.get((stage, path))
+            cost = seconds / n
+            self._costs[(stage, path)] = cost if previous is None else previous + self.alpha * (cost - previous)
+
+    def stats(self):
+        """Current estimates in microseconds per review"""
+        with self._lock:
+            return {f"{stage}:{path}": round(cost * 1e6, 2) for (stage, path), cost in sorted(self._costs.items())}
+
+
+cost_model = CostModel(DEFAULT_COSTS)
+
+
+class LatencyBudget:
+    """Deadline and degradation decisions for one analysis.
+
+    ``budget_ms=None`` means unlimited: every stage takes its preferred
+    path, but costs are still measured for later budgeted requests.
+    """
+
+    def __init__(self, budget_ms=None, start=None, costs=cost_model):
+        self.budget_ms = budget_ms
+        self.start = time.perf_counter() if start is None else start
+        self.costs = costs
+        self.stages = {}  # stage -> path taken ("skipped" when not run)
+        self.sample_limit = None  # reviews the sample was cut to, if the budget cut it
+        self.sample_strategy = None  # sampling strategy forced by the budget, if any
+
+    @classmethod
+    def from_request(cls, budget_ms=None, start=None):
+        """Budget from a request's ``budget_ms`` (config default if None); raises ValueError if invalid.
+
+        Budgets over MAX_BUDGET_MS mean no budget.
+        """
+        if budget_ms is None:
+            budget_ms = config.LATENCY_BUDGET_MS
+        if isinstance(budget_ms, bool):
+            raise ValueError("budget_ms must be a number")
+        budget_ms = float(budget_ms)
+        if not math.isfinite(budget_ms):
+            raise ValueError("budget_ms must be a finite number")
+        if budget_ms < 0:
+            raise ValueError("budget_ms must not be negative")
+        if budget_ms > MAX_BUDGET_MS:
+            budget_ms = 0
+        return cls(budget_ms or None, start)
+
+    @property
+    def limited(self):
+        return self.budget_ms is not None
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def remaining(self):
+        """Seconds left (infinite without a budget)"""
+        if not self.limited:
+            return float("inf")
+        return self.budget_ms / 1000 - self.elapsed()
+
+    def _preferred_per_review(self):
+        # Pipeline cost per sampled review when every stage takes its preferred path
+        return self.costs.per_review("dedup", "full") + sum(
+            self.costs.per_review(stage, paths[0]) for stage, paths in STAGE_PATHS.items()
+        )
+
+    def plan_sample(self, population):
+        """(budget, strategy) for sample_corpus over ``population`` input reviews.
+
+        None keeps the configured value. The sample is cut to what the time
+        left affords (never below CONSIA_LATENCY_MIN_SAMPLE reviews), and
+        when tokenizing every input review for stratified sampling would
+        alone eat a quarter of the time left, a plain uniform sample (no
+        parsing, O(sample) draws) is used instead.
+        """
+        if not self.limited:
+            return None, None
+        configured = config.SAMPLE_BUDGET if config.SAMPLE_BUDGET > 0 else population
+        affordable = int(max(self.remaining(), 0) * HEADROOM / self._preferred_per_review())
+        limit = max(affordable, config.LATENCY_MIN_SAMPLE)
+        size = None
+        if limit < min(population, configured):
+            size = self.sample_limit = limit
+        strategy = None
+        if min(size or configured, population) < population and population * STRATIFY_COST > self.remaining() / 4:
+            strategy = self.sample_strategy = "random"
+        return size, strategy
+
+    def choose(self, stage, n):
+        """Path for ``stage`` over ``n`` reviews, or None to skip it.
+
+        The preferred path if it fits in the time left, else the cheapest
+        path that does; if nothing fits, required stages take the cheapest
+        path and optional ones are skipped.
+        """
+        paths = STAGE_PATHS[stage]
+        if not self.limited:
+            return paths[0]
+        remaining = self.remaining()
+        if self.costs.estimate(stage, paths[0], n) <= remaining:
+            return paths[0]
+        cheapest = min(paths, key=lambda path: self.costs.per_review(stage, path))
+        if stage in REQUIRED_STAGES or self.costs.estimate(stage, cheapest, n) <= remaining:
+            return cheapest
+        self.stages[stage] = "skipped"
+        return None
+
+    @contextmanager
+    def track(self, stage, path, n):
+        """Time one stage run over ``n`` reviews and learn its per-review cost"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.costs.observe(stage, path, n, time.perf_counter() - start)
+            if stage in STAGE_PATHS:
+                self.stages[stage] = path
+
+    @property
+    def partial(self):
+        """True if anything was sampled away, degraded or skipped because of the budget"""
+        return self.sample_limit is not None or self.sample_strategy is not None or any(
+            path != STAGE_PATHS[stage][0] for stage, path in self.stages.items()
+        )
+
+    def report(self):
+        """Budget block for the analysis result"""
+        return {
+            "budget_ms": self.budget_ms,
+            "elapsed_ms": round(self.elapsed() * 1000, 3),
+            "partial": self.partial,
+            "sample_limit": self.sample_limit,
+            "sample_strategy": self.sample_strategy,
+            "stages": dict(self.stages)
+        }
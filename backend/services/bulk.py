@@ -0,0 +1,425 @@
+# backend/services/bulk.py - OFFLINE BULK ANALYSIS
+# Nightly reprocessing of crawled catalogs without going through HTTP:
+# products are streamed out of JSONL/CSV dumps (review rows are grouped
+# by product), analyzed on a multiprocessing pool and written out as they
+# finish. Progress is checkpointed, so an interrupted run resumes where it
+# stopped. The command-line entry point is backend/bulk_analyze.py.
+import csv
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from itertools import islice
+
+from services import config
+from services.analyzer import analyze_product
+from services.models import model_registry
+
+INPUT_FORMATS = ("jsonl", "csv")
+OUTPUT_FORMATS = ("jsonl", "csv", "parquet")
+
+# Flat columns for CSV/Parquet output (JSONL keeps the full analysis)
+FLAT_COLUMNS = (
+    "product_id", "title", "price", "review_count", "success", "recommendation", "confidence",
+    "true_rating", "value_score", "fake_review_percent", "positive_percent", "negative_percent",
+    "neutral_percent", "pros", "cons", "error"
+)
+
+
+def detect_format(path, formats):
+    """Format from the file extension (".jsonl"/".ndjson"/".csv"/".parquet")"""
+    extension = os.path.splitext(path.rstrip("/"))[1].lower().lstrip(".")
+    extension = "jsonl" if extension in ("ndjson", "json") else extension
+    if extension not in formats:
+        raise ValueError(f"Cannot tell the format of {path}; pass one of: {', '.join(formats)}")
+    return extension
+
+
+def parse_price(value):
+    """Numeric price from a dump field ("₹1,299.00" -> 1299.0; unparseable -> 0)"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    try:
+        return float(re.sub(r"[^\d.]", "", str(value or "")) or 0)
+    except ValueError:
+        return 0
+
+
+def read_rows(path, input_format):
+    """Yield (row, end_offset) for every record of a JSONL or CSV file.
+
+    ``end_offset`` is the byte position just past the row (for progress).
+    Unparseable JSON lines are yielded as ValueError rows.
+    """
+    with open(path, "rb") as f:
+        position = 0
+
+        def lines():
+            nonlocal position
+            for raw in f:
+                first = position == 0
+                position += len(raw)
+                # Spreadsheet exports often start with a byte order mark
+                yield raw.decode("utf-8-sig" if first else "utf-8")
+
+        if input_format == "csv":
+            # The reader pulls lines lazily, so position is exact after each row
+            for row in csv.DictReader(lines()):
+                yield row, position
+            return
+
+        for line in lines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line), position
+            except ValueError as e:
+                yield ValueError(f"Invalid JSON line: {e}"), position
+
+
+def group_products(rows, id_field="product_id", review_field="review", in_memory=False):
+    """Yield (product, end_offset) from rows.
+
+    A row with a ``reviews`` list is a whole product. Other rows are single
+    reviews (``review_field``) grouped by ``id_field``: consecutive rows of
+    one product by default (streaming; dumps are usually written product
+    by product), or every row of the file when ``in_memory`` is set.
+    """
+    if in_memory:
+        yield from _group_in_memory(rows, id_field, review_field)
+        return
+
+    current = None
+    current_end = 0
+    closed = set()
+    for row, end in rows:
+        if isinstance(row, Exception) or isinstance(row.get("reviews"), list):
+            if current is not None:
+                yield current, current_end
+                current = None
+            yield row, end
+            continue
+
+        product_id = row.get(id_field)
+        if current is None or product_id != current["product_id"]:
+            if current is not None:
+                closed.add(current["product_id"])
+                yield current, current_end
+            if product_id in closed:
+                print(f"⚠️ Reviews of {product_id!r} are not contiguous; it will be analyzed in parts "
+                      f"(use --unsorted to group the whole file)")
+            current = _new_product(row, product_id)
+        review = row.get(review_field)
+        if review:
+            current["reviews"].append(review)
+        current_end = end
+
+    if current is not None:
+        yield current, current_end
+
+
+def _new_product(row, product_id):
+    return {
+        "product_id": product_id,
+        "title": row.get("title", ""),
+        "price": parse_price(row.get("price")),
+        "reviews": []
+    }
+
+
+def _group_in_memory(rows, id_field, review_field):
+    products = {}
+    end = 0
+    for row, end in rows:
+        if isinstance(row, Exception) or isinstance(row.get("reviews"), list):
+            yield row, end
+            continue
+        product_id = row.get(id_field)
+        product = products.get(product_id)
+        if product is None:
+            product = products[product_id] = _new_product(row, product_id)
+        review = row.get(review_field)
+        if review:
+            product["reviews"].append(review)
+    # Products in first-seen order, so reruns (and resumes) see the same sequence
+    for product in products.values():
+        yield product, end
+
+
+def _init_worker():
+    model_registry.warm_up()
+
+
+def analyze_record(item):
+    """(index, product, offset) -> (index, offset, result record); never raises"""
+    index, product, offset = item
+    if isinstance(product, Exception):
+        return index, offset, {"product_id": None, "success": False, "error": str(product)}
+
+    product_id = product.get("product_id", product.get("id"))
+    title = product.get("title", "")
+    try:
+        analysis = analyze_product(title, parse_price(product.get("price")), product.get("reviews") or [])
+        return index, offset, {"product_id": product_id, "success": True, **analysis}
+    except Exception as e:
+        return index, offset, {"product_id": product_id, "title": title, "success": False, "error": str(e)}
+
+
+def flat_record(record):
+    """One CSV/Parquet row from a result record"""
+    sentiment = record.get("sentiment") or {}
+    return {
+        "product_id": record.get("product_id"),
+        "title": record.get("title", ""),
+        "price": record.get("price"),
+        "review_count": record.get("review_count", 0),
+        "success": record.get("success", False),
+        "recommendation": record.get("recommendation", "Analysis Failed"),
+        "confidence": record.get("confidence"),
+        "true_rating": record.get("true_rating"),
+        "value_score": record.get("value_score"),
+        "fake_review_percent": record.get("fake_review_percent"),
+        "positive_percent": sentiment.get("positive_percent"),
+        "negative_percent": sentiment.get("negative_percent"),
+        "neutral_percent": sentiment.get("neutral_percent"),
+        "pros": " | ".join(record.get("pros") or []),
+        "cons": " | ".join(record.get("cons") or []),
+        "error": record.get("error", "")
+    }
+
+
+class JsonlWriter:
+    """Full results, one JSON object per line; resumes by truncating to the checkpointed size"""
+
+    def __init__(self, path, state=None):
+        self.file = open(path, "r+b" if state else "wb")
+        if state:
+            self.file.truncate(state["offset"])
+            self.file.seek(state["offset"])
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    def checkpoint(self):
+        """Make everything written so far durable; returns the resume state"""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return {"offset": self.file.tell()}
+
+    def close(self):
+        self.file.close()
+
+
+class CsvWriter(JsonlWriter):
+    """Flat results (FLAT_COLUMNS), with a header row"""
+
+    def __init__(self, path, state=None):
+        super().__init__(path, state)
+        self._text = _TextSink(self.file)
+        self._csv = csv.DictWriter(self._text, fieldnames=FLAT_COLUMNS)
+        if not state:
+            self._csv.writeheader()
+
+    def write(self, record):
+        self._csv.writerow(flat_record(record))
+
+
+class _TextSink:
+    # csv.writer needs a text file; this encodes into the binary one so offsets stay exact
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, text):
+        self.file.write(text.encode("utf-8"))
+
+
+class ParquetWriter:
+    """Flat results as a directory of Parquet part files, one per checkpoint (needs pyarrow)"""
+
+    def __init__(self, path, state=None):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Parquet output needs pyarrow: pip install pyarrow")
+        self.pyarrow = pyarrow
+        self.parquet = pyarrow.parquet
+        self.path = path
+        self.part = state["part"] if state else 0
+        os.makedirs(path, exist_ok=True)
+        # Parts past the checkpoint come from an interrupted run
+        for name in os.listdir(path):
+            match = re.fullmatch(r"part-(\d+)\.parquet", name)
+            if match and int(match.group(1)) >= self.part:
+                os.remove(os.path.join(path, name))
+        self.rows = []
+
+    def write(self, record):
+        self.rows.append(flat_record(record))
+
+    def checkpoint(self):
+        if self.rows:
+            table = self.pyarrow.Table.from_pylist(self.rows)
+            final = os.path.join(self.path, f"part-{self.part:05d}.parquet")
+            self.parquet.write_table(table, final + ".tmp")
+            os.replace(final + ".tmp", final)
+            self.part += 1
+            self.rows = []
+        return {"part": self.part}
+
+    def close(self):
+        pass
+
+
+WRITERS = {
+    "jsonl": JsonlWriter,
+    "csv": CsvWriter,
+    "parquet": ParquetWriter,
+}
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(path, state):
+    """Write the checkpoint atomically (a crash leaves the previous one intact)"""
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class Progress:
+    """Throughput and ETA (from the input bytes consumed) for one run"""
+
+    def __init__(self, total_bytes, interval=5.0):
+        self.total_bytes = total_bytes
+        self.interval = interval
+        self.start = time.monotonic()
+        self.last_report = self.start
+        self.start_offset = None
+        self.products = 0
+        self.reviews = 0
+        self.failed = 0
+        self.offset = 0
+
+    def update(self, record, offset):
+        if self.start_offset is None:
+            self.start_offset = offset  # resumed runs start part-way through the file
+        self.products += 1
+        self.reviews += record.get("review_count", 0) or 0
+        self.failed += not record.get("success")
+        self.offset = offset
+        now = time.monotonic()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            print(self.line())
+
+    def line(self):
+        elapsed = max(time.monotonic() - self.start, 1e-9)
+        done = self.offset - (self.start_offset or 0)
+        left = max(self.total_bytes - self.offset, 0)
+        eta = format_duration(elapsed * left / done) if done > 0 else "--:--:--"
+        percent = 100 * self.offset / self.total_bytes if self.total_bytes else 100.0
+        return (f"📈 {self.products:,} products ({self.failed:,} failed), {self.reviews:,} reviews | "
+                f"{self.products / elapsed:,.1f} products/s, {self.reviews / elapsed:,.0f} reviews/s | "
+                f"{percent:.1f}% | ETA {eta}")
+
+
+def _bounded(items, slots):
+    # Hold the pool's task feeder back so at most ``slots`` products are
+    # read ahead of the results written (Pool.imap would read the whole file)
+    for item in items:
+        slots.acquire()
+        yield item
+
+
+def run_bulk(input_path, output_path, input_format=None, output_format=None, workers=None,
+             chunk_size=16, checkpoint_path=None, checkpoint_every=1000, resume=False,
+             id_field="product_id", review_field="review", unsorted=False, progress_interval=5.0):
+    """Analyze every product of ``input_path`` into ``output_path``; returns a run summary"""
+    input_format = input_format or detect_format(input_path, INPUT_FORMATS)
+    output_format = output_format or detect_format(output_path, OUTPUT_FORMATS)
+    workers = config.BATCH_WORKERS if workers is None else workers
+    checkpoint_path = checkpoint_path or output_path.rstrip("/") + ".checkpoint.json"
+
+    state = load_checkpoint(checkpoint_path) if resume else None
+    if state and (state["input"] != os.path.abspath(input_path) or state["output_format"] != output_format):
+        raise ValueError(f"Checkpoint {checkpoint_path} belongs to a different run")
+    skip = state["products_done"] if state else 0
+    if state:
+        print(f"⏩ Resuming after {skip:,} products")
+    elif resume:
+        print("⚠️ No checkpoint found, starting from the beginning")
+
+    writer = WRITERS[output_format](output_path, state["writer"] if state else None)
+    progress = Progress(os.path.getsize(input_path), progress_interval)
+    totals = {key: state[key] for key in ("products_done", "reviews_done", "failed")} if state else \
+        {"products_done": 0, "reviews_done": 0, "failed": 0}
+    elapsed_before = state["elapsed"] if state else 0.0
+
+    def checkpoint():
+        save_checkpoint(checkpoint_path, {
+            "input": os.path.abspath(input_path),
+            "input_format": input_format,
+            "output": os.path.abspath(output_path),
+            "output_format": output_format,
+            **totals,
+            "writer": writer.checkpoint(),
+            "elapsed": round(elapsed_before + time.monotonic() - progress.start, 3),
+            "updated": datetime.now().isoformat()
+        })
+
+    products = group_products(read_rows(input_path, input_format), id_field, review_field, unsorted)
+    items = ((index, product, offset) for index, (product, offset) in enumerate(islice(products, skip, None), skip))
+
+    pool = None
+    slots = threading.Semaphore(max(chunk_size, workers * chunk_size * 2))
+    items = _bounded(items, slots)
+    if workers > 1:
+        pool = multiprocessing.Pool(workers, initializer=_init_worker)
+        results = pool.imap(analyze_record, items, chunksize=chunk_size)
+    else:
+        _init_worker()
+        results = map(analyze_record, items)
+
+    print(f"🚀 Bulk analysis: {input_path} ({input_format}) -> {output_path} ({output_format}), "
+          f"{max(workers, 1)} worker(s)")
+    try:
+        for _, offset, record in results:
+            slots.release()
+            writer.write(record)
+            progress.update(record, offset)
+            totals["products_done"] += 1
+            totals["reviews_done"] += record.get("review_count", 0) or 0
+            totals["failed"] += not record.get("success")
+            if checkpoint_every > 0 and progress.products % checkpoint_every == 0:
+                checkpoint()
+    except KeyboardInterrupt:
+        print(f"⏸️ Interrupted; resume with --resume ({totals['products_done']:,} products saved)")
+        raise
+    finally:
+        checkpoint()
+        writer.close()
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    print(progress.line())
+    print(f"✅ Done: {totals['products_done']:,} products, {totals['reviews_done']:,} reviews, "
+          f"{totals['failed']:,} failed -> {output_path}")
+    return {**totals, "elapsed": round(elapsed_before + time.monotonic() - progress.start, 3)}
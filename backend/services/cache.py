@@ -0,0 +1,224 @@
+# backend/services/cache.py - RESULT CACHING
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from services import config, metrics
+
+
+class LRUCache:
+    """Thread-safe in-memory cache with LRU eviction and an optional TTL"""
+
+    def __init__(self, max_entries, ttl=0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value or None (expired entries count as misses)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self.ttl and time.monotonic() - entry[0] > self.ttl:
+                del self._data[key]
+                entry = None
+            
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+class SqliteCache:
+    """On-disk LRU/TTL cache with the same interface as LRUCache.
+    
+    Values are stored as JSON, so cached results survive restarts.
+    """
+
+    def __init__(self, path, max_entries, ttl=0):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            
+            if row is None:
+                self.misses += 1
+                return None
+            
+            self._conn.execute(
+                "UPDATE results SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def set(self, key, value):
+        if self.max_entries <= 0:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now)
+            )
+            # Evict least recently used rows beyond the bound
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN ("
+                " SELECT key FROM results ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "backend": "sqlite",
+            "size": len(self),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+def payload_fingerprint(title, price, reviews, model_versions=None):
+    """Content hash of a normalized (title, price, reviews) payload.
+
+    ``model_versions`` (name -> version) keeps results of different models apart.
+    """
+    try:
+        price = float(price or 0)
+    except (TypeError, ValueError):
+        price = str(price).strip()
+    
+    normalized = {
+        "title": str(title or "").strip(),
+        "price": price,
+        "reviews": [str(review).strip() for review in reviews or []]
+    }
+    if model_versions:
+        normalized["models"] = model_versions
+    encoded = json.dumps(normalized, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def make_result_cache():
+    """Build the /analyze result cache from config"""
+    if config.RESULT_CACHE_PATH:
+        try:
+            return SqliteCache(config.RESULT_CACHE_PATH, config.RESULT_CACHE_SIZE,
+                               config.RESULT_CACHE_TTL)
+        except sqlite3.Error as e:
+            print(f"❌ Could not open result cache at {config.RESULT_CACHE_PATH}: {e}")
+    
+    return LRUCache(config.RESULT_CACHE_SIZE, config.RESULT_CACHE_TTL)
+
+
+def cached_verdicts(kind, version, docs, compute):
+    """Per-review verdicts for ``docs``, running ``compute`` only on cache misses.
+    
+    ``compute`` takes the list of missed ReviewDocs and returns one verdict
+    per doc; ``None`` verdicts (e.g. a failed model call) are not cached.
+    """
+    results = [None] * len(docs)
+    missed = []
+    for i, doc in enumerate(docs):
+        verdict = verdict_cache.get((kind, version, doc.digest))
+        if verdict is None:
+            missed.append(i)
+        else:
+            results[i] = verdict
+    
+    if missed:
+        computed = compute([docs[i] for i in missed])
+        for i, verdict in zip(missed, computed):
+            results[i] = verdict
+            if verdict is not None:
+                verdict_cache.set((kind, version, docs[i].digest), verdict)
+    
+    return results
+
+
+# Global cache for /analyze results
+result_cache = make_result_cache()
+
+# Global per-review verdict cache, keyed by (detector, model version, text digest)
+verdict_cache = LRUCache(config.VERDICT_CACHE_SIZE)
+
+metrics.registry.register(metrics.CallbackCounter(
+    "consia_cache_lookups_total", "Cache lookups by cache and outcome", ("cache", "outcome"),
+    lambda: {
+        ("result", "hit"): result_cache.hits,
+        ("result", "miss"): result_cache.misses,
+        ("verdict", "hit"): verdict_cache.hits,
+        ("verdict", "miss"): verdict_cache.misses,
+    }
+))
@@ -0,0 +1,101 @@
+# backend/services/coalesce.py - REQUEST COALESCING (SINGLE-FLIGHT)
+# When a product trends, many users send the same payload within seconds.
+# Requests with the same key (payload fingerprint) that arrive while an
+# identical analysis is running wait for it and share its result instead
+# of running their own. Works across the threads of one process; the
+# result cache covers requests that arrive after the analysis finished.
+import threading
+
+from services import config, metrics
+
+
+class CoalesceTimeout(Exception):
+    """Raised to a waiter whose identical in-flight analysis did not finish in time"""
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """At most one running computation per key; concurrent callers share it"""
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    def do(self, key, compute, timeout=None):
+        """Return (result, shared, requests).
+
+        The first caller for ``key`` runs ``compute()``; callers arriving
+        before it finishes wait up to ``timeout`` seconds (None = forever)
+        and get the same result, or its exception re-raised.
+        ``shared`` is True for waiters; ``requests`` is how many requests
+        the computation served. Raises CoalesceTimeout to a waiter that
+        gave up.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.leaders += 1
+            else:
+                flight.waiters += 1
+
+        if not leader:
+            finished = flight.done.wait(timeout)
+            with self._lock:
+                if finished:
+                    self.coalesced += 1
+                else:
+                    flight.waiters -= 1
+                    self.timeouts += 1
+            if not finished:
+                raise CoalesceTimeout(f"Identical analysis still running after {timeout:g}s")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True, flight.waiters + 1
+
+        try:
+            flight.result = compute()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            # Later arrivals start afresh (or hit the result cache)
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False, flight.waiters + 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": len(self._flights),
+                "waiting": sum(flight.waiters for flight in self._flights.values()),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "timeouts": self.timeouts,
+                "timeout_s": config.COALESCE_TIMEOUT
+            }
+
+
+# Identical /analyze requests in flight in this process
+analysis_flights = SingleFlight()
+
+metrics.registry.register(metrics.CallbackCounter(
+    "consia_coalesced_requests_total", "Analysis requests by single-flight outcome", ("outcome",),
+    lambda: {
+        ("computed",): analysis_flights.leaders,
+        ("shared",): analysis_flights.coalesced,
+        ("timeout",): analysis_flights.timeouts,
+    }
+))
@@ -0,0 +1,284 @@
+# backend/services/codec.py - REQUEST DECODING AND RESPONSE ENCODING
+# Request bodies may be gzip or zstd compressed (Content-Encoding) and may
+# use a compact payload instead of JSON (Content-Type):
+#
+#   application/json                 the regular payload
+#   application/msgpack              the same object as MessagePack (needs msgpack)
+#   application/vnd.consia.reviews   length-prefixed: u32 length + JSON object
+#                                    without "reviews", then one u32 length +
+#                                    UTF-8 text per review (little endian)
+#
+# Decompression is streamed: compressed chunks are fed as they arrive and
+# inflated in bounded steps into one buffer, so only the decoded body is
+# held in memory and a decompression bomb is stopped at the decoded-size
+# limit. Responses use orjson when it is installed.
+import json
+import struct
+import zlib
+from services import config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CHUNK_SIZE = 64 * 1024  # decompressed bytes produced per step
+
+COMPACT_REVIEWS_TYPE = "application/vnd.consia.reviews"
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+
+_LENGTH = struct.Struct("<I")
+
+
+class PayloadError(Exception):
+    """A request body that cannot be decoded; ``status`` is the HTTP status to answer with"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def use_orjson():
+    return orjson is not None and config.JSON_CODEC in ("auto", "orjson")
+
+
+def _orjson_default(value):
+    # NumPy scalars and anything else orjson does not know natively
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(body):
+    """Response body as UTF-8 JSON bytes"""
+    if use_orjson():
+        return orjson.dumps(body, default=_orjson_default,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+def loads(raw):
+    """Parse JSON bytes (or str); raises ValueError if invalid"""
+    if use_orjson():
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class _Buffer:
+    """Decoded bytes, refusing to take more than ``limit`` in total"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.written = 0
+        self.data = bytearray()
+
+    def write(self, chunk):
+        if self.written + len(chunk) > self.limit:
+            raise PayloadError(413, f"Decoded request too large (max {self.limit} bytes)")
+        self.written += len(chunk)
+        self.data += chunk
+        return len(chunk)
+
+
+class _GzipInflater:
+    def __init__(self, sink):
+        self.sink = sink
+        self._inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def write(self, data):
+        while data:
+            self.sink.write(self._inflater.decompress(data, CHUNK_SIZE))
+            data = self._inflater.unconsumed_tail
+            if self._inflater.eof and self._inflater.unused_data:
+                # Concatenated gzip members
+                data = self._inflater.unused_data
+                self._inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def close(self):
+        if not self._inflater.eof:
+            raise zlib.error("truncated gzip stream")
+
+
+class _ZstdInflater:
+    def __init__(self, sink):
+        try:
+            import zstandard
+        except ImportError:
+            raise PayloadError(415, "zstd request bodies need the zstandard package")
+        self.error = zstandard.ZstdError
+        # Decompressed output reaches the sink in CHUNK_SIZE pieces as it is produced
+        self._writer = zstandard.ZstdDecompressor().stream_writer(sink, write_size=CHUNK_SIZE,
+                                                                  write_return_read=True)
+
+    def write(self, data):
+        try:
+            self._writer.write(data)
+        except self.error as e:
+            raise zlib.error(str(e))
+
+    def close(self):
+        try:
+            self._writer.flush()
+        except self.error as e:
+            raise zlib.error(str(e))
+
+
+INFLATERS = {
+    "gzip": _GzipInflater,
+    "x-gzip": _GzipInflater,
+    "zstd": _ZstdInflater,
+}
+
+
+class BodyDecoder:
+    """Incremental request body decoder: ``feed`` raw chunks, then ``finish``.
+
+    Raises PayloadError for bodies over CONSIA_MAX_REQUEST_BYTES (as sent)
+    or CONSIA_MAX_DECODED_BYTES (decompressed), unknown encodings, corrupt
+    compressed data and malformed compact payloads.
+    """
+
+    def __init__(self, content_type=None, content_encoding=None,
+                 max_bytes=None, max_decoded_bytes=None):
+        # Anything but the compact types is parsed as JSON
+        self.content_type = (content_type or "").split(";")[0].strip().lower()
+        self.max_bytes = max_bytes or config.MAX_REQUEST_BYTES
+        self.received = 0
+        self.buffer = _Buffer(max_decoded_bytes or config.MAX_DECODED_BYTES)
+
+        encoding = (content_encoding or "identity").strip().lower()
+        if encoding == "identity":
+            self.inflater = self.buffer
+        elif encoding in INFLATERS:
+            self.inflater = INFLATERS[encoding](self.buffer)
+        else:
+            raise PayloadError(415, f"Unsupported content encoding {encoding!r}")
+
+    def feed(self, chunk):
+        self.received += len(chunk)
+        if self.received > self.max_bytes:
+            raise PayloadError(413, f"Request too large (max {self.max_bytes} bytes)")
+        try:
+            self.inflater.write(chunk)
+        except zlib.error as e:
+            raise PayloadError(400, f"Corrupt compressed body: {e}")
+
+    def close(self):
+        """Check that the compressed stream ended cleanly"""
+        if self.inflater is not self.buffer:
+            try:
+                self.inflater.close()
+            except zlib.error as e:
+                raise PayloadError(400, f"Corrupt compressed body: {e}")
+
+    def take_lines(self):
+        """Complete lines decoded so far (without the newline); the rest stays buffered"""
+        data = self.buffer.data
+        end = data.rfind(b"\n")
+        if end < 0:
+            return []
+        lines = bytes(data[:end]).split(b"\n")
+        del data[:end + 1]
+        return lines
+
+    def finish(self):
+        """The decoded payload; None for an empty or unparseable body (like get_json(silent=True))"""
+        self.close()
+        raw = self.buffer.data
+        if not raw:
+            return None
+        if self.content_type in MSGPACK_TYPES:
+            return decode_msgpack(raw)
+        if self.content_type == COMPACT_REVIEWS_TYPE:
+            return decode_compact_reviews(raw)
+        try:
+            return loads(raw)
+        except ValueError:
+            return None
+
+
+def decode_stream(stream, content_type=None, content_encoding=None):
+    """Decode a body read from a file-like ``stream`` (e.g. a WSGI input)"""
+    decoder = BodyDecoder(content_type, content_encoding)
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            return decoder.finish()
+        decoder.feed(chunk)
+
+
+class LineReader:
+    """Iterate a (possibly compressed) NDJSON body from a file-like ``stream`` line by line.
+
+    Lines are yielded as their chunks arrive, so only the current line is
+    held in memory; the size limits and PayloadError apply as in
+    decode_stream. An unsupported encoding is rejected on construction.
+    """
+
+    def __init__(self, stream, content_encoding=None):
+        self.stream = stream
+        self.decoder = BodyDecoder(None, content_encoding)
+
+    def __iter__(self):
+        decoder = self.decoder
+        while True:
+            chunk = self.stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            decoder.feed(chunk)
+            yield from decoder.take_lines()
+        decoder.close()
+        if decoder.buffer.data:
+            yield bytes(decoder.buffer.data)
+
+
+def decode_msgpack(raw):
+    try:
+        import msgpack
+    except ImportError:
+        raise PayloadError(415, "MessagePack request bodies need the msgpack package")
+    try:
+        return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+    except (ValueError, TypeError, msgpack.UnpackException):
+        raise PayloadError(400, "Invalid MessagePack body")
+
+
+def decode_compact_reviews(raw):
+    """Payload dict from the length-prefixed format (see the top of this module)"""
+    try:
+        (length,) = _LENGTH.unpack_from(raw, 0)
+        offset = _LENGTH.size + length
+        if offset > len(raw):
+            raise ValueError("truncated header")
+        header = loads(bytes(raw[_LENGTH.size:offset])) if length else {}
+        if not isinstance(header, dict):
+            raise ValueError("header must be a JSON object")
+        reviews = []
+        append, unpack, end = reviews.append, _LENGTH.unpack_from, len(raw)
+        while offset < end:
+            (length,) = unpack(raw, offset)
+            start = offset + _LENGTH.size
+            offset = start + length
+            append(raw[start:offset].decode("utf-8"))
+        if offset > end:
+            raise ValueError("truncated review")
+    except (struct.error, ValueError) as e:
+        raise PayloadError(400, f"Invalid compact reviews body: {e}")
+    header["reviews"] = reviews
+    return header
+
+
+def encode_compact_reviews(payload):
+    """Inverse of decode_compact_reviews (for clients, tests and benchmarks)"""
+    header = {key: value for key, value in payload.items() if key != "reviews"}
+    encoded_header = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    parts = [_LENGTH.pack(len(encoded_header)), encoded_header]
+    for review in payload.get("reviews") or []:
+        text = str(review).encode("utf-8")
+        parts.append(_LENGTH.pack(len(text)))
+        parts.append(text)
+    return b"".join(parts)
@@ -0,0 +1,333 @@
+# backend/services/compact.py - COMPACT MODEL FORMAT AND NUMPY INFERENCE
+# A trained TF-IDF vectorizer + classifier exported as plain .npy arrays
+# and a meta.json. Loading needs only NumPy (no scikit-learn, no pickle),
+# arrays are memory-mapped so worker processes share the same pages, and
+# the vocabulary is stored as sorted 64-bit token hashes.
+#
+#   <dir>/meta.json          tokenizer settings, model kind, classes
+#   <dir>/vocab_hash.npy     sorted uint64 token hashes
+#   <dir>/vocab_column.npy   feature column for each hash
+#   <dir>/idf.npy            idf weight per column
+#   (hashing vectorizers have no vocabulary files: column = token hash % n_features)
+#   linear: coef.npy, intercept.npy
+#   forest: node_feature.npy, node_threshold.npy, node_left.npy,
+#           node_right.npy, node_value.npy, tree_root.npy, tree_depth.npy
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+import numpy as np
+
+FORMAT = "consia-compact-1"
+META_FILE = "meta.json"
+
+
+@lru_cache(maxsize=65536)
+def token_hash(token):
+    """Stable 64-bit hash of a vocabulary token"""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _save(out_dir, name, array):
+    np.save(os.path.join(out_dir, name + ".npy"), np.ascontiguousarray(array))
+
+
+def export_compact(vectorizer, model, out_dir, extra_meta=None):
+    """Write a fitted TfidfVectorizer (or a HashingFeaturizer) and classifier to ``out_dir``.
+
+    Supports word unigram vectorizers with a LogisticRegression-style
+    linear model (``coef_``/``intercept_``) or a random forest of
+    decision trees (``estimators_``). Runs where scikit-learn is installed;
+    loading the result does not need it. ``extra_meta`` is merged into
+    meta.json (e.g. training provenance).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    if isinstance(vectorizer, HashingFeaturizer):
+        meta = {"format": FORMAT, **vectorizer.meta()}
+    else:
+        meta = _export_vocabulary(vectorizer, out_dir)
+    meta["classes"] = [c.item() if hasattr(c, "item") else c for c in model.classes_]
+
+    if hasattr(model, "coef_"):
+        meta["kind"] = "linear"
+        _save(out_dir, "coef", model.coef_)
+        _save(out_dir, "intercept", model.intercept_)
+    elif hasattr(model, "estimators_"):
+        meta["kind"] = "forest"
+        _export_forest(model, out_dir)
+    else:
+        raise ValueError(f"Unsupported model type: {type(model).__name__}")
+
+    meta.update(extra_meta or {})
+    with open(os.path.join(out_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def _export_vocabulary(vectorizer, out_dir):
+    params = vectorizer.get_params()
+    if params["analyzer"] != "word" or tuple(params["ngram_range"]) != (1, 1) \
+            or params["tokenizer"] or params["preprocessor"] or params["strip_accents"]:
+        raise ValueError("Only word unigram vectorizers with the default tokenizer can be exported")
+
+    # Hashed vocabulary: sorted hashes, looked up with a binary search
+    terms = list(vectorizer.vocabulary_.items())
+    hashes = np.array([token_hash(term) for term, _ in terms], dtype=np.uint64)
+    columns = np.array([column for _, column in terms], dtype=np.int32)
+    order = np.argsort(hashes)
+    if len(np.unique(hashes)) != len(hashes):
+        raise ValueError("Vocabulary hash collision")
+    _save(out_dir, "vocab_hash", hashes[order])
+    _save(out_dir, "vocab_column", columns[order])
+    _save(out_dir, "idf", vectorizer.idf_ if params["use_idf"] else np.ones(len(terms)))
+
+    stop_words = vectorizer.get_stop_words()
+    return {
+        "format": FORMAT,
+        "vectorizer": "vocabulary",
+        "n_features": len(terms),
+        "lowercase": params["lowercase"],
+        "token_pattern": params["token_pattern"],
+        "stop_words": sorted(stop_words) if stop_words else [],
+        "norm": params["norm"],
+        "sublinear_tf": params["sublinear_tf"],
+        "binary": params["binary"],
+    }
+
+
+def _export_forest(model, out_dir):
+    """All trees flattened into shared node arrays (child indices are global)"""
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        is_leaf = tree.children_left < 0
+        # Leaves point at themselves, so traversal can run a fixed number of steps
+        own = np.arange(tree.node_count) + offset
+        lefts.append(np.where(is_leaf, own, tree.children_left + offset))
+        rights.append(np.where(is_leaf, own, tree.children_right + offset))
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(tree.threshold)
+        value = tree.value[:, 0, :]
+        values.append(value / np.maximum(value.sum(axis=1, keepdims=True), 1e-12))
+        roots.append(offset)
+        offset += tree.node_count
+
+    _save(out_dir, "node_feature", np.concatenate(features).astype(np.int32))
+    _save(out_dir, "node_threshold", np.concatenate(thresholds).astype(np.float64))
+    _save(out_dir, "node_left", np.concatenate(lefts).astype(np.int32))
+    _save(out_dir, "node_right", np.concatenate(rights).astype(np.int32))
+    _save(out_dir, "node_value", np.concatenate(values).astype(np.float64))
+    _save(out_dir, "tree_root", np.array(roots, dtype=np.int32))
+    max_depth = max(estimator.tree_.max_depth for estimator in model.estimators_)
+    _save(out_dir, "tree_depth", np.array([max_depth], dtype=np.int32))
+
+
+def _load(directory, name, mmap):
+    return np.load(os.path.join(directory, name + ".npy"), mmap_mode="r" if mmap else None)
+
+
+class SparseRows:
+    """Minimal CSR matrix: row i is data[indptr[i]:indptr[i+1]] at columns indices[...]"""
+
+    def __init__(self, indptr, indices, data, n_features):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = (len(indptr) - 1, n_features)
+
+    def toarray(self):
+        dense = np.zeros(self.shape, dtype=np.float64)
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        dense[rows, self.indices] = self.data
+        return dense
+
+
+class CompactVectorizer:
+    """TF-IDF transform equivalent to the exported TfidfVectorizer"""
+
+    def __init__(self, directory, meta, mmap=True):
+        self._configure(meta)
+        self.vocab_hash = _load(directory, "vocab_hash", mmap)
+        self.vocab_column = _load(directory, "vocab_column", mmap)
+        self.idf = _load(directory, "idf", mmap)
+
+    def _configure(self, meta):
+        self.n_features = meta["n_features"]
+        self.lowercase = meta["lowercase"]
+        self.token_pattern = re.compile(meta["token_pattern"])
+        self.stop_words = frozenset(meta["stop_words"])
+        self.norm = meta["norm"]
+        self.sublinear_tf = meta["sublinear_tf"]
+        self.binary = meta["binary"]
+
+    def _lookup(self, hashes):
+        """(known mask, feature columns of the known hashes)"""
+        if not len(self.vocab_hash) or not len(hashes):
+            return np.zeros(len(hashes), dtype=bool), np.empty(0, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self.vocab_hash, hashes), len(self.vocab_hash) - 1)
+        known = self.vocab_hash[positions] == hashes
+        return known, self.vocab_column[positions[known]].astype(np.int64)
+
+    def _tokens(self, text):
+        if self.lowercase:
+            text = text.lower()
+        return [token for token in self.token_pattern.findall(text) if token not in self.stop_words]
+
+    def transform(self, texts):
+        """TF-IDF rows for ``texts``: one hash lookup and one count pass for the whole batch"""
+        tokenized = [self._tokens(text) for text in texts]
+        lengths = np.fromiter((len(tokens) for tokens in tokenized), dtype=np.int64, count=len(tokenized))
+        hashes = np.fromiter(
+            (token_hash(token) for tokens in tokenized for token in tokens),
+            dtype=np.uint64, count=int(lengths.sum())
+        )
+        rows = np.repeat(np.arange(len(tokenized)), lengths)
+
+        # Vocabulary lookup (binary search over the sorted hashes; unknown tokens dropped)
+        known, columns = self._lookup(hashes)
+        rows = rows[known]
+
+        # Term counts per (row, column), sorted by row then column like scikit-learn
+        keys, counts = np.unique(rows * self.n_features + columns, return_counts=True)
+        rows, columns = np.divmod(keys, self.n_features)
+        weights = counts.astype(np.float64)
+        if self.binary:
+            weights[:] = 1.0
+        elif self.sublinear_tf:
+            weights = np.log(weights) + 1
+        if self.idf is not None:
+            weights *= self.idf[columns]
+
+        if self.norm == "l2":
+            norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(texts)))
+        elif self.norm == "l1":
+            norms = np.bincount(rows, weights=np.abs(weights), minlength=len(texts))
+        else:
+            norms = None
+        if norms is not None and len(weights):
+            weights /= norms[rows]
+
+        indptr = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(texts)), out=indptr[1:])
+        return SparseRows(indptr, columns, weights, self.n_features)
+
+
+class HashingFeaturizer(CompactVectorizer):
+    """Stateless TF features: column = token_hash(token) % n_features.
+
+    Nothing to fit, so it can featurize a training stream chunk by chunk;
+    the same class serves the exported model, without scikit-learn.
+    """
+
+    def __init__(self, n_features=2 ** 18, lowercase=True, token_pattern=r"(?u)\b\w\w+\b",
+                 stop_words=(), norm="l2", sublinear_tf=False, binary=False):
+        self._configure({
+            "n_features": n_features, "lowercase": lowercase, "token_pattern": token_pattern,
+            "stop_words": sorted(stop_words), "norm": norm, "sublinear_tf": sublinear_tf, "binary": binary
+        })
+        self.idf = None
+
+    @classmethod
+    def from_meta(cls, directory, meta, mmap=True):
+        return cls(meta["n_features"], meta["lowercase"], meta["token_pattern"], meta["stop_words"],
+                   meta["norm"], meta["sublinear_tf"], meta["binary"])
+
+    def meta(self):
+        return {
+            "vectorizer": "hashing",
+            "n_features": self.n_features,
+            "lowercase": self.lowercase,
+            "token_pattern": self.token_pattern.pattern,
+            "stop_words": sorted(self.stop_words),
+            "norm": self.norm,
+            "sublinear_tf": self.sublinear_tf,
+            "binary": self.binary,
+        }
+
+    def _lookup(self, hashes):
+        return np.ones(len(hashes), dtype=bool), (hashes % np.uint64(self.n_features)).astype(np.int64)
+
+
+class CompactLinearModel:
+    """predict_proba of a (binary or multinomial) logistic regression"""
+
+    def __init__(self, directory, meta, mmap=True):
+        self.classes_ = np.array(meta["classes"])
+        self.coef = _load(directory, "coef", mmap)
+        self.intercept = _load(directory, "intercept", mmap)
+
+    def decision_function(self, X):
+        scores = np.tile(np.asarray(self.intercept, dtype=np.float64), (X.shape[0], 1))
+        rows = np.repeat(np.arange(X.shape[0]), np.diff(X.indptr))
+        for k in range(self.coef.shape[0]):
+            scores[:, k] += np.bincount(rows, weights=X.data * self.coef[k][X.indices], minlength=X.shape[0])
+        return scores
+
+    def predict_proba(self, X):
+        scores = self.decision_function(X)
+        if scores.shape[1] == 1:
+            positive = 1 / (1 + np.exp(-scores[:, 0]))
+            return np.column_stack([1 - positive, positive])
+        scores -= scores.max(axis=1, keepdims=True)
+        exp = np.exp(scores)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+
+class CompactForestModel:
+    """predict_proba of a random forest, all trees traversed together"""
+
+    def __init__(self, directory, meta, mmap=True):
+        self.classes_ = np.array(meta["classes"])
+        self.feature = _load(directory, "node_feature", mmap)
+        self.threshold = _load(directory, "node_threshold", mmap)
+        self.left = _load(directory, "node_left", mmap)
+        self.right = _load(directory, "node_right", mmap)
+        self.value = _load(directory, "node_value", mmap)
+        self.roots = _load(directory, "tree_root", mmap)
+        self.depth = int(_load(directory, "tree_depth", mmap)[0])
+
+    def predict_proba(self, X):
+        # Trees split on float32 features, as scikit-learn does
+        dense = X.toarray().astype(np.float32)
+        rows = np.arange(dense.shape[0])[:, None]
+        nodes = np.tile(np.asarray(self.roots, dtype=np.int64), (dense.shape[0], 1))
+        for _ in range(self.depth):
+            go_left = dense[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return self.value[nodes].mean(axis=1)
+
+
+MODEL_KINDS = {
+    "linear": CompactLinearModel,
+    "forest": CompactForestModel,
+}
+
+VECTORIZER_KINDS = {
+    "vocabulary": CompactVectorizer,
+    "hashing": HashingFeaturizer.from_meta,
+}
+
+
+def read_meta(directory):
+    with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("format") != FORMAT:
+        raise ValueError(f"Unsupported compact model format: {meta.get('format')}")
+    return meta
+
+
+def load_compact(directory, mmap=True):
+    """(vectorizer, model) from an exported directory, memory-mapped by default"""
+    meta = read_meta(directory)
+    vectorizer = VECTORIZER_KINDS[meta.get("vectorizer", "vocabulary")](directory, meta, mmap)
+    return vectorizer, MODEL_KINDS[meta["kind"]](directory, meta, mmap)
+
+
+def compact_files(directory):
+    """Every file of an exported model (for versioning)"""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name == META_FILE or name.endswith(".npy")
+    )
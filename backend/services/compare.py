@@ -0,0 +1,177 @@
+# backend/services/compare.py - MULTI-PRODUCT COMPARISON AND RANKING
+# Ranks N candidate products in one request: the reviews of every candidate
+# go through a single batched sentiment pass and a single fake-detection
+# pass, per-product counts are summed with NumPy, and value score, true
+# rating and recommendation are computed for all candidates as array
+# operations. Only the top-k (selected with a partial sort) get pros/cons
+# and summaries. Metrics match what /analyze reports for each product.
+import numpy as np
+from services.analyzer import (RECOMMENDATIONS, calculate_true_ratings, decide_recommendations,
+                               extract_key_phrases, generate_summary)
+from services.corpus import ReviewCorpus
+from services.dedup import dedupe_corpus
+from services.fake_review import is_eligible, is_spam_cluster, review_fake_verdicts
+from services.metrics import REVIEWS_PROCESSED, StageTimer
+from services.sampling import sample_corpus
+from services.sentiment import review_sentiments
+from services.value_score import value_for_money_scores
+
+# Ranking metrics: +1 = higher is better, -1 = lower is better
+METRICS = {
+    "value_score": 1,
+    "true_rating": 1,
+    "positive_percent": 1,
+    "negative_percent": -1,
+    "fake_review_percent": -1,
+}
+
+SENTIMENT_COLUMNS = {"positive": 0, "negative": 1, "neutral": 2}
+
+
+def _rounded(values, digits):
+    # Python's round() per value (cheap for a few thousand candidates) so the
+    # numbers are exactly those of the scalar /analyze path; np.round can
+    # differ in the last digit
+    return np.array([round(value, digits) for value in values.tolist()])
+
+
+def top_k(scores, k):
+    """Indices of the ``k`` highest ``scores``, best first (ties: lower index first).
+
+    Selection is a partial sort (O(n)); only the ``k`` winners are sorted.
+    """
+    n = len(scores)
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    kth = np.partition(scores, n - k)[n - k]  # k-th highest score
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[:k - len(above)]
+    chosen = np.concatenate([above, ties])
+    return chosen[np.lexsort((chosen, -scores[chosen]))]
+
+
+def candidate_matrix(corpora, prices, review_counts, timer):
+    """Metric columns for every candidate (corpora already sampled and deduplicated)"""
+    n = len(corpora)
+    owner = np.repeat(np.arange(n), [len(corpus) for corpus in corpora])
+    docs = [doc for corpus in corpora for doc in corpus.docs]
+    weights = np.fromiter((weight for corpus in corpora for _, weight in corpus.weighted()),
+                          dtype=np.int64, count=len(docs))
+
+    # One batched sentiment pass over every candidate's reviews
+    with timer.stage("sentiment"):
+        results, _ = review_sentiments(docs)
+        labels = np.fromiter((SENTIMENT_COLUMNS.get(result["sentiment"], 2) for result in results),
+                             dtype=np.int64, count=len(docs))
+        counts = np.zeros((n, 3), dtype=np.int64)
+        np.add.at(counts, (owner, labels), weights)
+
+    # One batched fake-detection pass over the eligible reviews
+    with timer.stage("fake_detection"):
+        eligible = np.fromiter((is_eligible(doc) for doc in docs), dtype=bool, count=len(docs))
+        eligible_docs = [doc for doc, keep in zip(docs, eligible) if keep]
+        verdicts = review_fake_verdicts(eligible_docs)
+        eligible_weights = weights[eligible]
+        is_fake = np.fromiter(
+            ((verdict and verdict["is_fake"]) or is_spam_cluster(weight)
+             for verdict, weight in zip(verdicts, eligible_weights.tolist())),
+            dtype=bool, count=len(eligible_docs)
+        )
+        fake_counts = np.bincount(owner[eligible], weights=eligible_weights * is_fake, minlength=n)
+        analyzed = np.bincount(owner[eligible], weights=eligible_weights, minlength=n)
+
+    with timer.stage("scoring"):
+        totals = counts.sum(axis=1)
+        has_reviews = totals > 0
+        safe_totals = np.where(has_reviews, totals, 1)
+        percents = {
+            name: np.where(has_reviews, _rounded(counts[:, column] / safe_totals * 100, 1), 0.0)
+            for name, column in SENTIMENT_COLUMNS.items()
+        }
+        fake_percent = np.where(analyzed > 0, _rounded(fake_counts / np.where(analyzed > 0, analyzed, 1) * 100, 1), 0.0)
+
+        value_score = _rounded(value_for_money_scores(prices, percents["positive"], fake_percent), 2)
+        true_rating = _rounded(calculate_true_ratings(percents["positive"], fake_percent, review_counts), 1)
+        recommendation = decide_recommendations(percents["positive"], percents["neutral"], fake_percent,
+                                                value_score, review_counts)
+
+        # Candidates without reviews score like empty_analysis
+        value_score[~has_reviews] = 0
+        true_rating[~has_reviews] = 0
+
+    return {
+        "has_reviews": has_reviews,
+        "positive_percent": percents["positive"],
+        "negative_percent": percents["negative"],
+        "neutral_percent": percents["neutral"],
+        "fake_review_percent": fake_percent,
+        "value_score": value_score,
+        "true_rating": true_rating,
+        "recommendation": recommendation,
+    }
+
+
+def compare_products(products, metric="value_score", k=5, timer=None, include_matrix=False):
+    """Rank ``products`` (dicts with title/price/reviews) by ``metric``; returns the top ``k``"""
+    timer = timer or StageTimer()
+    direction = METRICS[metric]
+
+    with timer.stage("preprocess"):
+        titles = [product.get("title", "Unknown Product") for product in products]
+        prices = np.array([float(product.get("price") or 0) for product in products])
+        reviews = [product.get("reviews") or [] for product in products]
+        review_counts = np.array([len(product_reviews) for product_reviews in reviews])
+        REVIEWS_PROCESSED.inc(int(review_counts.sum()))
+        # Same bounded work per candidate as /analyze: sample, then one doc per duplicate cluster
+        corpora = [dedupe_corpus(sample_corpus(ReviewCorpus(product_reviews))) for product_reviews in reviews]
+
+    matrix = candidate_matrix(corpora, prices, review_counts, timer)
+
+    with timer.stage("ranking"):
+        # Candidates without reviews rank last whatever the metric
+        scores = np.where(matrix["has_reviews"], matrix[metric] * direction, -np.inf)
+        winners = top_k(scores, k)
+
+    ranking = []
+    with timer.stage("pros_cons"):
+        for rank, i in enumerate(winners.tolist(), 1):
+            if matrix["has_reviews"][i]:
+                recommendation, confidence = RECOMMENDATIONS[matrix["recommendation"][i]]
+                summary = generate_summary(recommendation, matrix["positive_percent"][i].item(),
+                                           matrix["fake_review_percent"][i].item(), matrix["true_rating"][i].item())
+                pros = extract_key_phrases(corpora[i], "positive")
+                cons = extract_key_phrases(corpora[i], "negative")
+            else:
+                recommendation, confidence = "Not Enough Data ❓", "Low"
+                summary, pros, cons = "No reviews found for analysis", [], []
+            ranking.append({
+                "rank": rank,
+                "index": i,
+                "id": products[i].get("id", products[i].get("product_id")),
+                "title": titles[i],
+                "price": products[i].get("price", 0),
+                "review_count": int(review_counts[i]),
+                "recommendation": recommendation,
+                "confidence": confidence,
+                "value_score": matrix["value_score"][i].item(),
+                "true_rating": matrix["true_rating"][i].item(),
+                "positive_percent": matrix["positive_percent"][i].item(),
+                "fake_review_percent": matrix["fake_review_percent"][i].item(),
+                "summary": summary,
+                "pros": pros,
+                "cons": cons,
+            })
+
+    result = {"metric": metric, "ranking": ranking}
+    if include_matrix:
+        # Every candidate's metrics, column-wise (input order)
+        result["matrix"] = {
+            name: matrix[name].tolist()
+            for name in ("value_score", "true_rating", "positive_percent", "negative_percent", "fake_review_percent")
+        }
+        result["matrix"]["recommendation"] = [
+            RECOMMENDATIONS[code][0] if has_reviews else "Not Enough Data ❓"
+            for code, has_reviews in zip(matrix["recommendation"].tolist(), matrix["has_reviews"].tolist())
+        ]
+    return result
@@ -0,0 +1,97 @@
+# backend/services/config.py - RUNTIME SETTINGS
+# Every setting can be overridden with a CONSIA_* environment variable.
+import os
+
+
+def _int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        print(f"⚠️ Invalid {name}, using {default}")
+        return default
+
+
+def _float(name, default):
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        print(f"⚠️ Invalid {name}, using {default}")
+        return default
+
+
+def _str(name, default=""):
+    return os.environ.get(name, default).strip()
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Trained models (paths are independent of the working directory)
+MODEL_DIR = _str("CONSIA_MODEL_DIR", os.path.join(BACKEND_DIR, "ml"))
+SENTIMENT_MODEL_PATH = _str("CONSIA_SENTIMENT_MODEL_PATH", os.path.join(MODEL_DIR, "sentiment_model.pkl"))
+SENTIMENT_VECTORIZER_PATH = _str("CONSIA_SENTIMENT_VECTORIZER_PATH", os.path.join(MODEL_DIR, "sentiment_vectorizer.pkl"))
+FAKE_MODEL_PATH = _str("CONSIA_FAKE_MODEL_PATH", os.path.join(MODEL_DIR, "fake_model.pkl"))
+FAKE_VECTORIZER_PATH = _str("CONSIA_FAKE_VECTORIZER_PATH", os.path.join(MODEL_DIR, "fake_vectorizer.pkl"))
+COMPACT_MODEL_DIR = _str("CONSIA_COMPACT_MODEL_DIR", os.path.join(MODEL_DIR, "compact"))
+MODEL_VERSIONS_DIR = _str("CONSIA_MODEL_VERSIONS_DIR", os.path.join(MODEL_DIR, "versions"))  # streaming trainer output
+MODEL_FORMAT = _str("CONSIA_MODEL_FORMAT", "auto")  # "compact", "pickle" or "auto" (compact if exported)
+FAST_SCORER = _str("CONSIA_FAST_SCORER", "1").lower() in ("1", "true", "yes")  # batched linear scorer
+WARM_MODELS = _str("CONSIA_WARM_MODELS", "0").lower() in ("1", "true", "yes")  # load at startup
+MODEL_WATCH_INTERVAL = _float("CONSIA_MODEL_WATCH_INTERVAL", 30)  # seconds between CURRENT checks, 0 = off
+ADMIN_TOKEN = _str("CONSIA_ADMIN_TOKEN")  # X-Admin-Token for /admin endpoints, empty = disabled
+
+# /analyze result cache
+RESULT_CACHE_SIZE = _int("CONSIA_RESULT_CACHE_SIZE", 1024)  # entries, 0 disables
+RESULT_CACHE_TTL = _float("CONSIA_RESULT_CACHE_TTL", 3600)  # seconds, 0 = no expiry
+RESULT_CACHE_PATH = _str("CONSIA_RESULT_CACHE_PATH")  # sqlite file, empty = in-memory
+COALESCE_TIMEOUT = _float("CONSIA_COALESCE_TIMEOUT", 30)  # seconds identical requests wait for one running analysis, 0 = off
+
+# Per-review verdict cache shared by the sentiment and fake detectors
+VERDICT_CACHE_SIZE = _int("CONSIA_VERDICT_CACHE_SIZE", 50000)  # entries, 0 disables
+
+# Keyword lists for pros/cons and fake phrases (JSON file with
+# "positive", "negative" and/or "fake_phrases" lists; empty = built-in lists)
+KEYWORDS_FILE = _str("CONSIA_KEYWORDS_FILE")
+
+# Polarity for the fallback sentiment and the pros/cons filter: "textblob"
+# or the faster opt-in "lexicon" (built-in engine over TextBlob's lexicon,
+# which differs on e.g. contracted negations, see services.polarity)
+POLARITY_ENGINE = _str("CONSIA_POLARITY_ENGINE", "textblob")
+POLARITY_LEXICON = _str("CONSIA_POLARITY_LEXICON")  # en-sentiment.xml style file, empty = TextBlob's
+
+# Bounded-work sampling shared by all scorers
+SAMPLE_BUDGET = _int("CONSIA_SAMPLE_BUDGET", 300)  # reviews analyzed per product, 0 = no limit
+SAMPLE_STRATEGY = _str("CONSIA_SAMPLE_STRATEGY", "stratified")  # "stratified", "reservoir" or "random"
+SAMPLE_SEED = _int("CONSIA_SAMPLE_SEED", 0)
+CONFIDENCE_LEVEL_Z = _float("CONSIA_CONFIDENCE_Z", 1.96)  # 1.96 = 95% intervals
+
+# Per-request latency budget (payload "budget_ms" overrides): the pipeline
+# samples, degrades and skips stages to fit (see services.budget)
+LATENCY_BUDGET_MS = _float("CONSIA_LATENCY_BUDGET_MS", 0)  # 0 = no budget
+LATENCY_MIN_SAMPLE = _int("CONSIA_LATENCY_MIN_SAMPLE", 30)  # reviews kept however tight the budget
+
+# Duplicate / near-duplicate review collapsing before scoring
+DEDUP_ENABLED = _str("CONSIA_DEDUP", "1").lower() in ("1", "true", "yes")
+DEDUP_MAX_HAMMING = _int("CONSIA_DEDUP_MAX_HAMMING", 3)  # SimHash bits; -1 = exact copies only
+DEDUP_MIN_WORDS = _int("CONSIA_DEDUP_MIN_WORDS", 6)  # shorter reviews only match exact copies
+DUPLICATE_SPAM_CLUSTER = _int("CONSIA_DUPLICATE_SPAM_CLUSTER", 3)  # copies counted as fake, 0 = off
+
+# Incremental analysis: per-product aggregates kept in memory
+INCREMENTAL_MAX_PRODUCTS = _int("CONSIA_INCREMENTAL_MAX_PRODUCTS", 10000)
+INCREMENTAL_TTL = _float("CONSIA_INCREMENTAL_TTL", 7 * 24 * 3600)  # seconds, 0 = no expiry
+
+# /batch-analyze worker pool
+BATCH_WORKERS = _int("CONSIA_BATCH_WORKERS", min(4, os.cpu_count() or 1))  # processes, <= 1 runs inline
+MAX_BATCH_SIZE = _int("CONSIA_MAX_BATCH_SIZE", 500)  # products per request
+BATCH_ITEM_TIMEOUT = _float("CONSIA_BATCH_ITEM_TIMEOUT", 30)  # seconds per product
+
+# /compare: candidate products ranked in one request
+MAX_COMPARE_SIZE = _int("CONSIA_MAX_COMPARE_SIZE", 1000)
+
+# ASGI serving (asgi.py / serve.py)
+SERVER_WORKERS = _int("CONSIA_SERVER_WORKERS", 1)  # uvicorn worker processes
+ASGI_EXECUTOR_THREADS = _int("CONSIA_ASGI_EXECUTOR_THREADS", 4)  # analysis threads per worker
+ASGI_MAX_IN_FLIGHT = _int("CONSIA_ASGI_MAX_IN_FLIGHT", 16)  # running + queued requests per worker
+ASGI_RETRY_AFTER = _int("CONSIA_ASGI_RETRY_AFTER", 2)  # seconds, sent with 503 when saturated
+MAX_REQUEST_BYTES = _int("CONSIA_MAX_REQUEST_BYTES", 16 * 1024 * 1024)  # as sent (compressed)
+MAX_DECODED_BYTES = _int("CONSIA_MAX_DECODED_BYTES", 64 * 1024 * 1024)  # after decompression
+JSON_CODEC = _str("CONSIA_JSON_CODEC", "auto")  # "json", or "auto" for orjson when installed
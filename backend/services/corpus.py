@@ -0,0 +1,168 @@
+# backend/services/corpus.py - SHARED TEXT PREPROCESSING
+import hashlib
+import re
+from services.polarity import get_engine
+
+# Same sentence splitter extract_key_phrases has always used
+SENTENCE_SPLIT = re.compile(r'[.!?]+')
+
+# Only the first 500 characters of a review are mined for pros/cons
+MAX_SENTENCE_SOURCE = 500
+
+
+class Sentence:
+    """A single review sentence with cached lowercase text and polarity"""
+    __slots__ = ("text", "lower", "_polarity")
+
+    def __init__(self, text):
+        self.text = text
+        self.lower = text.lower()
+        self._polarity = None
+
+    @property
+    def polarity(self):
+        """Polarity (configured engine), computed at most once"""
+        if self._polarity is None:
+            self._polarity = get_engine().score(self.text)
+        return self._polarity
+
+
+class ReviewDoc:
+    """A review parsed once: normalized text, tokens, sentences and polarity.
+
+    Everything except the raw text is computed lazily and memoized, so a
+    stage that never needs (say) sentences never pays for them.
+    """
+    __slots__ = ("text", "_digest", "_stripped", "_lower", "_words", "_sentences", "_polarity")
+
+    def __init__(self, text):
+        self.text = text
+        self._digest = None
+        self._stripped = None
+        self._lower = None
+        self._words = None
+        self._sentences = None
+        self._polarity = None
+
+    @property
+    def digest(self):
+        """Content hash used as the per-review cache key"""
+        if self._digest is None:
+            self._digest = text_digest(self.text)
+        return self._digest
+
+    @property
+    def stripped(self):
+        if self._stripped is None:
+            self._stripped = self.text.strip()
+        return self._stripped
+
+    @property
+    def lower(self):
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def words(self):
+        """Whitespace tokens of the raw text"""
+        if self._words is None:
+            self._words = self.text.split()
+        return self._words
+
+    @property
+    def sentences(self):
+        """Stripped sentences from the first MAX_SENTENCE_SOURCE characters"""
+        if self._sentences is None:
+            self._sentences = [
+                Sentence(sentence.strip())
+                for sentence in SENTENCE_SPLIT.split(self.text[:MAX_SENTENCE_SOURCE])
+            ]
+        return self._sentences
+
+    @property
+    def polarity(self):
+        """Polarity of the whole review (configured engine), computed at most once"""
+        if self._polarity is None:
+            self._polarity = get_engine().score(self.text)
+        return self._polarity
+
+
+class ReviewCorpus:
+    """The reviews of one product, parsed exactly once per request.
+
+    analyze_product builds one corpus and hands it to every scorer; the
+    scorers also accept a plain list of strings and wrap it themselves.
+    """
+
+    def __init__(self, reviews):
+        self.docs = [ReviewDoc(review) for review in reviews]
+        # Size of the review set this corpus stands for (larger when sampled)
+        self.population = len(self.docs)
+        # Copies each doc stands for (None = one each; set by deduplication)
+        self.weights = None
+        # Duplicate-cluster statistics once deduplicated (see services.dedup)
+        self.duplicates = None
+
+    @classmethod
+    def from_docs(cls, docs, population, weights=None):
+        """A corpus over already-parsed docs, e.g. a sample of a larger corpus"""
+        corpus = cls([])
+        corpus.docs = docs
+        corpus.population = population
+        corpus.weights = weights
+        return corpus
+
+    @property
+    def size(self):
+        """Number of reviews the docs stand for (counting duplicate copies)"""
+        if self.weights is None:
+            return len(self.docs)
+        return sum(self.weights)
+
+    @property
+    def is_sample(self):
+        return self.size < self.population
+
+    def weighted(self):
+        """(doc, weight) pairs"""
+        if self.weights is None:
+            return ((doc, 1) for doc in self.docs)
+        return zip(self.docs, self.weights)
+
+    @classmethod
+    def ensure(cls, reviews):
+        """Return ``reviews`` as a ReviewCorpus, wrapping plain lists"""
+        if isinstance(reviews, cls):
+            return reviews
+        return cls(reviews)
+
+    @property
+    def texts(self):
+        return [doc.text for doc in self.docs]
+
+    def __len__(self):
+        return len(self.docs)
+
+    def __iter__(self):
+        return iter(self.docs)
+
+
+def text_digest(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def score_polarities(items):
+    """Fill in the polarity of many Sentences/ReviewDocs with one batch call"""
+    pending = [item for item in items if item._polarity is None]
+    if pending:
+        for item, polarity in zip(pending, get_engine().score_batch([item.text for item in pending])):
+            item._polarity = polarity
+    return items
+
+
+def as_doc(text):
+    """Return ``text`` as a ReviewDoc, wrapping plain strings"""
+    if isinstance(text, ReviewDoc):
+        return text
+    return ReviewDoc(text)
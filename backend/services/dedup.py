@@ -0,0 +1,161 @@
+# backend/services/dedup.py - DUPLICATE AND NEAR-DUPLICATE REVIEWS
+# Scraped review lists repeat themselves (pagination overlap, copy-paste
+# spam). Each distinct review is scored once and its verdict weighted by
+# the number of copies: exact copies are grouped by content hash, near
+# copies by 64-bit SimHash fingerprints (banded lookup + union-find).
+import hashlib
+import re
+from functools import lru_cache
+import numpy as np
+from services import config
+from services.corpus import ReviewCorpus
+
+TOKEN = re.compile(r"\w+")
+SIMHASH_BITS = 64
+
+
+@lru_cache(maxsize=65536)
+def _feature_hash(feature):
+    # Stable across processes (unlike hash()), memoized since review vocabularies repeat
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _features(doc):
+    tokens = TOKEN.findall(doc.lower)
+    return [tokens[i] + " " + tokens[i + 1] for i in range(len(tokens) - 1)] or tokens
+
+
+def simhash(doc):
+    """64-bit SimHash of a review's lowercase word bigrams"""
+    return simhashes([doc])[0]
+
+
+def simhashes(docs, chunk_size=1000):
+    """SimHash fingerprints for many reviews, one vectorized pass per chunk"""
+    fingerprints = []
+    for start in range(0, len(docs), chunk_size):
+        features = [_features(doc) for doc in docs[start:start + chunk_size]]
+        lengths = np.array([len(doc_features) for doc_features in features], dtype=np.int64)
+        hashes = np.fromiter(
+            (_feature_hash(feature) for doc_features in features for feature in doc_features),
+            dtype=np.uint64, count=int(lengths.sum())
+        )
+        bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+
+        # Each feature votes +1/-1 per bit; the fingerprint keeps the majority
+        votes = np.zeros((len(features), SIMHASH_BITS), dtype=np.int64)
+        nonempty = lengths > 0
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))[nonempty]
+        if len(offsets):
+            votes[nonempty] = np.add.reduceat(bits, offsets, axis=0, dtype=np.int64)
+        votes = votes * 2 - lengths[:, None]
+        packed = np.packbits(votes > 0, axis=1, bitorder="little").view(np.uint64).ravel()
+        fingerprints.extend(int(fingerprint) for fingerprint in packed)
+    return fingerprints
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            # The earlier review stays the cluster representative
+            self.parent[max(a, b)] = min(a, b)
+
+
+def near_duplicate_groups(docs, max_distance=None, min_words=None):
+    """Cluster ids (index of the cluster's first doc) for near-duplicate ``docs``.
+
+    Fingerprints are split into ``max_distance + 1`` bands; two fingerprints
+    within ``max_distance`` bits must agree on at least one band, so only
+    reviews sharing a band are compared. Reviews shorter than ``min_words``
+    are never merged (their fingerprints are too noisy).
+    """
+    max_distance = config.DEDUP_MAX_HAMMING if max_distance is None else max_distance
+    min_words = config.DEDUP_MIN_WORDS if min_words is None else min_words
+    groups = _UnionFind(len(docs))
+    if max_distance < 0:
+        return [groups.find(i) for i in range(len(docs))]
+
+    bands = max_distance + 1
+    band_bits = SIMHASH_BITS // bands
+    band_mask = (1 << band_bits) - 1
+    buckets = {}
+    first_with = {}  # fingerprint -> first review with it
+    fingerprints = {}
+
+    candidates = [i for i, doc in enumerate(docs) if len(doc.words) >= min_words]
+    for i, fingerprint in zip(candidates, simhashes([docs[i] for i in candidates])):
+        # Identical fingerprints always match; only distinct ones go through the bands
+        if fingerprint in first_with:
+            groups.union(i, first_with[fingerprint])
+            continue
+        first_with[fingerprint] = i
+        fingerprints[i] = fingerprint
+
+        keys = [(band, (fingerprint >> (band * band_bits)) & band_mask) for band in range(bands)]
+        compared = set()
+        for key in keys:
+            for j in buckets.get(key, ()):
+                if j not in compared:
+                    compared.add(j)
+                    if hamming(fingerprint, fingerprints[j]) <= max_distance:
+                        groups.union(i, j)
+        for key in keys:
+            buckets.setdefault(key, []).append(i)
+
+    return [groups.find(i) for i in range(len(docs))]
+
+
+def dedupe_corpus(corpus):
+    """``corpus`` with one doc per (near-)duplicate cluster, weighted by cluster size.
+
+    Idempotent, and a no-op when CONSIA_DEDUP is off. The returned corpus
+    carries duplicate-cluster statistics in ``.duplicates``.
+    """
+    corpus = ReviewCorpus.ensure(corpus)
+    if corpus.duplicates is not None or not config.DEDUP_ENABLED:
+        return corpus
+
+    # Exact copies: one entry per distinct text, in first-seen order
+    exact = {}
+    for doc, weight in corpus.weighted():
+        entry = exact.get(doc.digest)
+        if entry is None:
+            exact[doc.digest] = [doc, weight]
+        else:
+            entry[1] += weight
+    unique = list(exact.values())
+
+    # Near copies among the distinct texts
+    cluster_of = near_duplicate_groups([doc for doc, _ in unique])
+    clusters = {}
+    for (doc, weight), cluster in zip(unique, cluster_of):
+        if cluster in clusters:
+            clusters[cluster][1] += weight
+        else:
+            clusters[cluster] = [doc, weight]
+
+    docs = [doc for doc, _ in clusters.values()]
+    weights = [weight for _, weight in clusters.values()]
+    deduped = ReviewCorpus.from_docs(docs, corpus.population, weights)
+    deduped.duplicates = {
+        "unique": len(docs),
+        "exact_duplicates": corpus.size - len(unique),
+        "near_duplicates": len(unique) - len(docs),
+        "clusters": sum(1 for weight in weights if weight > 1),
+        "largest_cluster": max(weights, default=0)
+    }
+    return deduped
@@ -1,62 +1,101 @@
 # backend/services/fake_review.py - ML VERSION
-import joblib
-import os
-import re
+from collections import Counter
+import numpy as np
+from services.corpus import as_doc
+from services.sampling import sample_corpus, proportion_interval
+from services.dedup import dedupe_corpus
+from services import config
+from services.cache import cached_verdicts
+from services.models import model_registry
+from services.metrics import INFERENCE_PATH
+from services.keywords import FAKE_PHRASE_MATCHER
+
+# Bump when the rules change so cached rule verdicts are not reused
+RULES_VERSION = "rules-3"
 
 class FakeDetectorML:
-    def __init__(self):
-        self.model = None
-        self.vectorizer = None
-        self.load_models()
+    def __init__(self, registry=model_registry):
+        # Models are loaded lazily (once per process) by the registry
+        self.registry = registry
+    
+    @property
+    def models(self):
+        """The loaded vectorizer/model pair (loads on first use)"""
+        return self.registry.get("fake")
+    
+    @property
+    def model(self):
+        return self.models.model
+    
+    @property
+    def vectorizer(self):
+        return self.models.vectorizer
+    
+    @property
+    def model_version(self):
+        return self.models.version
     
     def load_models(self):
-        """Load trained fake detection models"""
-        try:
-            model_path = "backend/ml/fake_model.pkl"
-            vectorizer_path = "backend/ml/fake_vectorizer.pkl"
-            
-            if os.path.exists(model_path) and os.path.exists(vectorizer_path):
-                self.model = joblib.load(model_path)
-                self.vectorizer = joblib.load(vectorizer_path)
-                print("✅ Fake detection model loaded")
-                return True
-        except Exception as e:
-            print(f"❌ Error loading fake detector: {e}")
-        
-        self.model = None
-        self.vectorizer = None
-        return False
+        """Load trained fake detection models (no-op after the first call)"""
+        return self.models.loaded
     
     def detect_ml(self, text):
         """Detect fake review using ML"""
-        if self.model and self.vectorizer:
-            try:
-                text_vec = self.vectorizer.transform([text])
-                prediction = self.model.predict(text_vec)[0]
-                proba = self.model.predict_proba(text_vec)[0]
-                
+        return self.detect_ml_batch([text])[0]
+    
+    def detect_ml_batch(self, texts):
+        """Detect fake reviews for many texts with a single model pass.
+        
+        ``texts`` may be strings or ReviewDocs. Verdicts are memoized per
+        review text and model version, so only cache misses hit the model.
+        Returns one result per text, or ``None`` entries if the model is
+        unavailable or fails (callers fall back to the rules for those).
+        """
+        models = self.models  # one consistent snapshot for the whole batch
+        if models.loaded and texts:
+            docs = [as_doc(text) for text in texts]
+            return cached_verdicts("fake_ml", models.version, docs,
+                                   lambda missed: self._detect_ml_docs(models, missed))
+        
+        return [None] * len(texts)
+    
+    def _detect_ml_docs(self, models, docs):
+        try:
+            probas = models.predict_proba([doc.text for doc in docs])
+            # Same argmax rule predict() uses, without a second model pass
+            predictions = models.model.classes_.take(np.argmax(probas, axis=1))
+            
+            results = []
+            for prediction, proba in zip(predictions, probas):
                 # 1 = fake, 0 = real
                 is_fake = bool(prediction)
                 confidence = float(proba[1] if is_fake else proba[0])
                 
-                return {
+                results.append({
                     "is_fake": is_fake,
                     "confidence": confidence,
                     "method": "ml_model",
                     "score": confidence * 100
-                }
-            except Exception as e:
-                print(f"❌ ML fake detection error: {e}")
+                })
+            return results
+        except Exception as e:
+            print(f"❌ ML fake detection error: {e}")
         
-        return None
+        return [None] * len(docs)
     
     def detect_rules(self, text):
-        """Rule-based fake detection"""
+        """Rule-based fake detection (accepts a string or a ReviewDoc)"""
+        doc = as_doc(text)
+        return cached_verdicts("fake_rules", RULES_VERSION, [doc],
+                               lambda docs: [self._detect_rules_doc(docs[0])])[0]
+    
+    def _detect_rules_doc(self, doc):
+        text = doc.text
         score = 0
         reasons = []
         
         # Rule 1: Very short (less than 5 words)
-        words = text.split()
+        words = doc.words
         if len(words) < 5:
             score += 30
             reasons.append("Too short (<5 words)")
@@ -67,24 +106,20 @@ class FakeDetectorML:
             score += min(40, excl_count * 15)
             reasons.append(f"Excessive punctuation ({excl_count})")
         
-        # Rule 3: Repeated words/phrases
-        for word in words:
-            if words.count(word) > 2 and len(word) > 3:
-                score += 20
-                reasons.append(f"Repeated word: '{word}'")
-                break
-        
-        # Rule 4: Common fake phrases
-        fake_phrases = [
-            "best product ever", "must buy", "highly recommend",
-            "love it", "excellent", "amazing", "awesome", "perfect"
+        # Rule 3: Repeated words/phrases (one token-frequency pass, linear time)
+        repeated = [
+            (word, count) for word, count in Counter(words).items()
+            if count > 2 and len(word) > 3
         ]
-        text_lower = text.lower()
-        for phrase in fake_phrases:
-            if phrase in text_lower:
-                score += 15
-                reasons.append(f"Common fake phrase")
-                break
+        if repeated:
+            score += 20
+            reasons.append("Repeated words: " + ", ".join(f"'{word}' x{count}" for word, count in repeated))
+        
+        # Rule 4: Common fake phrases (all phrases found in one pass)
+        matched_phrases = FAKE_PHRASE_MATCHER.findall(doc.lower)
+        if matched_phrases:
+            score += 15
+            reasons.append("Common fake phrase: " + ", ".join(f"'{phrase}'" for phrase in matched_phrases))
         
         # Normalize score
         final_score = min(100, score)
@@ -100,38 +135,77 @@ class FakeDetectorML:
 
 # Global detector
 fake_detector = FakeDetectorML()
-fake_ml_loaded = fake_detector.load_models()
 
 def fake_review_score(reviews):
     """Calculate fake review percentage"""
+    return fake_review_report(reviews)["fake_percent"]
+
+def fake_review_report(reviews, use_ml=True):
+    """Fake review percentage with the counts and confidence interval behind it.
+    
+    ``use_ml=False`` runs the rules only (the cheaper path under a latency budget).
+    """
     if not reviews:
-        return 0
+        return fake_summary(0, 0, 0)
     
     fake_count = 0
     analyzed_count = 0
     
-    for review in reviews:
-        if len(review.strip()) < 10:  # Skip very short
-            continue
-        
-        # Try ML detection
-        if fake_ml_loaded:
-            result = fake_detector.detect_ml(review)
-            if not result:
-                result = fake_detector.detect_rules(review)
-        else:
-            result = fake_detector.detect_rules(review)
-        
-        if result and result["is_fake"]:
-            fake_count += 1
-        
-        analyzed_count += 1
+    # Bounded work: huge review sets are scored on a sample (not just the
+    # first N), and each duplicate cluster once, weighted by its copies
+    corpus = dedupe_corpus(sample_corpus(reviews))
+    
+    # Skip very short reviews
+    candidates = [(doc, weight) for doc, weight in corpus.weighted() if is_eligible(doc)]
+    
+    verdicts = review_fake_verdicts([doc for doc, _ in candidates], use_ml)
+    for result, (_, weight) in zip(verdicts, candidates):
+        # The same text posted many times is a copy-paste campaign, whatever it says
+        if (result and result["is_fake"]) or is_spam_cluster(weight):
+            fake_count += weight
         
-        if analyzed_count >= 30:  # Limit for performance
-            break
+        analyzed_count += weight
     
+    # Eligible (non-trivial) reviews in the whole set, estimated from the sample
+    eligible_population = round(corpus.population * analyzed_count / corpus.size)
+    report = fake_summary(fake_count, analyzed_count, eligible_population)
+    if corpus.duplicates is not None:
+        report["duplicates"] = corpus.duplicates
+    return report
+
+def is_eligible(doc):
+    """Very short reviews are skipped by fake detection"""
+    return len(doc.stripped) >= 10
+
+def is_spam_cluster(copies):
+    """Duplicate-cluster signal: DUPLICATE_SPAM_CLUSTER or more copies of one review"""
+    return 0 < config.DUPLICATE_SPAM_CLUSTER <= copies
+
+def review_fake_verdicts(docs, use_ml=True):
+    """Per-review fake verdicts (ML first, rules fallback)"""
+    # Try ML detection, batched: one vectorizer pass and one model pass
+    ml_results = fake_detector.detect_ml_batch(docs) if use_ml else [None] * len(docs)
+    
+    ml_count = sum(1 for result in ml_results if result)
+    INFERENCE_PATH.inc(ml_count, detector="fake", path="ml_model")
+    INFERENCE_PATH.inc(len(docs) - ml_count, detector="fake", path="fallback")
+    
+    return [result or fake_detector.detect_rules(doc) for doc, result in zip(docs, ml_results)]
+
+def fake_summary(fake_count, analyzed_count, eligible_population):
+    """Fake review report from verdict counts"""
     if analyzed_count == 0:
-        return 0
+        return {
+            "fake_percent": 0,
+            "fake_count": 0,
+            "analyzed_count": 0,
+            "confidence_interval": [0.0, 0.0]
+        }
     
     fake_percent = (fake_count / analyzed_count) * 100
-    return round(fake_percent, 1)
\ No newline at end of file
+    return {
+        "fake_percent": round(fake_percent, 1),
+        "fake_count": fake_count,
+        "analyzed_count": analyzed_count,
+        "confidence_interval": proportion_interval(fake_count, analyzed_count, eligible_population)
+    }
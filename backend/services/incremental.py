@@ -0,0 +1,172 @@
+# backend/services/incremental.py - INCREMENTAL PRODUCT ANALYSIS
+# Keeps the running counts behind get_sentiment_report and
+# fake_review_score per product, so a product that gained (or lost) a
+# few reviews is updated in O(delta) instead of re-analyzing everything.
+import threading
+from collections import OrderedDict
+from services import config
+from services.analyzer import build_analysis, empty_analysis, review_key_phrases
+from services.cache import LRUCache
+from services.corpus import ReviewDoc
+from services.fake_review import fake_summary, is_eligible, is_spam_cluster, review_fake_verdicts
+from services.metrics import REVIEWS_PROCESSED
+from services.sentiment import sentiment_summary, review_sentiments
+
+
+class ProductAggregate:
+    """Running verdict counts and candidate pros/cons for one product"""
+
+    def __init__(self, product_id):
+        self.product_id = product_id
+        self.lock = threading.Lock()
+        # review digest -> {"count", "sentiment", "fake", "pros", "cons"}
+        self.entries = {}
+        self.review_count = 0
+        self.sentiment_counts = {"positive": 0, "negative": 0, "neutral": 0}
+        self.ml_count = 0
+        self.fake_count = 0
+        self.fake_analyzed = 0
+        # phrase -> number of reviews currently contributing it (insertion ordered)
+        self.pros = OrderedDict()
+        self.cons = OrderedDict()
+
+    def add(self, reviews):
+        """Analyze only reviews not seen before; repeats just bump their count"""
+        new_docs = {}
+        for review in reviews:
+            doc = ReviewDoc(review)
+            if doc.digest in self.entries:
+                self._apply(self.entries[doc.digest], +1)
+            elif doc.digest in new_docs:
+                new_docs[doc.digest][1] += 1
+            else:
+                new_docs[doc.digest] = [doc, 1]
+
+        if not new_docs:
+            return 0
+
+        docs = [doc for doc, _ in new_docs.values()]
+        REVIEWS_PROCESSED.inc(len(docs))
+
+        sentiments, from_ml = review_sentiments(docs)
+        eligible = [doc for doc in docs if is_eligible(doc)]
+        fake_verdicts = dict(zip((doc.digest for doc in eligible), review_fake_verdicts(eligible)))
+
+        for doc, sentiment, ml in zip(docs, sentiments, from_ml):
+            verdict = fake_verdicts.get(doc.digest)
+            entry = {
+                "count": 0,
+                "sentiment": sentiment["sentiment"],
+                "ml": ml,
+                "fake": None if verdict is None else bool(verdict["is_fake"]),
+                "pros": list(dict.fromkeys(review_key_phrases(doc, "positive"))),
+                "cons": list(dict.fromkeys(review_key_phrases(doc, "negative"))),
+            }
+            self.entries[doc.digest] = entry
+            self._apply(entry, new_docs[doc.digest][1])
+        return len(docs)
+
+    def remove(self, reviews):
+        """Forget one occurrence of each review; unknown reviews are ignored"""
+        removed = 0
+        for review in reviews:
+            digest = ReviewDoc(review).digest
+            entry = self.entries.get(digest)
+            if entry is None:
+                continue
+            self._apply(entry, -1)
+            removed += 1
+            if entry["count"] == 0:
+                del self.entries[digest]
+        return removed
+
+    def _apply(self, entry, delta):
+        """Add (delta > 0) or remove (delta < 0) occurrences of a review"""
+        old_fake = self._fake_copies(entry)
+        entry["count"] += delta
+        self.review_count += delta
+        self.sentiment_counts[entry["sentiment"]] += delta
+        if entry["ml"]:
+            self.ml_count += delta
+        if entry["fake"] is not None:
+            self.fake_analyzed += delta
+            # Re-weigh the whole cluster: crossing DUPLICATE_SPAM_CLUSTER flips all its copies
+            self.fake_count += self._fake_copies(entry) - old_fake
+
+        for phrases, counts in ((entry["pros"], self.pros), (entry["cons"], self.cons)):
+            for phrase in phrases:
+                counts[phrase] = counts.get(phrase, 0) + delta
+                if counts[phrase] <= 0:
+                    del counts[phrase]
+
+    @staticmethod
+    def _fake_copies(entry):
+        """Copies of a review counted as fake, as fake_review_report weighs its cluster"""
+        if entry["fake"] is None:
+            return 0
+        return entry["count"] if entry["fake"] or is_spam_cluster(entry["count"]) else 0
+
+    def analysis(self, title, price):
+        """Full analysis result recomputed from the aggregates"""
+        if self.review_count <= 0:
+            return empty_analysis(title)
+
+        sentiment = sentiment_summary(
+            self.sentiment_counts["positive"],
+            self.sentiment_counts["negative"],
+            self.sentiment_counts["neutral"],
+            self.review_count,
+            "ml_model" if self.ml_count else "textblob"
+        )
+        fake_report = fake_summary(self.fake_count, self.fake_analyzed, self.fake_analyzed)
+
+        return build_analysis(
+            title, price, sentiment, fake_report["fake_percent"],
+            list(self.pros)[:3], list(self.cons)[:3], self.review_count
+        )
+
+
+class AggregateStore:
+    """Bounded, TTL-expiring map of product ID -> ProductAggregate"""
+
+    def __init__(self, max_products, ttl):
+        self._cache = LRUCache(max_products, ttl)
+        self._lock = threading.Lock()
+
+    def get_or_create(self, product_id, reset=False):
+        """Return (aggregate, created)"""
+        with self._lock:
+            aggregate = None if reset else self._cache.get(product_id)
+            created = aggregate is None
+            if created:
+                aggregate = ProductAggregate(product_id)
+                self._cache.set(product_id, aggregate)
+            return aggregate, created
+
+    def stats(self):
+        return self._cache.stats()
+
+
+aggregate_store = AggregateStore(config.INCREMENTAL_MAX_PRODUCTS, config.INCREMENTAL_TTL)
+
+
+def analyze_incremental(product_id, title, price, added=(), removed=(), reviews=None):
+    """Update a product's stored aggregate and return (analysis, update info).
+
+    Pass ``reviews`` (the full list) to (re)build the aggregate from
+    scratch, otherwise just the ``added`` and ``removed`` reviews.
+    """
+    aggregate, created = aggregate_store.get_or_create(product_id, reset=reviews is not None)
+
+    with aggregate.lock:
+        analyzed = aggregate.add(reviews if reviews is not None else added)
+        dropped = aggregate.remove(removed)
+        analysis = aggregate.analysis(title, price)
+
+    return analysis, {
+        "product_id": product_id,
+        "created": created,
+        "analyzed_reviews": analyzed,
+        "removed_reviews": dropped,
+        "review_count": aggregate.review_count
+    }
@@ -0,0 +1,85 @@
+# backend/services/keywords.py - KEYWORD MATCHING
+import json
+import re
+from services import config
+
+# Keywords for pros and cons
+POSITIVE_KEYWORDS = ['good', 'great', 'excellent', 'awesome', 'best', 'love', 
+                     'perfect', 'amazing', 'worth', 'recommend', 'satisfied',
+                     'happy', 'value', 'quality', 'comfortable', 'nice']
+
+NEGATIVE_KEYWORDS = ['bad', 'poor', 'worst', 'waste', 'issue', 'problem',
+                     'disappointed', 'terrible', 'avoid', "don't buy", 'not good',
+                     'broken', 'defective', 'faulty', 'return', 'complaint']
+
+# Common fake-review phrases (rule-based fake detection)
+FAKE_PHRASES = [
+    "best product ever", "must buy", "highly recommend",
+    "love it", "excellent", "amazing", "awesome", "perfect"
+]
+
+
+class KeywordMatcher:
+    """Finds every keyword occurring in a text with one compiled regex.
+    
+    Matching is plain substring matching on lowercase text, exactly like
+    ``keyword in text.lower()``, but all keywords are checked in a single
+    pass instead of one scan per keyword.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keyword.lower() for keyword in keywords if keyword))
+        self._any = None
+        self._all = None
+        if self.keywords:
+            # Longest first, so each position reports its longest keyword
+            alternation = "|".join(
+                re.escape(keyword) for keyword in sorted(self.keywords, key=len, reverse=True)
+            )
+            self._any = re.compile(alternation)
+            # Zero-width lookahead finds overlapping matches at every position
+            self._all = re.compile(f"(?=({alternation}))")
+        
+        # Keywords matching at the same position are all prefixes of the
+        # longest one found there, so expand each match to its prefixes
+        self._prefixes = {
+            keyword: [other for other in self.keywords if keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+
+    def search(self, text):
+        """True if any keyword occurs in ``text`` (expected lowercase)"""
+        return self._any is not None and self._any.search(text) is not None
+
+    def findall(self, text):
+        """Every distinct keyword occurring in ``text``, in order of first occurrence"""
+        if self._all is None:
+            return []
+        
+        found = {}
+        for match in self._all.finditer(text):
+            for keyword in self._prefixes[match.group(1)]:
+                found.setdefault(keyword, None)
+        return list(found)
+
+
+def _load_keyword_overrides():
+    """Optional JSON file with "positive", "negative" and/or "fake_phrases" lists"""
+    if not config.KEYWORDS_FILE:
+        return {}
+    try:
+        with open(config.KEYWORDS_FILE, encoding="utf-8") as f:
+            overrides = json.load(f)
+        print(f"✅ Keyword lists loaded from {config.KEYWORDS_FILE}")
+        return overrides
+    except Exception as e:
+        print(f"❌ Error loading keyword lists: {e}")
+        return {}
+
+
+_overrides = _load_keyword_overrides()
+
+# Matchers are compiled once at import time
+POSITIVE_MATCHER = KeywordMatcher(_overrides.get("positive", POSITIVE_KEYWORDS))
+NEGATIVE_MATCHER = KeywordMatcher(_overrides.get("negative", NEGATIVE_KEYWORDS))
+FAKE_PHRASE_MATCHER = KeywordMatcher(_overrides.get("fake_phrases", FAKE_PHRASES))
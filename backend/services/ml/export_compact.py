@@ -0,0 +1,47 @@
+# backend/services/ml/export_compact.py
+# Export the joblib models to the compact NumPy format (services/compact.py)
+#
+#   python backend/services/ml/export_compact.py
+import argparse
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, BACKEND_DIR)
+
+import joblib
+from services import config
+from services.compact import export_compact
+
+MODELS = {
+    "sentiment": (config.SENTIMENT_MODEL_PATH, config.SENTIMENT_VECTORIZER_PATH),
+    "fake": (config.FAKE_MODEL_PATH, config.FAKE_VECTORIZER_PATH),
+}
+
+
+def export_model(name, model_path, vectorizer_path, compact_dir=None):
+    """Convert one pickled vectorizer/model pair; returns the output directory"""
+    out_dir = os.path.join(compact_dir or config.COMPACT_MODEL_DIR, name)
+    meta = export_compact(joblib.load(vectorizer_path), joblib.load(model_path), out_dir)
+    size_kb = sum(os.path.getsize(os.path.join(out_dir, f)) for f in os.listdir(out_dir)) / 1024
+    print(f"💾 {name}: {meta['kind']} model, {meta['n_features']} features -> {out_dir} ({size_kb:.0f} KB)")
+    return out_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export trained models to the compact NumPy format")
+    parser.add_argument("models", nargs="*", default=list(MODELS), help=f"models to export ({', '.join(MODELS)})")
+    parser.add_argument("--output", help=f"output directory (default {config.COMPACT_MODEL_DIR})")
+    args = parser.parse_args()
+
+    print("📦 Exporting compact models...")
+    for name in args.models:
+        model_path, vectorizer_path = MODELS[name]
+        if not (os.path.exists(model_path) and os.path.exists(vectorizer_path)):
+            print(f"⚠️ {name}: model files not found, train it first")
+            continue
+        export_model(name, model_path, vectorizer_path, args.output)
+
+
+if __name__ == "__main__":
+    main()
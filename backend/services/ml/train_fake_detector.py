@@ -2,11 +2,16 @@
 import pandas as pd
 import joblib
 import os
+import sys
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report
 
+# Paths come from services.config, like the model registry's (independent of the working directory)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from services import config
+
 print("🚀 Training Consia Fake Review Detector...")
 
 # Create fake/real review dataset
@@ -65,10 +70,15 @@ print("\n📊 Classification Report:")
 print(classification_report(y_test, y_pred))
 
 # Save model
-os.makedirs("backend/ml", exist_ok=True)
-joblib.dump(model, "backend/ml/fake_model.pkl")
-joblib.dump(vectorizer, "backend/ml/fake_vectorizer.pkl")
+os.makedirs(os.path.dirname(config.FAKE_MODEL_PATH), exist_ok=True)
+os.makedirs(os.path.dirname(config.FAKE_VECTORIZER_PATH), exist_ok=True)
+joblib.dump(model, config.FAKE_MODEL_PATH)
+joblib.dump(vectorizer, config.FAKE_VECTORIZER_PATH)
 
 print("\n💾 Model saved:")
-print("   - backend/ml/fake_model.pkl")
-print("   - backend/ml/fake_vectorizer.pkl")
\ No newline at end of file
+print(f"   - {config.FAKE_MODEL_PATH}")
+print(f"   - {config.FAKE_VECTORIZER_PATH}")
+
+# Compact NumPy export: loads without scikit-learn and is memory-mapped
+from export_compact import export_model
+export_model("fake", config.FAKE_MODEL_PATH, config.FAKE_VECTORIZER_PATH)
@@ -2,11 +2,16 @@
 import pandas as pd
 import joblib
 import os
+import sys
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, classification_report
 
+# Paths come from services.config, like the model registry's (independent of the working directory)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from services import config
+
 print("🚀 Training Consia ML Sentiment Model...")
 
 # Create sample dataset (you can replace with real dataset later)
@@ -67,13 +72,18 @@ print("\n📊 Classification Report:")
 print(classification_report(y_test, y_pred))
 
 # Save model
-os.makedirs("backend/ml", exist_ok=True)
-joblib.dump(model, "backend/ml/sentiment_model.pkl")
-joblib.dump(vectorizer, "backend/ml/sentiment_vectorizer.pkl")
+os.makedirs(os.path.dirname(config.SENTIMENT_MODEL_PATH), exist_ok=True)
+os.makedirs(os.path.dirname(config.SENTIMENT_VECTORIZER_PATH), exist_ok=True)
+joblib.dump(model, config.SENTIMENT_MODEL_PATH)
+joblib.dump(vectorizer, config.SENTIMENT_VECTORIZER_PATH)
 
 print("\n💾 Model saved:")
-print("   - backend/ml/sentiment_model.pkl")
-print("   - backend/ml/sentiment_vectorizer.pkl")
+print(f"   - {config.SENTIMENT_MODEL_PATH}")
+print(f"   - {config.SENTIMENT_VECTORIZER_PATH}")
+
+# Compact NumPy export: loads without scikit-learn and is memory-mapped
+from export_compact import export_model
+export_model("sentiment", config.SENTIMENT_MODEL_PATH, config.SENTIMENT_VECTORIZER_PATH)
 
 # Test predictions
 print("\n🔍 Sample Predictions:")
@@ -0,0 +1,290 @@
+# backend/services/ml/train_streaming.py
+# Out-of-core training for the sentiment and fake models. Labelled reviews
+# are streamed from JSONL/CSV in chunks, featurized with the stateless
+# HashingFeaturizer (no vocabulary to fit) and fed to an SGD logistic
+# regression with partial_fit, so memory stays flat however large the
+# corpus is. K-fold cross-validation runs its folds in parallel processes,
+# each streaming the file itself. The model is saved as a new version under
+# MODEL_VERSIONS_DIR (services/model_store.py) and activated for the
+# registry; serving it needs only NumPy.
+#
+#   python backend/services/ml/train_streaming.py sentiment labelled_reviews.jsonl
+#   python backend/services/ml/train_streaming.py fake labelled.csv --cv 5 --epochs 3
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import time
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, BACKEND_DIR)
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from sklearn.linear_model import SGDClassifier
+from services.bulk import INPUT_FORMATS, detect_format, read_rows
+from services.compact import HashingFeaturizer, export_compact, token_hash
+from services.model_store import activate_version, new_version, version_dir
+
+CLASSES = np.array([0, 1])
+
+# Text labels accepted besides 0/1 (1 = positive / fake)
+LABEL_ALIASES = {
+    "sentiment": {"positive": 1, "pos": 1, "negative": 0, "neg": 0},
+    "fake": {"fake": 1, "spam": 1, "real": 0, "genuine": 0},
+}
+
+
+def parse_label(value, aliases):
+    """0/1 label from a row value, or None for anything else (e.g. neutral)"""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return int(value) if value in (0, 1) else None
+    value = str(value or "").strip().lower()
+    if value in ("0", "1"):
+        return int(value)
+    return aliases.get(value)
+
+
+def fold_of(text, folds):
+    # Stable across runs and processes, so every fold sees the same split
+    return token_hash(text) % folds
+
+
+def labelled_chunks(settings, fold=None, holdout=False, seed=0, stats=None):
+    """Yield (texts, labels) chunks from the training file.
+
+    With ``fold`` set, rows of that fold are skipped (training) or are the
+    only ones kept (``holdout``). Each chunk is shuffled in memory.
+    """
+    aliases = LABEL_ALIASES[settings["model"]]
+    rng = random.Random(seed)
+    texts, labels = [], []
+    for row, _ in read_rows(settings["input"], settings["input_format"]):
+        if isinstance(row, Exception):
+            if stats is not None:
+                stats["skipped"] += 1
+            continue
+        text = row.get(settings["text_field"])
+        label = parse_label(row.get(settings["label_field"]), aliases)
+        if not text or label is None:
+            if stats is not None:
+                stats["skipped"] += 1
+            continue
+        if fold is not None and (fold_of(text, settings["cv"]) == fold) != holdout:
+            continue
+        texts.append(text)
+        labels.append(label)
+        if len(texts) >= settings["chunk_size"]:
+            yield _shuffled(texts, labels, rng)
+            texts, labels = [], []
+    if texts:
+        yield _shuffled(texts, labels, rng)
+
+
+def _shuffled(texts, labels, rng):
+    order = list(range(len(texts)))
+    rng.shuffle(order)
+    return [texts[i] for i in order], np.array([labels[i] for i in order])
+
+
+def make_featurizer(settings):
+    return HashingFeaturizer(
+        n_features=2 ** settings["hash_bits"],
+        stop_words=ENGLISH_STOP_WORDS if settings["stop_words"] else (),
+        sublinear_tf=settings["sublinear_tf"]
+    )
+
+
+def make_model(settings):
+    return SGDClassifier(loss="log_loss", alpha=settings["alpha"], average=settings["average"],
+                         random_state=settings["seed"])
+
+
+def featurize(featurizer, texts):
+    rows = featurizer.transform(texts)
+    return csr_matrix((rows.data, rows.indices, rows.indptr), shape=rows.shape)
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process and of its finished children"""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return own / 1024, children / 1024  # ru_maxrss is in KB on Linux
+
+
+def fit_stream(settings, fold=None, log=True):
+    """Train a model over the stream (all epochs); returns (featurizer, model, stats)"""
+    featurizer = make_featurizer(settings)
+    model = make_model(settings)
+    stats = {"rows": 0, "skipped": 0, "seconds": 0.0}
+    for epoch in range(settings["epochs"]):
+        start = time.perf_counter()
+        epoch_stats = {"skipped": 0}
+        rows = 0
+        last_log = start
+        for texts, labels in labelled_chunks(settings, fold, seed=settings["seed"] + epoch, stats=epoch_stats):
+            model.partial_fit(featurize(featurizer, texts), labels, classes=CLASSES)
+            rows += len(texts)
+            now = time.perf_counter()
+            if log and now - last_log >= settings["log_interval"]:
+                last_log = now
+                print(f"   epoch {epoch + 1}: {rows:,} rows, {rows / (now - start):,.0f} rows/s, "
+                      f"peak {peak_memory_mb()[0]:.0f} MB")
+        seconds = time.perf_counter() - start
+        stats["rows"] = rows
+        stats["skipped"] = epoch_stats["skipped"]
+        stats["seconds"] += seconds
+        if log:
+            print(f"📈 Epoch {epoch + 1}/{settings['epochs']}: {rows:,} rows in {seconds:.1f}s "
+                  f"({rows / max(seconds, 1e-9):,.0f} rows/s), peak {peak_memory_mb()[0]:.0f} MB")
+    if stats["rows"] == 0:
+        raise ValueError("No labelled rows to train on")
+    return featurizer, model, stats
+
+
+def evaluate_stream(settings, featurizer, model, fold):
+    """Accuracy, precision/recall/F1 (class 1) and log loss on one held-out fold"""
+    confusion = np.zeros((2, 2), dtype=np.int64)  # [true label, predicted label]
+    log_loss = 0.0
+    for texts, labels in labelled_chunks(settings, fold, holdout=True):
+        proba = model.predict_proba(featurize(featurizer, texts))[:, 1]
+        predicted = (proba >= 0.5).astype(np.int64)
+        np.add.at(confusion, (labels, predicted), 1)
+        p = np.clip(np.where(labels == 1, proba, 1 - proba), 1e-15, 1.0)
+        log_loss -= float(np.log(p).sum())
+
+    total = int(confusion.sum())
+    tp, fp, fn = confusion[1, 1], confusion[0, 1], confusion[1, 0]
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    return {
+        "rows": total,
+        "accuracy": float(np.trace(confusion) / total) if total else 0.0,
+        "precision": float(precision),
+        "recall": float(recall),
+        "f1": float(2 * precision * recall / (precision + recall)) if precision + recall else 0.0,
+        "log_loss": log_loss / total if total else 0.0,
+    }
+
+
+def _run_fold(job):
+    settings, fold = job
+    start = time.perf_counter()
+    featurizer, model, stats = fit_stream(settings, fold, log=False)
+    metrics = evaluate_stream(settings, featurizer, model, fold)
+    metrics["train_rows_per_s"] = stats["rows"] * settings["epochs"] / max(stats["seconds"], 1e-9)
+    metrics["seconds"] = time.perf_counter() - start
+    metrics["peak_memory_mb"] = peak_memory_mb()[0]
+    return fold, metrics
+
+
+def cross_validate(settings):
+    """K-fold CV, folds trained and evaluated in parallel; returns per-fold metrics and their mean"""
+    folds = settings["cv"]
+    jobs = max(1, min(settings["jobs"], folds))
+    print(f"🔁 {folds}-fold cross-validation on {jobs} process(es)...")
+    work = [(settings, fold) for fold in range(folds)]
+    if jobs > 1:
+        with multiprocessing.Pool(jobs) as pool:
+            results = pool.map(_run_fold, work)
+    else:
+        results = [_run_fold(job) for job in work]
+
+    per_fold = [metrics for _, metrics in sorted(results, key=lambda result: result[0])]
+    for fold, metrics in enumerate(per_fold):
+        print(f"   fold {fold + 1}: accuracy {metrics['accuracy']:.2%}, F1 {metrics['f1']:.3f}, "
+              f"{metrics['rows']:,} held out, {metrics['train_rows_per_s']:,.0f} rows/s, "
+              f"peak {metrics['peak_memory_mb']:.0f} MB")
+    summary = {}
+    for key in ("accuracy", "precision", "recall", "f1", "log_loss"):
+        values = [metrics[key] for metrics in per_fold]
+        summary[key] = round(float(np.mean(values)), 4)
+        summary[key + "_std"] = round(float(np.std(values)), 4)
+    print(f"✅ CV accuracy {summary['accuracy']:.2%} ± {summary['accuracy_std']:.2%}, "
+          f"F1 {summary['f1']:.3f} ± {summary['f1_std']:.3f}")
+    return {"folds": per_fold, "mean": summary}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream-train a sentiment or fake review model")
+    parser.add_argument("model", choices=sorted(LABEL_ALIASES), help="which model to train")
+    parser.add_argument("input", help="labelled JSONL or CSV file")
+    parser.add_argument("--input-format", choices=INPUT_FORMATS, help="default: from the file extension")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--label-field", default="label", help="0/1 (1 = positive / fake) or text labels")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="rows per partial_fit call")
+    parser.add_argument("--epochs", type=int, default=2, help="passes over the file")
+    parser.add_argument("--hash-bits", type=int, default=18, help="2**bits hashed features")
+    parser.add_argument("--alpha", type=float, default=1e-5, help="L2 regularization strength")
+    parser.add_argument("--average", action="store_true", help="averaged SGD (smoother on noisy streams)")
+    parser.add_argument("--sublinear-tf", action="store_true", help="1 + log(tf) term weights")
+    parser.add_argument("--keep-stop-words", action="store_true", help="do not drop English stop words")
+    parser.add_argument("--cv", type=int, default=5, help="cross-validation folds (0 = skip)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="parallel CV processes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--log-interval", type=float, default=10.0, help="seconds between progress lines")
+    parser.add_argument("--no-activate", action="store_true", help="save the version without making it current")
+    args = parser.parse_args()
+
+    settings = {
+        "model": args.model,
+        "input": os.path.abspath(args.input),
+        "input_format": args.input_format or detect_format(args.input, INPUT_FORMATS),
+        "text_field": args.text_field,
+        "label_field": args.label_field,
+        "chunk_size": args.chunk_size,
+        "epochs": args.epochs,
+        "hash_bits": args.hash_bits,
+        "alpha": args.alpha,
+        "average": args.average,
+        "sublinear_tf": args.sublinear_tf,
+        "stop_words": not args.keep_stop_words,
+        "cv": args.cv,
+        "jobs": args.jobs,
+        "seed": args.seed,
+        "log_interval": args.log_interval,
+    }
+
+    print(f"🚀 Streaming training: {args.model} model from {args.input}")
+    started = time.perf_counter()
+    evaluation = cross_validate(settings) if args.cv > 1 else None
+
+    print("🏋️ Training on the full stream...")
+    featurizer, model, stats = fit_stream(settings)
+
+    version = new_version()
+    out_dir = version_dir(args.model, version)
+    export_compact(featurizer, model, out_dir, extra_meta={
+        "version": version,
+        "trained_at": datetime.now().isoformat(),
+        "training": {
+            "input": settings["input"],
+            "rows": stats["rows"],
+            "skipped_rows": stats["skipped"],
+            "epochs": args.epochs,
+            "hash_bits": args.hash_bits,
+            "alpha": args.alpha,
+            "average": args.average,
+            "rows_per_s": round(stats["rows"] * args.epochs / max(stats["seconds"], 1e-9), 1),
+        },
+        "evaluation": evaluation["mean"] if evaluation else None,
+    })
+    size_kb = sum(os.path.getsize(os.path.join(out_dir, f)) for f in os.listdir(out_dir)) / 1024
+    print(f"💾 Saved {args.model} version {version} -> {out_dir} ({size_kb:.0f} KB)")
+    if not args.no_activate:
+        activate_version(args.model, version)
+        print(f"✅ Activated {args.model} version {version}")
+
+    own, children = peak_memory_mb()
+    print(f"⏱️ {stats['rows']:,} rows ({stats['skipped']:,} skipped), total {time.perf_counter() - started:.1f}s, "
+          f"peak memory {own:.0f} MB (CV workers {children:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
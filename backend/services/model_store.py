@@ -0,0 +1,59 @@
+# backend/services/model_store.py - VERSIONED MODEL ARTIFACTS
+# Trained models are kept side by side as compact exports, one directory
+# per version, and a CURRENT file names the version the registry loads:
+#
+#   <MODEL_VERSIONS_DIR>/<name>/<version>/meta.json, *.npy
+#   <MODEL_VERSIONS_DIR>/<name>/CURRENT
+#
+# Activating (or rolling back to) a version rewrites CURRENT atomically.
+import os
+from datetime import datetime
+from services import config
+from services.compact import META_FILE
+
+CURRENT_FILE = "CURRENT"
+
+
+def model_dir(name):
+    return os.path.join(config.MODEL_VERSIONS_DIR, name)
+
+
+def version_dir(name, version):
+    return os.path.join(model_dir(name), version)
+
+
+def new_version():
+    """Version id for a new artifact: sortable timestamp"""
+    return datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+
+
+def list_versions(name):
+    """Complete (exported) versions of ``name``, oldest first"""
+    try:
+        entries = os.listdir(model_dir(name))
+    except FileNotFoundError:
+        return []
+    return sorted(
+        entry for entry in entries
+        if os.path.exists(os.path.join(model_dir(name), entry, META_FILE))
+    )
+
+
+def active_version(name):
+    """The version CURRENT points to, or None"""
+    try:
+        with open(os.path.join(model_dir(name), CURRENT_FILE), encoding="utf-8") as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return version or None
+
+
+def activate_version(name, version):
+    """Point CURRENT at ``version`` (atomic: readers see the old or the new one)"""
+    if not os.path.exists(os.path.join(version_dir(name, version), META_FILE)):
+        raise ValueError(f"No such {name} model version: {version}")
+    pointer = os.path.join(model_dir(name), CURRENT_FILE)
+    with open(pointer + ".tmp", "w", encoding="utf-8") as f:
+        f.write(version + "\n")
+    os.replace(pointer + ".tmp", pointer)
@@ -0,0 +1,287 @@
+# backend/services/models.py - MODEL REGISTRY
+# Models load lazily, once per process. A new version can be swapped in
+# without a restart: reload() loads and warms it off the request path and
+# replaces the serving model in one reference assignment, so a request
+# (which takes one snapshot per batch) sees either the old or the new
+# model. If the candidate fails to load or to score the smoke batch, the
+# old one keeps serving. A serving process also follows the model store's
+# CURRENT pointer from one watcher thread started at server startup
+# (checked every CONSIA_MODEL_WATCH_INTERVAL seconds).
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+from datetime import datetime
+import numpy as np
+from services import config
+from services.compact import META_FILE, compact_files, load_compact
+from services.model_store import activate_version, active_version, list_versions, version_dir
+from services.scorer import LinearScorer
+
+# Scored by every reloaded model before it serves (and warms its caches)
+SMOKE_BATCH = (
+    "Great product, very happy with the purchase",
+    "Poor quality, stopped working after a week",
+    "It arrived on Tuesday in a brown box",
+    "Best product ever!!! Must buy!!",
+    "",
+) * 8
+
+
+def model_version(*paths):
+    """Short version tag for model files, derived from their size and mtime"""
+    stamp = hashlib.sha256()
+    for path in paths:
+        stat = os.stat(path)
+        stamp.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns};".encode("utf-8"))
+    return stamp.hexdigest()[:12]
+
+
+class LoadedModel:
+    """A vectorizer/model pair as loaded from disk (never mutated after loading)"""
+
+    def __init__(self, name, model_path, vectorizer_path, model=None, vectorizer=None,
+                 version=None, load_time_ms=0.0, error=None, model_format=None):
+        self.name = name
+        self.model_format = model_format  # "compact" or "pickle"
+        self.model_path = model_path
+        self.vectorizer_path = vectorizer_path
+        self.model = model
+        self.vectorizer = vectorizer
+        self.version = version
+        self.load_time_ms = load_time_ms
+        self.loaded_at = datetime.now().isoformat()
+        self.error = error
+        # Fast batched path for linear models (None = generic transform + predict_proba)
+        self.scorer = None
+        if self.loaded and config.FAST_SCORER:
+            self.scorer = LinearScorer.build(vectorizer, model)
+
+    @property
+    def loaded(self):
+        return self.model is not None and self.vectorizer is not None
+
+    def predict_proba(self, texts):
+        """Class probabilities for raw texts (columns follow ``model.classes_``)"""
+        if self.scorer is not None:
+            return self.scorer.predict_proba(texts)
+        return self.model.predict_proba(self.vectorizer.transform(texts))
+
+    def status(self):
+        return {
+            "loaded": self.loaded,
+            "format": self.model_format,
+            "fast_scorer": self.scorer is not None,
+            "version": self.version,
+            "load_time_ms": round(self.load_time_ms, 2),
+            "loaded_at": self.loaded_at,
+            "model_path": self.model_path,
+            "error": self.error
+        }
+
+
+def smoke_test(loaded):
+    """None if ``loaded`` scores SMOKE_BATCH sanely, else the problem"""
+    try:
+        probas = np.asarray(loaded.predict_proba(list(SMOKE_BATCH)), dtype=float)
+    except Exception as e:
+        return f"Smoke batch failed: {e}"
+    if probas.shape != (len(SMOKE_BATCH), len(loaded.model.classes_)):
+        return f"Smoke batch returned shape {probas.shape}"
+    if not np.isfinite(probas).all() or not np.allclose(probas.sum(axis=1), 1.0, atol=1e-6):
+        return "Smoke batch returned invalid probabilities"
+    return None
+
+
+class ModelRegistry:
+    """Loads each model lazily on first use and swaps in new versions on reload"""
+
+    def __init__(self, specs):
+        self.specs = specs  # name -> (label, model_path, vectorizer_path, compact_dir)
+        self._models = {}
+        self._lock = threading.Lock()
+        # Serializes reload() and the watcher's checks (which reload)
+        self._reload_lock = threading.RLock()
+        self._reloads = {}  # name -> outcome of the last reload
+        self._rejected = {}  # name -> version that failed, not retried by the watch
+        self._watcher = None
+
+    def get(self, name):
+        """The LoadedModel for ``name``, loading it on first use"""
+        loaded = self._models.get(name)
+        if loaded is not None:
+            return loaded
+        
+        with self._lock:
+            # Another thread may have finished loading while we waited
+            if name not in self._models:
+                self._models[name] = self._load(name)
+            return self._models[name]
+
+    def _load(self, name, version=None):
+        label, model_path, vectorizer_path, compact_dir = self.specs[name]
+        start = time.perf_counter()
+        try:
+            # A trained, activated version (services.model_store) wins over the exports below
+            if version is None and config.MODEL_FORMAT != "pickle":
+                version = active_version(name)
+            if version is not None:
+                if version not in list_versions(name):
+                    raise ValueError(f"No such version: {version}")
+                directory = version_dir(name, version)
+                vectorizer, model = load_compact(directory)
+                load_time_ms = (time.perf_counter() - start) * 1000
+                loaded = LoadedModel(name, directory, directory, model, vectorizer,
+                                     version=version,
+                                     load_time_ms=load_time_ms, model_format="compact")
+                print(f"✅ {label} loaded, version {version} ({load_time_ms:.0f} ms)")
+                return loaded
+            if self._use_compact(compact_dir):
+                vectorizer, model = load_compact(compact_dir)
+                load_time_ms = (time.perf_counter() - start) * 1000
+                loaded = LoadedModel(name, compact_dir, compact_dir, model, vectorizer,
+                                     version=model_version(*compact_files(compact_dir)),
+                                     load_time_ms=load_time_ms, model_format="compact")
+                print(f"✅ {label} loaded, compact format ({load_time_ms:.0f} ms)")
+                return loaded
+            if os.path.exists(model_path) and os.path.exists(vectorizer_path):
+                # Imported here: unpickling pulls in scikit-learn, which the compact format avoids
+                import joblib
+                model = joblib.load(model_path)
+                vectorizer = joblib.load(vectorizer_path)
+                load_time_ms = (time.perf_counter() - start) * 1000
+                loaded = LoadedModel(name, model_path, vectorizer_path, model, vectorizer,
+                                     version=model_version(model_path, vectorizer_path),
+                                     load_time_ms=load_time_ms, model_format="pickle")
+                print(f"✅ {label} loaded ({load_time_ms:.0f} ms)")
+                return loaded
+            error = "Model files not found"
+        except Exception as e:
+            print(f"❌ Error loading {label}: {e}")
+            error = str(e)
+        
+        return LoadedModel(name, model_path, vectorizer_path, error=error,
+                           load_time_ms=(time.perf_counter() - start) * 1000)
+
+    @staticmethod
+    def _use_compact(compact_dir):
+        if config.MODEL_FORMAT == "pickle":
+            return False
+        # "compact" insists on it (a missing export is a load error); "auto" falls back to pickles
+        return config.MODEL_FORMAT == "compact" or os.path.exists(os.path.join(compact_dir, META_FILE))
+
+    def reload(self, name, version=None):
+        """Load ``name`` again and swap it in if it passes the smoke batch.
+
+        ``version`` picks a version from the model store (and activates it
+        for the other processes); by default whatever a fresh process would
+        load. On failure the serving model is kept, and a CURRENT pointer
+        that names the failed version is rolled back to the serving one.
+        """
+        label = self.specs[name][0]
+        with self._reload_lock:
+            previous = self._models.get(name)
+            previous_version = previous.version if previous is not None else None
+            attempted = version or (active_version(name) if config.MODEL_FORMAT != "pickle" else None)
+            candidate = self._load(name, attempted)
+            start = time.perf_counter()
+            error = candidate.error or smoke_test(candidate)
+            warm_ms = (time.perf_counter() - start) * 1000
+            outcome = {
+                "success": error is None,
+                "version": candidate.version or attempted,
+                "previous_version": previous_version,
+                "load_time_ms": round(candidate.load_time_ms, 2),
+                "warm_ms": round(warm_ms, 2),
+                "at": datetime.now().isoformat(),
+                "error": error
+            }
+            self._reloads[name] = outcome
+
+            if error is None:
+                self._models[name] = candidate
+                self._rejected.pop(name, None)
+                if version is not None and active_version(name) != version:
+                    activate_version(name, version)
+                print(f"🔄 {label} swapped in, version {candidate.version} (was {previous_version})")
+            else:
+                self._rejected[name] = attempted
+                self._restore_pointer(name, attempted, previous_version)
+                print(f"❌ {label} reload failed, still serving {previous_version}: {error}")
+            return outcome
+
+    @staticmethod
+    def _restore_pointer(name, failed, serving):
+        # Point CURRENT back at the serving version so restarts don't load the failed one
+        if failed is not None and active_version(name) == failed and serving in list_versions(name):
+            activate_version(name, serving)
+
+    def check_for_updates(self):
+        """Reload every loaded model whose active version (CURRENT) changed"""
+        with self._reload_lock:
+            for name in self.specs:
+                serving = self._models.get(name)
+                if serving is None:
+                    continue  # not loaded yet: the first get() loads the active version
+                version = active_version(name)
+                if version is None or version == serving.version:
+                    continue
+                if version == self._rejected.get(name):
+                    self._restore_pointer(name, version, serving.version)
+                else:
+                    self.reload(name, version)
+
+    def start_watcher(self):
+        """Check CURRENT every MODEL_WATCH_INTERVAL seconds from one background thread.
+
+        Called once at server startup (repeat calls are no-ops), so only
+        serving processes watch, never offline tools. Batch workers, which
+        re-import the server's main module, never start one.
+        """
+        interval = config.MODEL_WATCH_INTERVAL
+        if multiprocessing.parent_process() is not None:
+            return None
+        with self._lock:
+            if interval > 0 and self._watcher is None:
+                self._watcher = threading.Thread(target=self._watch, args=(interval,),
+                                                 name="consia-model-watch", daemon=True)
+                self._watcher.start()
+            return self._watcher
+
+    def _watch(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                self.check_for_updates()
+            except Exception as e:
+                print(f"⚠️ Model watch check failed: {e}")
+
+    def warm_up(self):
+        """Eagerly load every registered model (e.g. before forking workers)"""
+        return all(self.get(name).loaded for name in self.specs)
+
+    def versions(self):
+        """name -> serving version (None until loaded; does not trigger loading); results depend on these"""
+        versions = {}
+        for name in self.specs:
+            loaded = self._models.get(name)
+            versions[name] = loaded.version if loaded is not None else None
+        return versions
+
+    def status(self):
+        """Per-model load status for /health (does not trigger loading)"""
+        status = {}
+        for name in self.specs:
+            status[name] = self._models[name].status() if name in self._models else {"loaded": False, "pending": True}
+            if name in self._reloads:
+                status[name]["last_reload"] = self._reloads[name]
+        return status
+
+
+model_registry = ModelRegistry({
+    "sentiment": ("ML Sentiment model", config.SENTIMENT_MODEL_PATH, config.SENTIMENT_VECTORIZER_PATH,
+                  os.path.join(config.COMPACT_MODEL_DIR, "sentiment")),
+    "fake": ("Fake detection model", config.FAKE_MODEL_PATH, config.FAKE_VECTORIZER_PATH,
+             os.path.join(config.COMPACT_MODEL_DIR, "fake")),
+})
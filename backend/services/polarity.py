@@ -0,0 +1,196 @@
+# backend/services/polarity.py - POLARITY ENGINES
+# Review/sentence polarity in [-1, 1] for the TextBlob fallback sentiment and
+# the pros/cons sentence filter. "lexicon" compiles TextBlob's own adjective
+# lexicon (en-sentiment.xml) into a single dict once and scores with the
+# same negation / intensifier / exclamation rules as TextBlob's pattern
+# analyzer, without its tokenizer and per-call object overhead.
+# "textblob" keeps the original implementation and is the default; the
+# lexicon engine is opt-in (CONSIA_POLARITY_ENGINE=lexicon). Known
+# deviation: it negates contracted forms ("isn't great" scores -0.4, where
+# TextBlob's tokenizer misses the negation and gives +0.8).
+import importlib.util
+import os
+import re
+import threading
+import xml.etree.ElementTree as ElementTree
+from statistics import fmean
+from services import config
+
+NEGATIONS = frozenset((
+    "no", "not", "n't", "never",
+    # Apostrophe-less contractions, common in reviews
+    "dont", "doesnt", "didnt", "isnt", "wasnt", "arent", "werent", "cant", "wont", "couldnt", "shouldnt"
+))
+
+# Emoticon polarities (same scores as TextBlob's pattern analyzer)
+EMOTICONS = {
+    "<3": 1.0, "♥": 1.0, ":d": 1.0, ":-d": 1.0, "=d": 1.0, "xd": 1.0,
+    ":p": 0.75, ":-p": 0.75,
+    ":)": 0.5, ":-)": 0.5, "=)": 0.5, ":]": 0.5, "(:": 0.5,
+    ";)": 0.25, ";-)": 0.25,
+    ":o": 0.05, ":-o": 0.05,
+    ":/": -0.25, ":-/": -0.25, ":s": -0.25,
+    ":(": -0.75, ":-(": -0.75, "=(": -0.75, ":[": -0.75, "):": -0.75,
+    ":'(": -1.0,
+}
+
+TOKEN = re.compile(
+    "|".join(re.escape(emoticon) for emoticon in sorted(EMOTICONS, key=len, reverse=True))
+    + r"|\w+(?=n't)|n't|\w+(?:-\w+)*|\(!\)|!"
+)
+
+
+def default_lexicon_path():
+    """en-sentiment.xml shipped with TextBlob (located without importing it)"""
+    spec = importlib.util.find_spec("textblob")
+    if spec is None or not spec.submodule_search_locations:
+        return ""
+    return os.path.join(list(spec.submodule_search_locations)[0], "en", "en-sentiment.xml")
+
+
+class LexiconPolarity:
+    """Lexicon polarity scorer compiled from an en-sentiment.xml style file.
+
+    ``lexicon`` maps each word to (polarity, intensity, is_modifier), where
+    modifiers are adverbs that scale the next known word ("very good").
+    """
+
+    name = "lexicon"
+
+    def __init__(self, path=None):
+        self.path = path or config.POLARITY_LEXICON or default_lexicon_path()
+        self.lexicon = self._load()
+        self.version = f"lexicon-{len(self.lexicon)}"
+
+    def _load(self):
+        # word -> pos -> [(polarity, intensity), ...] for every listed sense
+        senses = {}
+        for word in ElementTree.parse(self.path).getroot().iter("word"):
+            form = word.attrib.get("form")
+            if form:
+                senses.setdefault(form, {}).setdefault(word.attrib.get("pos"), []).append((
+                    float(word.attrib.get("polarity", 0.0)),
+                    float(word.attrib.get("intensity", 1.0))
+                ))
+
+        entries = {}
+        adjectives = {}
+        for form, by_pos in senses.items():
+            # Average the senses per part of speech, then across parts of speech
+            per_pos = {pos: tuple(map(fmean, zip(*values))) for pos, values in by_pos.items()}
+            polarity, intensity = map(fmean, zip(*per_pos.values()))
+            entries[form] = (polarity, intensity, "RB" in per_pos)
+            if "JJ" in per_pos:
+                adjectives[form] = per_pos["JJ"]
+
+        # Adverbs derived from adjectives ("terrible" -> "terribly"), as TextBlob does
+        for form, (polarity, intensity) in adjectives.items():
+            stem = form[:-1] + "i" if form.endswith("y") else form
+            stem = stem[:-2] if stem.endswith("le") else stem
+            entries[stem + "ly"] = (polarity, intensity, True)
+
+        return entries
+
+    def tokens(self, text):
+        return TOKEN.findall(text.lower())
+
+    def score(self, text):
+        """Polarity of one text in [-1, 1] (0.0 when no sentiment words are found)"""
+        lexicon = self.lexicon
+
+        # Assessments: [polarity, intensity, negated] per (modified) known word
+        assessments = []
+        modifier = None  # preceding intensifier ("very good")
+        negation = None  # preceding negation ("not good")
+        for word in self.tokens(text):
+            entry = lexicon.get(word)
+            if entry is not None:
+                polarity, intensity, is_modifier = entry
+                if modifier is None:
+                    assessments.append([polarity, intensity, False])
+                else:
+                    # "very good": the intensifier scales the word it modifies
+                    last = assessments[-1]
+                    last[0] = max(-1.0, min(polarity * last[1], 1.0))
+                    last[1] = intensity
+                if negation is not None:
+                    last = assessments[-1]
+                    last[1] = 1.0 / last[1] if last[1] else 1.0
+                    last[2] = True
+                modifier = word if is_modifier else None
+                negation = word if word in NEGATIONS else None
+                continue
+
+            if word in NEGATIONS:
+                negation = word
+            elif negation and len(word.strip("'")) > 1:
+                # Negation carries across small words only ("not a good")
+                negation = None
+            if negation is not None and modifier is not None and modifier.endswith("ly"):
+                # "really not good"
+                assessments[-1][2] = True
+                negation = None
+            elif modifier and len(word) > 2:
+                modifier = None
+
+            if word == "!" and assessments:
+                # Exclamation marks boost the previous word
+                assessments[-1][0] = max(-1.0, min(assessments[-1][0] * 1.25, 1.0))
+            elif word == "(!)":
+                assessments.append([0.0, 1.0, False])  # sarcasm
+            elif word in EMOTICONS:
+                assessments.append([EMOTICONS[word], 1.0, False])
+
+        if not assessments:
+            return 0.0
+        # "not good" = slightly bad, "not bad" = slightly good
+        return float(sum(p * -0.5 if negated else p for p, _, negated in assessments) / len(assessments))
+
+    def score_batch(self, texts):
+        """Polarities for many texts in one call"""
+        return [self.score(text) for text in texts]
+
+
+class TextBlobPolarity:
+    """TextBlob's pattern analyzer (the original implementation)"""
+
+    name = "textblob"
+    version = "textblob"
+
+    def __init__(self):
+        from textblob import TextBlob  # imported only when this engine is used
+        self._textblob = TextBlob
+
+    def score(self, text):
+        return self._textblob(text).sentiment.polarity
+
+    def score_batch(self, texts):
+        return [self.score(text) for text in texts]
+
+
+ENGINES = {
+    "lexicon": LexiconPolarity,
+    "textblob": TextBlobPolarity,
+}
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """The configured polarity engine (built once per process)"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine_class = ENGINES.get(config.POLARITY_ENGINE)
+                if engine_class is None:
+                    print(f"⚠️ Unknown polarity engine {config.POLARITY_ENGINE!r}, using textblob")
+                    engine_class = TextBlobPolarity
+                try:
+                    _engine = engine_class()
+                except Exception as e:
+                    # e.g. no lexicon file: the TextBlob engine still works
+                    print(f"❌ Polarity engine {engine_class.name} unavailable ({e}), using textblob")
+                    _engine = TextBlobPolarity()
+    return _engine
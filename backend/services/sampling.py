@@ -0,0 +1,121 @@
+# backend/services/sampling.py - BOUNDED-WORK SAMPLING
+# Huge listings are scored on a random sample of at most SAMPLE_BUDGET
+# reviews, and the reported percentages come with confidence intervals.
+import math
+import random
+from services import config
+from services.corpus import ReviewCorpus, ReviewDoc
+
+# Review length strata (in words) for stratified sampling: very short
+# reviews and long ones behave differently (spam is usually short)
+LENGTH_STRATA = (5, 20, 60)
+
+
+def _rng(population):
+    # Deterministic per review-set size, so identical payloads give identical results
+    return random.Random(f"{config.SAMPLE_SEED}:{population}")
+
+
+def _length_stratum(doc):
+    words = len(doc.words)
+    for i, bound in enumerate(LENGTH_STRATA):
+        if words < bound:
+            return i
+    return len(LENGTH_STRATA)
+
+
+def reservoir_sample(docs, budget, rng):
+    """Indices of a uniform random sample (Algorithm R), in input order"""
+    reservoir = []
+    for i in range(len(docs)):
+        if i < budget:
+            reservoir.append(i)
+        else:
+            j = rng.randint(0, i)
+            if j < budget:
+                reservoir[j] = i
+    return sorted(reservoir)
+
+
+def random_sample(docs, budget, rng):
+    """Indices of a uniform random sample drawn directly (O(budget)), in input order"""
+    return sorted(rng.sample(range(len(docs)), budget))
+
+
+def stratified_sample(docs, budget, rng):
+    """Indices of a sample stratified by review length, in input order.
+    
+    Allocation is proportional to stratum size (largest remainder), so the
+    sample stays self-weighting and plain sample percentages are unbiased.
+    """
+    strata = {}
+    for i, doc in enumerate(docs):
+        strata.setdefault(_length_stratum(doc), []).append(i)
+    
+    quotas = {key: budget * len(members) / len(docs) for key, members in strata.items()}
+    allocation = {key: int(quota) for key, quota in quotas.items()}
+    leftover = budget - sum(allocation.values())
+    for key in sorted(quotas, key=lambda key: quotas[key] - allocation[key], reverse=True)[:leftover]:
+        allocation[key] += 1
+    
+    chosen = []
+    for key, members in strata.items():
+        chosen.extend(rng.sample(members, allocation[key]))
+    return sorted(chosen)
+
+
+STRATEGIES = {
+    "stratified": stratified_sample,
+    "reservoir": reservoir_sample,
+    "random": random_sample,
+}
+
+
+def sample_corpus(corpus, budget=None, strategy=None):
+    """At most ``budget`` reviews of ``corpus`` (the corpus itself if it already fits).
+    
+    Idempotent: sampling a sample that fits the budget returns it unchanged,
+    so every scorer can call this on whatever corpus it is given.
+    """
+    corpus = ReviewCorpus.ensure(corpus)
+    budget = config.SAMPLE_BUDGET if budget is None else budget
+    if budget <= 0 or len(corpus) <= budget:
+        return corpus
+    
+    strategy = strategy or config.SAMPLE_STRATEGY
+    sampler = STRATEGIES.get(strategy, stratified_sample)
+    indices = sampler(corpus.docs, budget, _rng(corpus.population))
+    weights = [corpus.weights[i] for i in indices] if corpus.weights is not None else None
+    return ReviewCorpus.from_docs([corpus.docs[i] for i in indices], corpus.population, weights)
+
+
+def sample_reviews(reviews, budget=None):
+    """sample_corpus(ReviewCorpus(reviews), budget, "random"), parsing only the reviews kept"""
+    budget = config.SAMPLE_BUDGET if budget is None else budget
+    if budget <= 0 or len(reviews) <= budget:
+        return ReviewCorpus(reviews)
+    indices = random_sample(reviews, budget, _rng(len(reviews)))
+    return ReviewCorpus.from_docs([ReviewDoc(reviews[i]) for i in indices], len(reviews))
+
+
+def proportion_interval(successes, n, population, z=None):
+    """Wilson score interval (in percent) for a proportion estimated from a sample.
+    
+    Uses a finite population correction, so the interval collapses to the
+    point estimate when the whole population was analyzed.
+    """
+    if n <= 0:
+        return [0.0, 0.0]
+    z = config.CONFIDENCE_LEVEL_Z if z is None else z
+    p = successes / n
+    
+    fpc = (population - n) / (population - 1) if population > n > 0 and population > 1 else 0.0
+    if fpc <= 0:
+        return [round(p * 100, 1), round(p * 100, 1)]
+    
+    # Wilson interval on the effective sample size n / fpc
+    n_eff = n / fpc
+    denominator = 1 + z * z / n_eff
+    center = (p + z * z / (2 * n_eff)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / n_eff + z * z / (4 * n_eff * n_eff)) / denominator
+    return [round(max(0.0, center - half_width) * 100, 1), round(min(1.0, center + half_width) * 100, 1)]
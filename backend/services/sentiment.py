@@ -1,55 +1,90 @@
 # backend/services/sentiment.py - ML VERSION
-import joblib
-import os
-from textblob import TextBlob
+import numpy as np
+from services.corpus import as_doc, score_polarities
+from services.polarity import get_engine
+from services.sampling import sample_corpus, proportion_interval
+from services.dedup import dedupe_corpus
+from services.cache import cached_verdicts
+from services.models import model_registry
+from services.metrics import INFERENCE_PATH
 
 class SentimentML:
-    def __init__(self):
-        self.model = None
-        self.vectorizer = None
-        self.load_models()
+    def __init__(self, registry=model_registry):
+        # Models are loaded lazily (once per process) by the registry
+        self.registry = registry
+    
+    @property
+    def models(self):
+        """The loaded vectorizer/model pair (loads on first use)"""
+        return self.registry.get("sentiment")
+    
+    @property
+    def model(self):
+        return self.models.model
+    
+    @property
+    def vectorizer(self):
+        return self.models.vectorizer
+    
+    @property
+    def model_version(self):
+        return self.models.version
     
     def load_models(self):
-        """Load trained ML models"""
-        try:
-            model_path = "backend/ml/sentiment_model.pkl"
-            vectorizer_path = "backend/ml/sentiment_vectorizer.pkl"
-            
-            if os.path.exists(model_path) and os.path.exists(vectorizer_path):
-                self.model = joblib.load(model_path)
-                self.vectorizer = joblib.load(vectorizer_path)
-                print("✅ ML Sentiment model loaded")
-                return True
-        except Exception as e:
-            print(f"❌ Error loading ML model: {e}")
-        
-        self.model = None
-        self.vectorizer = None
-        return False
+        """Load trained ML models (no-op after the first call)"""
+        return self.models.loaded
     
     def predict_ml(self, text):
         """Predict sentiment using ML model"""
-        if self.model and self.vectorizer:
-            try:
-                text_vec = self.vectorizer.transform([text])
-                prediction = self.model.predict(text_vec)[0]
-                proba = self.model.predict_proba(text_vec)[0]
-                
+        return self.predict_ml_batch([text])[0]
+    
+    def predict_ml_batch(self, texts):
+        """Predict sentiment for many reviews with a single model pass.
+        
+        ``texts`` may be strings or ReviewDocs. Verdicts are memoized per
+        review text and model version, so only cache misses hit the model.
+        Returns one result per text, or ``None`` entries if the model is
+        unavailable or fails (callers fall back to TextBlob for those).
+        """
+        models = self.models  # one consistent snapshot for the whole batch
+        if models.loaded and texts:
+            docs = [as_doc(text) for text in texts]
+            return cached_verdicts("sentiment_ml", models.version, docs,
+                                   lambda missed: self._predict_ml_docs(models, missed))
+        
+        return [None] * len(texts)
+    
+    def _predict_ml_docs(self, models, docs):
+        try:
+            probas = models.predict_proba([doc.text for doc in docs])
+            # Same argmax rule predict() uses, without a second model pass
+            predictions = models.model.classes_.take(np.argmax(probas, axis=1))
+            
+            results = []
+            for prediction, proba in zip(predictions, probas):
                 # 1 = positive, 0 = negative
                 if prediction == 1:
-                    return {"sentiment": "positive", "confidence": float(proba[1])}
+                    results.append({"sentiment": "positive", "confidence": float(proba[1])})
                 else:
-                    return {"sentiment": "negative", "confidence": float(proba[0])}
-            except Exception as e:
-                print(f"❌ ML prediction error: {e}")
+                    results.append({"sentiment": "negative", "confidence": float(proba[0])})
+            return results
+        except Exception as e:
+            print(f"❌ ML prediction error: {e}")
         
-        return None
+        return [None] * len(docs)
     
     def predict_textblob(self, text):
-        """Predict sentiment using TextBlob (fallback)"""
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity
+        """Predict sentiment from polarity (fallback, accepts a string or a ReviewDoc).
         
+        Polarity comes from the configured engine (CONSIA_POLARITY_ENGINE):
+        the built-in lexicon engine or TextBlob itself.
+        """
+        doc = as_doc(text)
+        return cached_verdicts("sentiment_textblob", get_engine().version, [doc],
+                               lambda docs: [self.classify_polarity(docs[0].polarity)])[0]
+    
+    def classify_polarity(self, polarity):
+        """Map a polarity to a sentiment result"""
         if polarity > 0.1:
             return {"sentiment": "positive", "confidence": (polarity + 1) / 2}
         elif polarity < -0.1:
@@ -59,10 +94,9 @@ class SentimentML:
 
 # Create global analyzer
 ml_analyzer = SentimentML()
-ml_loaded = ml_analyzer.load_models()
 
-def get_sentiment_report(reviews):
-    """Get sentiment analysis report - uses ML if available"""
+def get_sentiment_report(reviews, use_ml=True):
+    """Get sentiment analysis report - uses ML if available (and ``use_ml``)"""
     if not reviews:
         return {
             "total_reviews": 0,
@@ -75,36 +109,72 @@ def get_sentiment_report(reviews):
     pos_count = 0
     neg_count = 0
     neu_count = 0
-    method_used = "textblob"  # default
+    # Bounded work: huge review sets are scored on a sample, and each
+    # duplicate cluster once (weighted by its number of copies)
+    corpus = dedupe_corpus(sample_corpus(reviews))
     
-    for review in reviews:
-        # Try ML first
-        if ml_loaded:
-            result = ml_analyzer.predict_ml(review)
-            if result:
-                method_used = "ml_model"
-            else:
-                result = ml_analyzer.predict_textblob(review)
-        else:
-            result = ml_analyzer.predict_textblob(review)
-        
+    results, from_ml = review_sentiments(corpus.docs, use_ml)
+    method_used = "ml_model" if any(from_ml) else "textblob"
+    
+    for result, (_, weight) in zip(results, corpus.weighted()):
         # Count based on prediction
         if result["sentiment"] == "positive":
-            pos_count += 1
+            pos_count += weight
         elif result["sentiment"] == "negative":
-            neg_count += 1
+            neg_count += weight
         else:
-            neu_count += 1
+            neu_count += weight
+    
+    return sentiment_summary(pos_count, neg_count, neu_count, corpus.population, method_used)
+
+def review_sentiments(docs, use_ml=True):
+    """Per-review sentiment results (ML first, TextBlob fallback) and whether each came from ML"""
+    # Batched inference: one vectorizer pass and one model pass for all reviews
+    ml_results = ml_analyzer.predict_ml_batch(docs) if use_ml else [None] * len(docs)
+    # Fallback polarities for every review the model did not score, in one batch
+    score_polarities([doc for doc, result in zip(docs, ml_results) if not result])
+    
+    results = []
+    from_ml = []
+    for doc, result in zip(docs, ml_results):
+        # Try ML first
+        from_ml.append(bool(result))
+        if not result:
+            # Polarity is shared with the other stages through the corpus
+            result = ml_analyzer.predict_textblob(doc)
+        results.append(result)
     
-    total = len(reviews)
+    ml_count = sum(from_ml)
+    INFERENCE_PATH.inc(ml_count, detector="sentiment", path="ml_model")
+    INFERENCE_PATH.inc(len(docs) - ml_count, detector="sentiment", path="fallback")
+    return results, from_ml
+
+def sentiment_summary(pos_count, neg_count, neu_count, population, method):
+    """Sentiment report from label counts over ``population`` reviews"""
+    total = pos_count + neg_count + neu_count
+    if total == 0:
+        return {
+            "total_reviews": 0,
+            "positive_percent": 0,
+            "negative_percent": 0,
+            "neutral_percent": 0,
+            "method": "none"
+        }
     
     return {
-        "total_reviews": total,
+        "total_reviews": population,
+        "analyzed_reviews": total,
         "positive_percent": round((pos_count / total) * 100, 1),
         "negative_percent": round((neg_count / total) * 100, 1),
         "neutral_percent": round((neu_count / total) * 100, 1),
         "positive_count": pos_count,
         "negative_count": neg_count,
         "neutral_count": neu_count,
-        "method": method_used
-    }
\ No newline at end of file
+        # Intervals for the percentages (zero width when nothing was sampled out)
+        "confidence_intervals": {
+            "positive": proportion_interval(pos_count, total, population),
+            "negative": proportion_interval(neg_count, total, population),
+            "neutral": proportion_interval(neu_count, total, population)
+        },
+        "method": method
+    }
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def value_for_money_score(price, positive_percent, fake_percent):
     """
     Simple scoring:
@@ -23,3 +26,13 @@ def value_for_money_score(price, positive_percent, fake_percent):
     # keep score between 0-100
     score = max(0, min(100, score))
     return round(score, 2)
+
+
+def value_for_money_scores(prices, positive_percents, fake_percents):
+    """value_for_money_score over arrays of candidates at once (unrounded)"""
+    score = np.asarray(positive_percents, dtype=np.float64) - np.asarray(fake_percents, dtype=np.float64) * 1.2
+    prices = np.asarray(prices, dtype=np.float64)
+    # Same operations in the same order as the scalar version, so results match exactly
+    score = np.where(prices > 5000, score - 10, score)
+    score = np.where(prices > 20000, score - 15, score)
+    return np.clip(score, 0, 100)
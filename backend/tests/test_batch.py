@@ -0,0 +1,70 @@
+# backend/tests/test_batch.py - BATCH ISOLATION
+# A product that hangs or kills its worker fails alone: it times out (or
+# is reported as crashed) within its own deadline while the rest of the
+# batch completes, and the worker it held is replaced.
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_reviews
+from services import batch, config
+
+TIMEOUT = 2.0
+
+
+class Hang:
+    """Unpickles (inside the worker) by sleeping far past the item timeout"""
+
+    def __reduce__(self):
+        return (time.sleep, (600,))
+
+
+class Crash:
+    """Unpickles (inside the worker) by exiting the worker process"""
+
+    def __reduce__(self):
+        return (os._exit, (3,))
+
+
+def products(n):
+    return [{"title": f"p{i}", "price": 100, "reviews": make_reviews(20, seed=i)} for i in range(n)]
+
+
+class BatchTimeoutTest(unittest.TestCase):
+    def setUp(self):
+        settings = mock.patch.multiple(config, BATCH_WORKERS=2, BATCH_ITEM_TIMEOUT=TIMEOUT)
+        settings.start()
+        self.addCleanup(settings.stop)
+        # Start (and warm) the workers outside the timed part
+        batch.run_batch(products(2))
+
+    def test_hung_item_does_not_stall_batch(self):
+        start = time.monotonic()
+        results = batch.run_batch([Hang()] + products(4) + [Crash()])
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(results[0]["error"], "Timed out")
+        self.assertEqual([result["success"] for result in results[1:5]], [True] * 4)
+        self.assertEqual(results[5]["error"], "Worker crashed")
+        # The hang costs one timeout, running alongside the other products
+        self.assertLess(elapsed, TIMEOUT * 2)
+
+        # The hung worker was terminated, not left running
+        self.assertTrue(all(worker.process.is_alive() for worker in batch._idle_workers))
+        results = batch.run_batch(products(3))
+        self.assertEqual([result["success"] for result in results], [True] * 3)
+
+    def test_stream_reports_hang_last(self):
+        results = list(batch.stream_batch(iter([products(1)[0], Hang(), ValueError("bad line")] + products(2))))
+        self.assertEqual(len(results), 5)
+        index, result = results[-1]
+        self.assertEqual((index, result["error"]), (1, "Timed out"))
+        self.assertEqual(dict(results[:-1])[2]["error"], "bad line")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+# backend/tests/test_budget.py - LATENCY BUDGET DEGRADATION
+# A budgeted analysis may be less complete than the full one, never better:
+# a skipped stage must not stand in for a result (e.g. 0% fake reviews).
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import handle_analyze
+from benchmarks.synthetic import make_reviews
+from services.analyzer import INCOMPLETE_RECOMMENDATION, analyze_product
+from services.budget import MAX_BUDGET_MS, LatencyBudget
+from services.models import model_registry
+
+WORTH_BUYING = "✅ Worth Buying"
+
+
+class SkippedStageTest(unittest.TestCase):
+    def setUp(self):
+        # Spam-heavy product: the full analysis flags it
+        self.reviews = make_reviews(3000, seed=1, mix={"short_spammy": 0.5, "long_spammy": 0.5})
+
+    def test_skipped_fake_detection_withholds_scores(self):
+        full = analyze_product("Phone", 500, self.reviews)
+        budgeted = analyze_product("Phone", 500, self.reviews, budget=LatencyBudget(1))
+
+        self.assertNotEqual(full["recommendation"], WORTH_BUYING)
+        self.assertEqual(budgeted["budget"]["stages"]["fake_detection"], "skipped")
+        self.assertTrue(budgeted["budget"]["partial"])
+        self.assertIsNone(budgeted["fake_review_percent"])
+        self.assertIsNone(budgeted["value_score"])
+        self.assertIsNone(budgeted["true_rating"])
+        self.assertEqual(budgeted["recommendation"], INCOMPLETE_RECOMMENDATION)
+        self.assertEqual(budgeted["confidence"], "Low")
+
+    def test_skipped_stage_never_raises_recommendation(self):
+        for budget_ms in (1, 5, 20):
+            budgeted = analyze_product("Phone", 500, self.reviews, budget=LatencyBudget(budget_ms))
+            if budgeted["budget"]["stages"].get("fake_detection") == "skipped":
+                self.assertNotEqual(budgeted["recommendation"], WORTH_BUYING)
+
+    def test_unbudgeted_runs_every_stage(self):
+        analysis = analyze_product("Phone", 500, self.reviews)
+        self.assertNotIn("budget", analysis)
+        self.assertIsNotNone(analysis["fake_review_percent"])
+
+
+class BudgetValidationTest(unittest.TestCase):
+    def test_invalid_budgets_rejected(self):
+        for budget_ms in (float("nan"), float("inf"), float("-inf"), -1, "soon", True):
+            with self.assertRaises(ValueError, msg=repr(budget_ms)):
+                LatencyBudget.from_request(budget_ms)
+
+    def test_huge_budget_means_no_budget(self):
+        for budget_ms in (MAX_BUDGET_MS + 1, 1e308):
+            budget = LatencyBudget.from_request(budget_ms)
+            self.assertFalse(budget.limited)
+            self.assertEqual(budget.plan_sample(10 ** 6), (None, None))
+        self.assertEqual(LatencyBudget.from_request(MAX_BUDGET_MS).budget_ms, MAX_BUDGET_MS)
+
+    def test_analyze_status(self):
+        payload = {"title": "Phone", "price": 500, "reviews": make_reviews(50, seed=2)}
+        for budget_ms, status in ((1e308, 200), (float("nan"), 400), (float("inf"), 400), ([5], 400)):
+            _, code = handle_analyze(dict(payload, budget_ms=budget_ms))
+            self.assertEqual(code, status, repr(budget_ms))
+
+
+class CachedBudgetTest(unittest.TestCase):
+    def setUp(self):
+        # Results are only cached once the models they depend on are loaded
+        model_registry.warm_up()
+
+    def test_budget_block_not_served_from_cache(self):
+        payload = {"title": "Cached budget phone", "price": 500, "reviews": make_reviews(50, seed=3)}
+        budgeted, _ = handle_analyze(dict(payload, budget_ms=60000))
+        self.assertFalse(budgeted["partial"])
+        self.assertIn("budget", budgeted)
+
+        unbudgeted, _ = handle_analyze(dict(payload))
+        self.assertTrue(unbudgeted["cache"]["hit"])
+        self.assertNotIn("budget", unbudgeted)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+# backend/tests/test_codec.py - REQUEST BODY DECODING
+# Compressed and compact bodies decode to the same payload as plain JSON;
+# decompression bombs, truncated or corrupt streams and unknown encodings
+# are answered with a 4xx by both servers, never a 500 or unbounded memory.
+import asyncio
+import gzip
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app
+from asgi import ConsiaASGI
+from benchmarks.synthetic import make_reviews
+from services import codec, config
+
+PAYLOAD = {"title": "Codec phone", "price": 999, "reviews": make_reviews(40, seed=7)}
+RAW = json.dumps(PAYLOAD).encode("utf-8")
+# 8 MB of JSON whitespace compresses to a few KB
+BOMB = gzip.compress(b"{" + b" " * (8 * 1024 * 1024) + b"}")
+
+
+class _Stream:
+    """File-like body handed out in small reads"""
+
+    def __init__(self, data, size=1000):
+        self.data = data
+        self.size = size
+
+    def read(self, _):
+        chunk, self.data = self.data[:self.size], self.data[self.size:]
+        return chunk
+
+
+def asgi_post(path, body, headers=()):
+    """(status, decoded JSON body) of one request through the ASGI app, body sent in two chunks"""
+    application = ConsiaASGI()
+    middle = len(body) // 2
+    messages = [{"type": "http.request", "body": body[:middle], "more_body": True},
+                {"type": "http.request", "body": body[middle:], "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": path,
+             "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]}
+    try:
+        asyncio.run(application(scope, receive, send))
+    finally:
+        application.executor.shutdown(wait=True)
+    status = next(message["status"] for message in sent if message["type"] == "http.response.start")
+    body = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    return status, json.loads(body)
+
+
+class RejectedBodyTest(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+        limits = mock.patch.multiple(config, MAX_DECODED_BYTES=1024 * 1024, MAX_REQUEST_BYTES=256 * 1024)
+        limits.start()
+        self.addCleanup(limits.stop)
+
+    def post(self, body, encoding=None, path="/analyze"):
+        headers = [("Content-Type", "application/json")]
+        if encoding:
+            headers.append(("Content-Encoding", encoding))
+        flask_response = self.client.post(path, data=body, headers=dict(headers))
+        asgi_status, asgi_body = asgi_post(path, body, headers)
+        return (flask_response.status_code, flask_response.get_json()), (asgi_status, asgi_body)
+
+    def assert_rejected(self, body, encoding, status, message):
+        for server_status, server_body in self.post(body, encoding):
+            self.assertEqual(server_status, status)
+            self.assertIn(message, server_body["error"])
+
+    def test_gzip_bomb(self):
+        self.assertLess(len(BOMB), config.MAX_REQUEST_BYTES)
+        self.assert_rejected(BOMB, "gzip", 413, "Decoded request too large")
+
+    def test_truncated_gzip(self):
+        self.assert_rejected(gzip.compress(RAW)[:-20], "gzip", 400, "Corrupt compressed body")
+
+    def test_not_gzip(self):
+        self.assert_rejected(RAW, "gzip", 400, "Corrupt compressed body")
+
+    def test_unknown_encoding(self):
+        self.assert_rejected(RAW, "br", 415, "Unsupported content encoding")
+
+    def test_too_large_as_sent(self):
+        self.assert_rejected(b" " * (config.MAX_REQUEST_BYTES + 1), None, 413, "Request too large")
+
+    def test_truncated_compact_body(self):
+        body = codec.encode_compact_reviews(PAYLOAD)[:-5]
+        response = self.client.post("/analyze", data=body, content_type=codec.COMPACT_REVIEWS_TYPE)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid compact reviews body", response.get_json()["error"])
+
+
+class DecodedBodyTest(unittest.TestCase):
+    def test_gzip_and_compact_match_json(self):
+        decoded = [
+            codec.decode_stream(_Stream(RAW), "application/json"),
+            codec.decode_stream(_Stream(gzip.compress(RAW)), "application/json", "gzip"),
+            codec.decode_stream(_Stream(gzip.compress(RAW[:100]) + gzip.compress(RAW[100:])), None, "gzip"),
+            codec.decode_stream(_Stream(codec.encode_compact_reviews(PAYLOAD)), codec.COMPACT_REVIEWS_TYPE),
+        ]
+        for payload in decoded:
+            self.assertEqual(payload, PAYLOAD)
+
+    def test_gzip_ndjson_stream(self):
+        lines = b"".join(json.dumps(dict(PAYLOAD, title=f"p{i}")).encode("utf-8") + b"\n" for i in range(3))
+        client = app.test_client()
+        with mock.patch.object(config, "BATCH_WORKERS", 1):
+            response = client.post("/batch-analyze/stream", data=gzip.compress(lines),
+                                   headers={"Content-Encoding": "gzip"}, content_type="application/x-ndjson")
+            results = [json.loads(line) for line in response.data.splitlines()]
+            self.assertEqual(sorted(result["title"] for result in results[:-1]), ["p0", "p1", "p2"])
+            self.assertTrue(all(result["success"] for result in results[:-1]))
+            self.assertNotIn("error", results[-1])
+
+            response = client.post("/batch-analyze/stream", data=gzip.compress(lines)[:-20],
+                                   headers={"Content-Encoding": "gzip"}, content_type="application/x-ndjson")
+            summary = json.loads(response.data.splitlines()[-1])
+            self.assertEqual(summary["status"], 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
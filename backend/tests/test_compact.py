@@ -0,0 +1,66 @@
+# backend/tests/test_compact.py - COMPACT MODEL FORMAT PARITY
+# A model exported with export_compact and loaded with load_compact (no
+# scikit-learn at inference) must score exactly like the original pair.
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from benchmarks.synthetic import make_reviews
+from services.compact import export_compact, load_compact
+
+# Unseen words, case, punctuation, non-ASCII and empty texts on top of the training kind
+EXTRA_TEXTS = ["", "   ", "!!!", "GREAT Product, great PRICE", "Zyxwv qwerty unseen tokens",
+               "Très bon produit — naïve café", "a b c", "battery battery battery died"]
+
+
+def training_set(seed=0):
+    texts = make_reviews(400, seed=seed)
+    rng = random.Random(seed)
+    return texts, [rng.randint(0, 1) for _ in texts]
+
+
+class CompactExportTest(unittest.TestCase):
+    def setUp(self):
+        self.texts, self.labels = training_set()
+        self.test_texts = make_reviews(200, seed=99) + EXTRA_TEXTS
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assert_parity(self, vectorizer, model):
+        vectorizer.fit(self.texts)
+        model.fit(vectorizer.transform(self.texts), self.labels)
+        export_compact(vectorizer, model, self.directory.name)
+        compact_vectorizer, compact_model = load_compact(self.directory.name)
+
+        expected_rows = vectorizer.transform(self.test_texts)
+        rows = compact_vectorizer.transform(self.test_texts)
+        np.testing.assert_allclose(rows.toarray(), expected_rows.toarray(), rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(compact_model.predict_proba(rows), model.predict_proba(expected_rows),
+                                   rtol=1e-9, atol=1e-12)
+        self.assertEqual(list(compact_model.classes_), list(model.classes_))
+
+    def test_linear_model(self):
+        self.assert_parity(TfidfVectorizer(max_features=500, stop_words="english"),
+                           LogisticRegression(max_iter=1000))
+
+    def test_linear_model_vectorizer_options(self):
+        self.assert_parity(TfidfVectorizer(sublinear_tf=True, lowercase=False, norm="l1"),
+                           LogisticRegression(max_iter=1000))
+
+    def test_forest_model(self):
+        self.assert_parity(TfidfVectorizer(max_features=300),
+                           RandomForestClassifier(n_estimators=10, random_state=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
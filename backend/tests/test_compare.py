@@ -0,0 +1,72 @@
+# backend/tests/test_compare.py - /compare VS PER-PRODUCT /analyze
+# The vectorized comparison must report, for every candidate, the metrics
+# and recommendation /analyze gives for that product on its own.
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import handle_compare
+from benchmarks.synthetic import make_reviews
+from services import config
+from services.analyzer import analyze_product
+
+SPAMMY = {"short_spammy": 0.5, "long_spammy": 0.5}
+
+
+def candidates():
+    copy = "Arrived quickly and works exactly as described, very happy with it"
+    return [
+        {"id": "mixed", "title": "Phone A", "price": 15000, "reviews": make_reviews(120, seed=1)},
+        {"id": "spam", "title": "Phone B", "price": 9000, "reviews": make_reviews(120, seed=2, mix=SPAMMY)},
+        {"id": "cheap", "title": "Phone C", "price": 0, "reviews": make_reviews(40, seed=3)},
+        {"id": "copies", "title": "Phone D", "price": 12000,
+         "reviews": make_reviews(30, seed=4) + [copy] * config.DUPLICATE_SPAM_CLUSTER},
+        {"id": "sampled", "title": "Phone E", "price": 20000,
+         "reviews": make_reviews(config.SAMPLE_BUDGET + 200, seed=5)},
+        {"id": "empty", "title": "Phone F", "price": 5000, "reviews": []},
+    ]
+
+
+class CompareParityTest(unittest.TestCase):
+    def test_matrix_matches_analyze(self):
+        products = candidates()
+        response, status = handle_compare({"products": products, "include_matrix": True, "top_k": 3})
+        self.assertEqual(status, 200)
+        matrix = response["matrix"]
+
+        for i, product in enumerate(products):
+            analysis = analyze_product(product["title"], product["price"], product["reviews"])
+            with self.subTest(product=product["id"]):
+                if not product["reviews"]:
+                    self.assertEqual(matrix["recommendation"][i], "Not Enough Data ❓")
+                    continue
+                self.assertEqual(matrix["recommendation"][i], analysis["recommendation"])
+                self.assertEqual(matrix["value_score"][i], analysis["value_score"])
+                self.assertEqual(matrix["true_rating"][i], analysis["true_rating"])
+                self.assertEqual(matrix["fake_review_percent"][i], analysis["fake_review_percent"])
+                self.assertEqual(matrix["positive_percent"][i], analysis["sentiment"]["positive_percent"])
+                self.assertEqual(matrix["negative_percent"][i], analysis["sentiment"]["negative_percent"])
+
+    def test_ranking_entries_match_analyze(self):
+        products = candidates()
+        response, _ = handle_compare({"products": products, "metric": "true_rating", "top_k": len(products)})
+        ranking = response["ranking"]
+        self.assertEqual(ranking[-1]["id"], "empty")  # no reviews ranks last
+
+        for entry in ranking[:-1]:
+            product = products[entry["index"]]
+            analysis = analyze_product(product["title"], product["price"], product["reviews"])
+            with self.subTest(product=product["id"]):
+                self.assertEqual(entry["recommendation"], analysis["recommendation"])
+                self.assertEqual(entry["confidence"], analysis["confidence"])
+                self.assertEqual(entry["summary"], analysis["analysis_summary"])
+                self.assertEqual(entry["pros"], analysis["pros"])
+                self.assertEqual(entry["cons"], analysis["cons"])
+        ratings = [entry["true_rating"] for entry in ranking[:-1]]
+        self.assertEqual(ratings, sorted(ratings, reverse=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+# backend/tests/test_incremental.py - INCREMENTAL VS FULL ANALYSIS
+# /analyze/incremental must give the same fake review percentage as
+# /analyze on the same reviews, including duplicate clusters that cross
+# DUPLICATE_SPAM_CLUSTER as copies are added or removed.
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_reviews
+from services import config
+from services.analyzer import analyze_product
+from services.corpus import ReviewDoc
+from services.incremental import aggregate_store, analyze_incremental
+
+
+class SpamClusterTest(unittest.TestCase):
+    def setUp(self):
+        self.reviews = make_reviews(60, seed=3)
+        analyze_incremental("test-scan", "Phone", 500, reviews=self.reviews)
+        aggregate, _ = aggregate_store.get_or_create("test-scan")
+        # A review the detector calls genuine, so only the cluster rule can flag it
+        self.copy = next(review for review in self.reviews
+                         if aggregate.entries[ReviewDoc(review).digest]["fake"] is False)
+
+    def assert_matches_full(self, analysis, reviews):
+        full = analyze_product("Phone", 500, reviews)
+        self.assertEqual(analysis["fake_review_percent"], full["fake_review_percent"])
+
+    def test_cluster_crossing_threshold(self):
+        copies = config.DUPLICATE_SPAM_CLUSTER
+        reviews = self.reviews + [self.copy] * (copies - 2)
+        analysis, _ = analyze_incremental("test-cluster", "Phone", 500, reviews=reviews)
+        self.assert_matches_full(analysis, reviews)
+
+        analysis, _ = analyze_incremental("test-cluster", "Phone", 500, added=[self.copy])
+        self.assert_matches_full(analysis, reviews + [self.copy])
+
+        analysis, _ = analyze_incremental("test-cluster", "Phone", 500, removed=[self.copy])
+        self.assert_matches_full(analysis, reviews)
+
+
+if __name__ == "__main__":
+    unittest.main()
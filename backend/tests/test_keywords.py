@@ -0,0 +1,63 @@
+# backend/tests/test_keywords.py - COMPILED KEYWORD MATCHING
+# KeywordMatcher must find exactly what the per-keyword "keyword in text"
+# loops it replaced found, overlapping and prefix keywords included.
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_reviews
+from services.keywords import FAKE_PHRASES, NEGATIVE_KEYWORDS, POSITIVE_KEYWORDS, KeywordMatcher
+
+KEYWORD_LISTS = {
+    "positive": POSITIVE_KEYWORDS,
+    "negative": NEGATIVE_KEYWORDS,
+    "fake_phrases": FAKE_PHRASES,
+    # Prefixes, overlaps, duplicates, regex metacharacters and an empty entry
+    "tricky": ["a", "ab", "abc", "bc", "c.d", "(x)", "x+", "not good", "good", "good", "", "don't", "n't"],
+}
+
+
+def old_search(keywords, text):
+    return any(keyword in text for keyword in keywords)
+
+
+def old_findall(keywords, text):
+    return {keyword.lower() for keyword in keywords if keyword and keyword.lower() in text}
+
+
+def texts(keywords, seed=0):
+    """Synthetic reviews plus random runs of keyword fragments and filler"""
+    rng = random.Random(seed)
+    pieces = [keyword for keyword in keywords if keyword] + [" ", ".", "x", "not ", "it"]
+    generated = ["".join(rng.choice(pieces) for _ in range(rng.randint(0, 8))) for _ in range(500)]
+    return [text.lower() for text in make_reviews(300, seed=seed)] + generated + ["", "   "]
+
+
+class KeywordMatcherTest(unittest.TestCase):
+    def test_same_matches_as_keyword_loop(self):
+        for name, keywords in KEYWORD_LISTS.items():
+            matcher = KeywordMatcher(keywords)
+            with self.subTest(keywords=name):
+                for text in texts(keywords):
+                    self.assertEqual(matcher.search(text), old_search([k for k in keywords if k], text), text)
+                    found = matcher.findall(text)
+                    self.assertEqual(len(found), len(set(found)), text)
+                    self.assertEqual(set(found), old_findall(keywords, text), text)
+
+    def test_findall_in_order_of_first_occurrence(self):
+        matcher = KeywordMatcher(KEYWORD_LISTS["tricky"])
+        for text in texts(KEYWORD_LISTS["tricky"], seed=1):
+            positions = [text.find(keyword) for keyword in matcher.findall(text)]
+            self.assertEqual(positions, sorted(positions), text)
+
+    def test_empty_list(self):
+        matcher = KeywordMatcher([])
+        self.assertFalse(matcher.search("anything"))
+        self.assertEqual(matcher.findall("anything"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
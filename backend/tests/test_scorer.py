@@ -0,0 +1,76 @@
+# backend/tests/test_scorer.py - FAST LINEAR SCORER PARITY
+# LinearScorer must give the same probabilities as scikit-learn's
+# vectorizer.transform + predict_proba, from the pickled pair and from a
+# compact export.
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from benchmarks.synthetic import make_reviews
+from services.compact import export_compact, load_compact
+from services.scorer import LinearScorer
+
+EXTRA_TEXTS = ["", "   ", "!!!", "GREAT Product, great PRICE", "Zyxwv qwerty unseen tokens",
+               "Très bon produit — naïve café", "a b c", "battery battery battery died"]
+
+
+class LinearScorerTest(unittest.TestCase):
+    def setUp(self):
+        self.texts = make_reviews(400, seed=1)
+        self.test_texts = make_reviews(300, seed=98) + EXTRA_TEXTS
+
+    def fit(self, vectorizer, n_classes=2):
+        rng = random.Random(1)
+        labels = [rng.randrange(n_classes) for _ in self.texts]
+        vectorizer.fit(self.texts)
+        model = LogisticRegression(max_iter=1000).fit(vectorizer.transform(self.texts), labels)
+        return vectorizer, model
+
+    def assert_matches_sklearn(self, vectorizer, model):
+        expected = model.predict_proba(vectorizer.transform(self.test_texts))
+
+        scorer = LinearScorer.build(vectorizer, model)
+        self.assertIsNotNone(scorer)
+        np.testing.assert_allclose(scorer.predict_proba(self.test_texts), expected, rtol=1e-9, atol=1e-12)
+
+        with tempfile.TemporaryDirectory() as directory:
+            export_compact(vectorizer, model, directory)
+            compact_scorer = LinearScorer.build(*load_compact(directory))
+            self.assertIsNotNone(compact_scorer)
+            np.testing.assert_allclose(compact_scorer.predict_proba(self.test_texts), expected,
+                                       rtol=1e-9, atol=1e-12)
+
+    def test_binary(self):
+        self.assert_matches_sklearn(*self.fit(TfidfVectorizer(max_features=500, stop_words="english")))
+
+    def test_vectorizer_options(self):
+        for options in ({"sublinear_tf": True}, {"binary": True, "norm": "l1"},
+                        {"use_idf": False, "lowercase": False}, {"norm": None}):
+            with self.subTest(**options):
+                self.assert_matches_sklearn(*self.fit(TfidfVectorizer(**options)))
+
+    def test_multiclass(self):
+        self.assert_matches_sklearn(*self.fit(TfidfVectorizer(), n_classes=3))
+
+    def test_batch_split_matches_whole(self):
+        vectorizer, model = self.fit(TfidfVectorizer())
+        scorer = LinearScorer.build(vectorizer, model)
+        whole = scorer.predict_proba(self.test_texts)
+        one_by_one = np.vstack([scorer.predict_proba([text]) for text in self.test_texts])
+        np.testing.assert_allclose(one_by_one, whole, rtol=1e-12, atol=1e-15)
+
+    def test_unsupported_pair(self):
+        vectorizer = TfidfVectorizer(ngram_range=(1, 2)).fit(self.texts)
+        model = LogisticRegression(max_iter=1000).fit(vectorizer.transform(self.texts), [0, 1] * 200)
+        self.assertIsNone(LinearScorer.build(vectorizer, model))
+
+
+if __name__ == "__main__":
+    unittest.main()
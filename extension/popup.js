@@ -4,6 +4,22 @@ async function getActiveTab() {
   return tab;
 }
 
+// Payloads above this many characters are gzipped before upload
+const GZIP_THRESHOLD = 16 * 1024;
+
+async function encodeRequestBody(payload) {
+  const json = JSON.stringify(payload);
+  if (json.length < GZIP_THRESHOLD || typeof CompressionStream === "undefined") {
+    return { body: json, headers: { "Content-Type": "application/json" } };
+  }
+  // The backend inflates gzip bodies as they stream in
+  const stream = new Blob([json]).stream().pipeThrough(new CompressionStream("gzip"));
+  return {
+    body: await new Response(stream).arrayBuffer(),
+    headers: { "Content-Type": "application/json", "Content-Encoding": "gzip" }
+  };
+}
+
 function setStatus(text, type = "info") {
   const statusEl = document.getElementById("status");
   statusEl.textContent = text;
@@ -53,9 +69,10 @@ function showResult(data) {
     title = data.product?.title || data.title;
     price = data.product?.price || data.price;
     sentiment = data.metrics?.sentiment || data.sentiment;
-    fakePercent = data.metrics?.fake_reviews_percent || data.fake_review_percent;
-    valueScore = data.metrics?.value_score || data.value_score;
-    trueRating = data.metrics?.true_rating || data.true_rating;
+    // null = not measured (e.g. fake detection skipped under a latency budget)
+    fakePercent = data.metrics ? data.metrics.fake_reviews_percent : data.fake_review_percent;
+    valueScore = data.metrics ? data.metrics.value_score : data.value_score;
+    trueRating = data.metrics ? data.metrics.true_rating : data.true_rating;
     pros = data.insights?.pros || data.pros || [];
     cons = data.insights?.cons || data.cons || [];
   } else {
@@ -85,8 +102,8 @@ function showResult(data) {
     (sentiment?.neutral_percent || sentiment?.neutral || 0).toFixed(1) + "%";
   
   // Update fake reviews and value score
-  document.getElementById("fake").textContent = (fakePercent || 0).toFixed(1) + "%";
-  document.getElementById("value").textContent = (valueScore || 0).toFixed(0);
+  document.getElementById("fake").textContent = fakePercent == null ? "n/a" : fakePercent.toFixed(1) + "%";
+  document.getElementById("value").textContent = valueScore == null ? "n/a" : valueScore.toFixed(0);
   
   // Add True Rating if available
   if (trueRating && document.getElementById("trueRating")) {
@@ -259,14 +276,15 @@ document.getElementById("analyzeBtn").addEventListener("click", async () => {
 
     setStatus("Analyzing with Consia AI…", "info");
 
+    const request = await encodeRequestBody({
+      title: productData.title,
+      price: productData.price,
+      reviews: productData.reviews
+    });
     const res = await fetch("http://127.0.0.1:5000/analyze", {
       method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({
-        title: productData.title,
-        price: productData.price,
-        reviews: productData.reviews
-      })
+      headers: request.headers,
+      body: request.body
     });
 
     if (!res.ok) {